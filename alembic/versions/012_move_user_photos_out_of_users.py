@@ -0,0 +1,92 @@
+"""Move profile photos out of users.photo_url
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-12-20
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PHOTO_PATH = '/api/v1/auth/photo/'
+
+
+def upgrade() -> None:
+    # Photo bytes live in their own table so user SELECTs stay small
+    op.create_table(
+        'user_photos',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('content_type', sa.String(length=50), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('token', sa.String(length=64), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+        sa.UniqueConstraint('token')
+    )
+
+    # Move existing base64 data URLs ("data:<type>;base64,<payload>") into
+    # user_photos, each with a random token for its URL (gen_random_uuid()
+    # uses the server's strong random source). Rows whose content type does
+    # not fit content_type are left alone.
+    op.execute(
+        """
+        INSERT INTO user_photos (user_id, content_type, data, token)
+        SELECT id,
+               substring(photo_url FROM 6 FOR position(';' IN photo_url) - 6),
+               decode(substring(photo_url FROM position(',' IN photo_url) + 1), 'base64'),
+               replace(gen_random_uuid()::text, '-', '')
+        FROM users
+        WHERE photo_url LIKE 'data:%;base64,%'
+          AND position(';' IN photo_url) - 6 BETWEEN 1 AND 50
+        """
+    )
+    # Point exactly the moved photos at their new URL
+    op.execute(
+        f"""
+        UPDATE users u SET photo_url = '{PHOTO_PATH}' || p.token
+        FROM user_photos p
+        WHERE p.user_id = u.id
+        """
+    )
+    # Data URLs that could not be moved and do not fit the new cap are dropped
+    op.execute(
+        """
+        UPDATE users SET photo_url = NULL
+        WHERE photo_url LIKE 'data:%' AND length(photo_url) > 512
+        """
+    )
+
+    # Cap photo_url now that it only holds short URLs
+    op.alter_column('users', 'photo_url',
+                   existing_type=sa.Text(),
+                   type_=sa.String(length=512),
+                   existing_nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'photo_url',
+                   existing_type=sa.String(length=512),
+                   type_=sa.Text(),
+                   existing_nullable=True)
+
+    # Restore inline data URLs
+    op.execute(
+        """
+        UPDATE users u
+        SET photo_url = 'data:' || p.content_type || ';base64,'
+                        || replace(encode(p.data, 'base64'), E'\\n', '')
+        FROM user_photos p
+        WHERE p.user_id = u.id
+        """
+    )
+    op.drop_table('user_photos')
@@ -0,0 +1,46 @@
+"""Store refresh tokens as SHA-256 hashes
+
+Revision ID: 013
+Revises: 012
+Create Date: 2025-12-20
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+
+    # Expired and revoked tokens can never be used again, so drop them rather
+    # than hash them (expires_at is naive UTC)
+    op.execute(
+        """
+        DELETE FROM refresh_tokens
+        WHERE revoked OR expires_at <= (now() AT TIME ZONE 'utc')
+        """
+    )
+    # Hash the remaining tokens in one statement so active sessions keep working
+    op.execute("UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.drop_index(op.f('ix_refresh_tokens_token'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
+
+
+def downgrade() -> None:
+    # Plain tokens cannot be recovered from hashes; existing sessions are dropped
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(length=500), nullable=False))
+    op.create_index(op.f('ix_refresh_tokens_token'), 'refresh_tokens', ['token'], unique=True)
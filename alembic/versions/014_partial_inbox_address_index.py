@@ -0,0 +1,32 @@
+"""Make the inbox address unique index partial
+
+Revision ID: 014
+Revises: 013
+Create Date: 2025-12-21
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only onboarded users have an inbox address; skip the NULL rows so the
+    # index stays small and is not touched by inserts of new users
+    op.drop_index('ix_users_inbox_address', table_name='users')
+    op.create_index(
+        'ix_users_inbox_address', 'users', ['inbox_prefix', 'inbox_token'], unique=True,
+        postgresql_where=sa.text('inbox_prefix IS NOT NULL AND inbox_token IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_inbox_address', table_name='users')
+    op.create_index('ix_users_inbox_address', 'users', ['inbox_prefix', 'inbox_token'], unique=True)
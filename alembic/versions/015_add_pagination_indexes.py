@@ -0,0 +1,32 @@
+"""Add composite indexes for keyset pagination of conversations and messages
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cursor pages filter on (timestamp, id) within one owner; a B-tree on
+    # the full key serves both the range predicate and the ORDER BY
+    op.create_index(
+        'ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_conversations_user_updated', 'conversations', ['user_id', 'updated_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversations_user_updated', table_name='conversations')
+    op.drop_index('ix_messages_conversation_created', table_name='messages')
@@ -0,0 +1,45 @@
+"""Index the inbox prefix and inbox verification token lookups
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '016'
+down_revision: Union[str, None] = '015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The inbox address is now the prefix alone, so the prefix itself must be
+    # unique; this also replaces the (prefix, token) index for prefix lookups.
+    # Built concurrently so the users table stays writable.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_inbox_prefix', 'users', ['inbox_prefix'], unique=True,
+            postgresql_where=sa.text('inbox_prefix IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        # Verification links look users up by token; only pending ones have one
+        op.create_index(
+            'ix_users_inbox_verification_token', 'users', ['inbox_verification_token'],
+            postgresql_where=sa.text('inbox_verification_token IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+    op.drop_index('ix_users_inbox_address', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_users_inbox_address', 'users', ['inbox_prefix', 'inbox_token'], unique=True,
+        postgresql_where=sa.text('inbox_prefix IS NOT NULL AND inbox_token IS NOT NULL'),
+    )
+    op.drop_index('ix_users_inbox_verification_token', table_name='users')
+    op.drop_index('ix_users_inbox_prefix', table_name='users')
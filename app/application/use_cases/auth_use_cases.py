@@ -2,16 +2,93 @@
 Authentication use cases.
 Part of Application layer - orchestrates business logic.
 """
+import re
+import threading
 from typing import Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities.user import User
+from app.domain.entities.user import STATUS_CAN_LOGIN, STATUS_LOCAL, User
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.infrastructure.repositories.refresh_token_repository import RefreshTokenRepository
-from app.infrastructure.services.password import hash_password, verify_password
+from app.infrastructure.services.password import (
+    hash_password_async,
+    password_needs_rehash,
+    start_hash_password,
+    verify_password_async,
+)
 from app.infrastructure.services.jwt import create_access_token, create_token_pair
 
+# bcrypt only uses the first 72 bytes of a password; reject longer ones
+# instead of silently ignoring the tail
+MIN_PASSWORD_LENGTH = 8
+MAX_PASSWORD_BYTES = 72
+
+# Login error for each local-user status mask that cannot log in
+# (non-local users get a provider-specific message instead)
+_LOGIN_STATUS_ERRORS = {
+    0b001: "Account is disabled",
+    0b011: "Invalid account configuration",
+    0b101: "Account is disabled",
+}
+
+# Short-lived in-process cache of users looked up by email (login bursts).
+# Only hits are cached; entries are dropped via invalidate_cached_user().
+_user_by_email_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_user_cache_lock = threading.Lock()
+
+# Serialized current-user responses keyed by user UUID (every authenticated request).
+_current_user_cache: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+
+# Canonical UUID string (as issued in our JWT "sub" claim); rejects malformed
+# IDs without paying for UUID()'s exception path
+_UUID_RE = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+
+def _normalize_email(email: str) -> str:
+    """Normalize an email address to its cache key."""
+    return email.strip().lower()
+
+
+async def _get_user_cached(user_repository: UserRepository, email: str) -> Optional[User]:
+    """
+    Get the auth projection of a user by email, consulting the TTL cache first.
+    Onboarding fields are not loaded; use only for authentication.
+
+    Args:
+        user_repository: Repository used on cache miss
+        email: User's email address
+
+    Returns:
+        User domain entity if found, None otherwise
+    """
+    key = _normalize_email(email)
+    with _user_cache_lock:
+        user = _user_by_email_cache.get(key)
+    if user is not None:
+        return user
+
+    user = await user_repository.get_auth_projection(key)
+    if user is not None:
+        with _user_cache_lock:
+            _user_by_email_cache[key] = user
+    return user
+
+
+def invalidate_cached_user(email: str) -> None:
+    """
+    Drop a user from the email lookup cache.
+    Call this whenever a user's profile or credentials change.
+
+    Args:
+        email: User's email address
+    """
+    with _user_cache_lock:
+        _user_by_email_cache.pop(_normalize_email(email), None)
+
 
 class RegisterUserUseCase:
     """
@@ -19,11 +96,10 @@ class RegisterUserUseCase:
     Handles local user registration with email/password.
     """
 
-    def __init__(self, user_repository: UserRepository, db: Session):
-        self.user_repository = user_repository
-        self.db = db
+    def __init__(self, refresh_token_repository: RefreshTokenRepository):
+        self.refresh_token_repository = refresh_token_repository
 
-    def execute(self, email: str, password: str, full_name: str) -> dict:
+    async def execute(self, email: str, password: str, full_name: str) -> dict:
         """
         Register a new local user.
 
@@ -38,16 +114,23 @@ class RegisterUserUseCase:
         Raises:
             ValueError: If user already exists or validation fails
         """
-        # Check if user already exists
-        if self.user_repository.exists_by_email(email):
-            raise ValueError("User with this email already exists")
-
-        # Validate password strength
-        if len(password) < 8:
+        # Validate password length once, before any hashing work
+        if len(password) < MIN_PASSWORD_LENGTH:
             raise ValueError("Password must be at least 8 characters long")
+        if len(password.encode("utf-8")) > MAX_PASSWORD_BYTES:
+            raise ValueError("Password must be at most 72 bytes long")
+
+        # Start hashing right away; a cached duplicate cancels it
+        hash_future = start_hash_password(password)
+
+        # Known users are rejected from cache; others by ON CONFLICT below
+        with _user_cache_lock:
+            cached = _normalize_email(email) in _user_by_email_cache
+        if cached:
+            hash_future.cancel()
+            raise ValueError("User with this email already exists")
 
-        # Hash password
-        hashed_password = hash_password(password)
+        hashed_password = await hash_future
 
         # Create user domain entity
         user = User.create(
@@ -57,31 +140,30 @@ class RegisterUserUseCase:
             hashed_password=hashed_password,
         )
 
-        # Save to database
-        created_user = self.user_repository.create(user)
-
-        # Generate token pair (access + refresh)
+        # Generate token pair (access + refresh); the user ID is assigned client-side
         tokens = create_token_pair(
-            user_id=created_user.id,
-            email=created_user.email,
-            provider=created_user.provider,
+            user_id=user.id,
+            email=user.email,
+            provider=user.provider,
         )
 
-        # Store refresh token in database
-        refresh_repo = RefreshTokenRepository(self.db)
-        refresh_repo.create(
-            user_id=created_user.id,
+        # Insert user and refresh token in one statement; uniqueness is
+        # enforced by the INSERT itself
+        created = await self.refresh_token_repository.create_with_user(
+            user=user,
             token=tokens["refresh_token"],
             expires_at=tokens["refresh_token_expires_at"],
         )
+        if not created:
+            raise ValueError("User with this email already exists")
 
         return {
             "user": {
-                "id": str(created_user.id),
-                "email": created_user.email,
-                "full_name": created_user.full_name,
-                "provider": created_user.provider,
-                "is_active": created_user.is_active,
+                "id": user.id,
+                "email": user.email,
+                "full_name": user.full_name,
+                "provider": user.provider,
+                "is_active": user.is_active,
             },
             "access_token": tokens["access_token"],
             "refresh_token": tokens["refresh_token"],
@@ -95,11 +177,17 @@ class LoginUserUseCase:
     Validates credentials and returns JWT token.
     """
 
-    def __init__(self, user_repository: UserRepository, db: Session):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        refresh_token_repository: RefreshTokenRepository,
+        db: AsyncSession,
+    ):
         self.user_repository = user_repository
+        self.refresh_token_repository = refresh_token_repository
         self.db = db
 
-    def execute(self, email: str, password: str) -> dict:
+    async def execute(self, email: str, password: str) -> dict:
         """
         Authenticate user with email and password.
 
@@ -113,26 +201,28 @@ class LoginUserUseCase:
         Raises:
             ValueError: If credentials are invalid
         """
-        # Get user from database
-        user = self.user_repository.get_by_email(email)
+        # Get user (cached for repeat logins)
+        user = await _get_user_cached(self.user_repository, email)
         if not user:
             raise ValueError("Invalid email or password")
 
-        # Check if user is local (not OAuth)
-        if not user.is_local_user():
-            raise ValueError(f"This account uses {user.provider} authentication")
-
-        # Check if account is active
-        if not user.is_active:
-            raise ValueError("Account is disabled")
+        # Check local provider, active account and password hash in one branch
+        mask = user.status_mask
+        if mask != STATUS_CAN_LOGIN:
+            if not mask & STATUS_LOCAL:
+                raise ValueError(f"This account uses {user.provider} authentication")
+            raise ValueError(_LOGIN_STATUS_ERRORS[mask])
 
         # Verify password
-        if not user.hashed_password:
-            raise ValueError("Invalid account configuration")
-
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             raise ValueError("Invalid email or password")
 
+        # Upgrade the stored hash if the scheme or cost has changed
+        if password_needs_rehash(user.hashed_password):
+            new_hash = await hash_password_async(password)
+            await self.user_repository.update_password(user.id, new_hash, commit=False)
+            invalidate_cached_user(user.email)
+
         # Generate token pair (access + refresh)
         tokens = create_token_pair(
             user_id=user.id,
@@ -140,17 +230,18 @@ class LoginUserUseCase:
             provider=user.provider,
         )
 
-        # Store refresh token in database
-        refresh_repo = RefreshTokenRepository(self.db)
-        refresh_repo.create(
+        # Store refresh token, committed together with any rehash update
+        await self.refresh_token_repository.create(
             user_id=user.id,
             token=tokens["refresh_token"],
             expires_at=tokens["refresh_token_expires_at"],
+            commit=False,
         )
+        await self.db.commit()
 
         return {
             "user": {
-                "id": str(user.id),
+                "id": user.id,
                 "email": user.email,
                 "full_name": user.full_name,
                 "provider": user.provider,
@@ -168,11 +259,10 @@ class RefreshTokenUseCase:
     Use case for refreshing an access token using a refresh token.
     """
 
-    def __init__(self, user_repository: UserRepository, db: Session):
-        self.user_repository = user_repository
-        self.db = db
+    def __init__(self, refresh_token_repository: RefreshTokenRepository):
+        self.refresh_token_repository = refresh_token_repository
 
-    def execute(self, refresh_token: str) -> dict:
+    async def execute(self, refresh_token: str) -> dict:
         """
         Refresh access token using a valid refresh token.
 
@@ -185,24 +275,15 @@ class RefreshTokenUseCase:
         Raises:
             ValueError: If refresh token is invalid or expired
         """
-        refresh_repo = RefreshTokenRepository(self.db)
-
-        # Get and validate refresh token
-        db_token = refresh_repo.get_valid_token(refresh_token)
-        if not db_token:
+        # Get and validate refresh token together with its user (one JOIN)
+        found = await self.refresh_token_repository.get_valid_token_with_user(refresh_token)
+        if not found:
             raise ValueError("Invalid or expired refresh token")
-
-        # Get user
-        user = self.user_repository.get_by_id(db_token.user_id)
-        if not user:
-            raise ValueError("User not found")
+        token_id, user = found
 
         if not user.is_active:
             raise ValueError("Account is disabled")
 
-        # Revoke old refresh token (rotation for security)
-        refresh_repo.revoke(refresh_token)
-
         # Generate new token pair
         tokens = create_token_pair(
             user_id=user.id,
@@ -210,12 +291,15 @@ class RefreshTokenUseCase:
             provider=user.provider,
         )
 
-        # Store new refresh token
-        refresh_repo.create(
-            user_id=user.id,
-            token=tokens["refresh_token"],
+        # Revoke old token and store the new one in one statement (rotation
+        # for security); fails if the old token was used concurrently
+        rotated = await self.refresh_token_repository.rotate(
+            token_id=token_id,
+            new_token=tokens["refresh_token"],
             expires_at=tokens["refresh_token_expires_at"],
         )
+        if not rotated:
+            raise ValueError("Invalid or expired refresh token")
 
         return {
             "access_token": tokens["access_token"],
@@ -229,10 +313,10 @@ class LogoutUseCase:
     Use case for logging out (revoking refresh token).
     """
 
-    def __init__(self, db: Session):
-        self.db = db
+    def __init__(self, refresh_token_repository: RefreshTokenRepository):
+        self.refresh_token_repository = refresh_token_repository
 
-    def execute(self, refresh_token: str) -> bool:
+    async def execute(self, refresh_token: str) -> bool:
         """
         Logout by revoking the refresh token.
 
@@ -242,19 +326,31 @@ class LogoutUseCase:
         Returns:
             True if revoked, False if token not found
         """
-        refresh_repo = RefreshTokenRepository(self.db)
-        return refresh_repo.revoke(refresh_token)
+        return await self.refresh_token_repository.revoke(refresh_token)
 
 
 class GetCurrentUserUseCase:
     """
     Use case for getting current authenticated user.
+    Responses are cached briefly per user to skip the DB on repeat requests.
     """
 
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    def execute(self, user_id: str) -> Optional[dict]:
+    @staticmethod
+    def invalidate(user_id: UUID) -> None:
+        """
+        Drop a cached current-user response.
+        Call this whenever the user's profile changes.
+
+        Args:
+            user_id: User's UUID
+        """
+        with _user_cache_lock:
+            _current_user_cache.pop(user_id, None)
+
+    async def execute(self, user_id: str) -> Optional[dict]:
         """
         Get current user by ID.
 
@@ -264,21 +360,28 @@ class GetCurrentUserUseCase:
         Returns:
             User info dict if found, None otherwise
         """
-        try:
-            user_uuid = UUID(user_id)
-        except ValueError:
+        if not _UUID_RE.match(user_id):
             return None
+        user_uuid = UUID(user_id)
+
+        with _user_cache_lock:
+            cached = _current_user_cache.get(user_uuid)
+        if cached is not None:
+            return dict(cached)
 
-        user = self.user_repository.get_by_id(user_uuid)
+        user = await self.user_repository.get_by_id(user_uuid)
         if not user:
             return None
 
-        return {
-            "id": str(user.id),
+        result = {
+            "id": user.id_str,
             "email": user.email,
             "full_name": user.full_name,
             "provider": user.provider,
             "is_active": user.is_active,
             "photo_url": user.photo_url,
-            "created_at": user.created_at.isoformat(),
+            "created_at": user.created_at_iso,
         }
+        with _user_cache_lock:
+            _current_user_cache[user_uuid] = result
+        return dict(result)
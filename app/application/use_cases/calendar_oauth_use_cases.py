@@ -7,15 +7,58 @@ from uuid import UUID
 from datetime import datetime
 from sqlalchemy.orm import Session
 import logging
+import threading
+from cachetools import TTLCache
 
 from app.infrastructure.services.google_oauth import GoogleOAuthService
 from app.infrastructure.services.microsoft_oauth import MicrosoftOAuthService
 from app.infrastructure.services.token_service_client import token_service_client
 from app.infrastructure.repositories.oauth_token_repository import OAuthTokenRepository
 from app.infrastructure.repositories.user_settings_repository import UserSettingsRepository
+from app.infrastructure.database.session import run_in_db_pool
 
 logger = logging.getLogger(__name__)
 
+# Primary calendar provider per user, so chat commands skip the settings query.
+# Entries are dropped whenever CalendarOAuthUseCases changes the provider.
+_primary_provider_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_primary_provider_lock = threading.Lock()
+
+
+async def get_cached_primary_provider(db: Session, user_id: UUID) -> str:
+    """
+    Get a user's primary calendar provider, consulting the TTL cache first.
+    On a miss the settings query runs in the database thread pool.
+
+    Args:
+        db: Database session used on cache miss
+        user_id: User ID
+
+    Returns:
+        Provider name (defaults to "microsoft" when none is set)
+    """
+    with _primary_provider_lock:
+        provider = _primary_provider_cache.get(user_id)
+    if provider is not None:
+        return provider
+
+    settings = await run_in_db_pool(UserSettingsRepository(db).get_settings, user_id)
+    provider = (settings.primary_calendar_provider if settings else None) or "microsoft"
+    with _primary_provider_lock:
+        _primary_provider_cache[user_id] = provider
+    return provider
+
+
+def invalidate_primary_provider(user_id: UUID) -> None:
+    """
+    Drop a user's cached primary calendar provider.
+
+    Args:
+        user_id: User ID
+    """
+    with _primary_provider_lock:
+        _primary_provider_cache.pop(user_id, None)
+
 
 class CalendarOAuthUseCases:
     """
@@ -30,6 +73,11 @@ class CalendarOAuthUseCases:
         self.google_oauth = GoogleOAuthService()
         self.microsoft_oauth = MicrosoftOAuthService()
 
+    def _update_primary_provider(self, user_id: UUID, provider: Optional[str]) -> None:
+        """Store the primary calendar provider and drop the cached value."""
+        self.settings_repo.update_primary_provider(user_id, provider)
+        invalidate_primary_provider(user_id)
+
     async def start_google_oauth_flow(self, user_id: UUID) -> dict:
         """
         Start Google OAuth device flow.
@@ -116,7 +164,7 @@ class CalendarOAuthUseCases:
         # Set as primary provider if requested OR if no primary provider exists yet
         settings = self.settings_repo.get_or_create_settings(user_id)
         if set_as_primary or not settings.primary_calendar_provider:
-            self.settings_repo.update_primary_provider(user_id, "google")
+            self._update_primary_provider(user_id, "google")
 
         return {
             "success": True,
@@ -167,7 +215,7 @@ class CalendarOAuthUseCases:
         # Set as primary provider if requested OR if no primary provider exists yet
         settings = self.settings_repo.get_or_create_settings(user_id)
         if set_as_primary or not settings.primary_calendar_provider:
-            self.settings_repo.update_primary_provider(user_id, "microsoft")
+            self._update_primary_provider(user_id, "microsoft")
 
         return {
             "success": True,
@@ -195,7 +243,7 @@ class CalendarOAuthUseCases:
             raise ValueError(f"Provider {provider} is not connected")
 
         # Set as primary
-        self.settings_repo.update_primary_provider(user_id, provider)
+        self._update_primary_provider(user_id, provider)
 
         return {
             "success": True,
@@ -236,10 +284,10 @@ class CalendarOAuthUseCases:
             if all_tokens:
                 # Set another provider as primary
                 other_provider = all_tokens[0].provider
-                self.settings_repo.update_primary_provider(user_id, other_provider)
+                self._update_primary_provider(user_id, other_provider)
             else:
                 # No providers left
-                self.settings_repo.update_primary_provider(user_id, None)
+                self._update_primary_provider(user_id, None)
 
         return True
 
@@ -2,19 +2,264 @@
 Conversation use cases.
 Part of Application layer - orchestrates conversation operations.
 """
-from typing import Optional, List, AsyncIterator
+from typing import Optional, List, AsyncIterator, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-import json
+import asyncio
+import hashlib
+import logging
+import threading
+import orjson
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.domain.entities.conversation import Conversation, Message
-from app.domain.services.command_parser import CommandParser, CommandType
-from app.infrastructure.repositories.conversation_repository import ConversationRepository
+from app.domain.entities.conversation import Conversation, DialogState, Message
+from app.domain.services.command_parser import (
+    HELP_TEXTS,
+    UNKNOWN_COMMAND_TEXT,
+    CommandParser,
+    CommandType,
+    ParsedCommand,
+)
+from app.infrastructure.repositories.conversation_repository import ConversationRepository, Cursor
 from app.infrastructure.services.claude_service import ClaudeService
 from app.infrastructure.services.widget_service import WidgetService
+from app.infrastructure.services.mcp_distributor import InputSource, MCPExecutionResult, get_distributor
+from app.infrastructure.services.intent_detector import DetectedIntent, IntentDetector, IntentType
+from app.infrastructure.database.session import AsyncSessionLocal, run_in_db_pool
+from app.core.test_mode_context import get_test_mode
 from app.application.use_cases.calendar_event_use_cases import CalendarEventUseCases
+from app.application.use_cases.calendar_oauth_use_cases import get_cached_primary_provider
+from app.application.use_cases.task_use_cases import TaskUseCases
+
+logger = logging.getLogger(__name__)
+
+# Date context for calendar prompts
+_TZ_NL = ZoneInfo("Europe/Amsterdam")
+_DAYS_NL: tuple[str, ...] = ("maandag", "dinsdag", "woensdag", "donderdag", "vrijdag", "zaterdag", "zondag")
+_WEEK_LABELS: tuple[str, ...] = ("VANDAAG", "MORGEN", "", "", "", "", "")
+# Day offsets for the two-week views (shared instead of rebuilt per request)
+_TD_DAYS: tuple[timedelta, ...] = tuple(timedelta(days=i) for i in range(14))
+
+# Command and tool response templates (shared by #calendar, #reminder and
+# the matching Claude tools)
+_TPL_TEST_MODE_LOG = (
+    "🔧 **TEST MODE: Alleen logging**\n\n"
+    "📍 Route: {route}\n"
+    "🔧 Tool: {tool}\n"
+    "📋 Parameters:\n```json\n{params}\n```\n\n"
+    "⚠️ Geen uitvoering (test_mode=1)"
+)
+_TPL_TEST_MODE_CONFIRM = (
+    "🔧 **TEST MODE: Bevestiging vereist**\n\n"
+    "📍 Route: {route}\n"
+    "🔧 Tool: {tool}\n"
+    "📋 Parameters:\n```json\n{params}\n```\n\n"
+    "⏳ Wacht op bevestiging via popup..."
+)
+_TPL_CALENDAR_OK = (
+    "✅ Agenda-afspraak aangemaakt!\n\n"
+    "📅 **{title}**\n"
+    "🕐 {start} - {end}\n"
+    "📍 {location}\n\n"
+    "De afspraak is toegevoegd aan je {provider_name}."
+)
+_TPL_REMINDER_OK = (
+    "⏰ Herinnering aangemaakt!\n\n"
+    "📝 {title}\n"
+    "🕐 {start}\n\n"
+    "De herinnering is toegevoegd aan je {calendar_name}."
+)
+# Rule-based detector for fully specified reminder/appointment requests,
+# which run their tool directly instead of through a Claude turn
+_intent_detector = IntentDetector()
+
+# Most recent messages sent to Claude as conversation history
+_CLAUDE_HISTORY_MESSAGES = 50
+
+# Streamed text is sent in batches of at least this many characters, or
+# after this many seconds, instead of one SSE frame per Claude delta
+_STREAM_FLUSH_CHARS = 64
+_STREAM_FLUSH_DELAY = 0.015
+
+_DIALOG_CANCELLED = "👍 Oké, ik heb het geannuleerd."
+_NOTE_PROMPT = "📝 Notitie functie wordt geactiveerd. Wat wil je noteren?\n\n"
+_SCAN_PROMPT = "📸 Scan functie wordt geactiveerd. Upload een document om te scannen.\n\n"
+
+# Title generation prompts
+_TPL_TITLE_PROMPT = (
+    "Geef een korte, beschrijvende titel (2-5 woorden) voor dit gesprek:\n\n"
+    "{context}\n\n"
+    "Regels:\n"
+    "- Maximaal 5 woorden\n"
+    "- Beschrijf het hoofdonderwerp\n"
+    "- In het Nederlands\n"
+    "- Geen aanhalingstekens of speciale tekens\n"
+    "- Gewoon de titel, niets anders\n\n"
+    "Titel:"
+)
+# Most message characters sent to Claude as title context
+_TITLE_CONTEXT_CHARS = 500
+_TITLE_SYSTEM_PROMPT = (
+    "Je bent een expert in het maken van korte, beschrijvende titels. "
+    "Geef alleen de titel, niets anders."
+)
+
+# Generated titles keyed by a hash of the normalized conversation opening
+# (case and whitespace folded), so repeated openings skip the Claude call
+_title_cache: TTLCache = TTLCache(maxsize=10_000, ttl=7 * 24 * 3600)
+_title_cache_lock = threading.Lock()
+
+# Background message writes in flight (strong references so they are not
+# garbage collected before they finish)
+_pending_writes: set[asyncio.Task] = set()
+# Latest background write per conversation; later writes and reads of the
+# conversation wait for it, so history is complete and stays in order
+_latest_writes: dict[UUID, asyncio.Task] = {}
+
+
+def _pretty_json(value) -> str:
+    """Pretty-print a value as JSON (2-space indent, non-ASCII kept as-is)."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+
+
+def _title_cache_key(context: str) -> str:
+    """Get the title cache key for a conversation opening."""
+    normalized = " ".join(context.casefold().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _title_context(messages, max_chars: int = _TITLE_CONTEXT_CHARS) -> str:
+    """
+    Build the title prompt context from the opening messages.
+    Message contents are sliced so the context never holds more than
+    max_chars characters of content, however long the messages are.
+    """
+    lines = []
+    remaining = max_chars
+    for msg in messages:
+        if remaining <= 0:
+            break
+        content = msg.content[:remaining]
+        lines.append(f"{msg.role}: {content}")
+        remaining -= len(content)
+    return "\n".join(lines)
+
+
+def _format_trace(template: str, trace) -> str:
+    """Fill a test-mode template from a distributor route trace."""
+    return template.format(
+        route=f"{trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}",
+        tool=trace.tool_name,
+        params=_pretty_json(trace.tool_params),
+    )
+
+
+def _test_mode_response(result: MCPExecutionResult) -> Optional[str]:
+    """
+    Get the test-mode reply for a distributor result.
+
+    Args:
+        result: Result of MCPDistributor.route_and_execute
+
+    Returns:
+        The route trace message for test_mode=1 (log only) or for
+        test_mode=2 when confirmation is required, otherwise None
+    """
+    test_mode = get_test_mode()
+    if test_mode == 1:
+        if result.route_trace:
+            return _format_trace(_TPL_TEST_MODE_LOG, result.route_trace)
+        return "🔧 Test mode: geen uitvoering"
+
+    if test_mode == 2 and result.requires_confirmation:
+        if result.route_trace:
+            return _format_trace(_TPL_TEST_MODE_CONFIRM, result.route_trace)
+        return "🔧 Wacht op bevestiging..."
+
+    return None
+
+
+async def _coalesce(
+    chunks: AsyncIterator[str],
+    max_chars: int = _STREAM_FLUSH_CHARS,
+    max_delay: float = _STREAM_FLUSH_DELAY,
+) -> AsyncIterator[str]:
+    """
+    Merge small stream chunks into larger ones.
+    A batch is flushed once it reaches max_chars or once its first chunk has
+    waited max_delay seconds, so latency stays bounded. The source is read by
+    a single producer task (it may hold an HTTP stream open) through a
+    bounded queue.
+
+    Args:
+        chunks: Source of text chunks
+        max_chars: Flush when the batch holds at least this many characters
+        max_delay: Flush when the oldest chunk in the batch is this old (seconds)
+
+    Yields:
+        Batches of concatenated chunks, in order
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+    done = object()
+
+    async def produce() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(e)
+        await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    loop = asyncio.get_running_loop()
+    batch: List[str] = []
+    size = 0
+    deadline = 0.0
+    try:
+        while True:
+            if batch:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    yield "".join(batch)
+                    batch, size = [], 0
+                    continue
+            else:
+                item = await queue.get()
+
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+
+            if not batch:
+                deadline = loop.time() + max_delay
+            batch.append(item)
+            size += len(item)
+            if size >= max_chars:
+                yield "".join(batch)
+                batch, size = [], 0
+
+        if batch:
+            yield "".join(batch)
+    finally:
+        producer.cancel()
+
+
+async def _wait_for_conversation_writes(conversation_id: UUID) -> None:
+    """Wait for this process's background writes to a conversation to finish."""
+    pending = _latest_writes.get(conversation_id)
+    if pending is not None:
+        await asyncio.wait([pending])
+
+
+async def wait_for_pending_writes() -> None:
+    """Wait for background message writes to finish (application shutdown)."""
+    if _pending_writes:
+        await asyncio.wait(list(_pending_writes))
 
 
 class ConversationUseCases:
@@ -22,14 +267,37 @@ class ConversationUseCases:
     Use cases for conversation management and AI chat.
     """
 
-    def __init__(self, db: Session):
+    # Date context for the chat system prompt, keyed by minute (see _get_date_context)
+    _DATE_CONTEXT_CACHE: dict[str, str] = {}
+
+    def __init__(self, db: AsyncSession, sync_db: Optional[Session] = None):
+        """
+        Args:
+            db: Async session for conversations and messages
+            sync_db: Sync session for the task and calendar settings use cases
+                (needed only to send messages: commands and tool calls)
+        """
         self.db = db
+        self.sync_db = sync_db
         self.conversation_repo = ConversationRepository(db)
-        self.claude_service = ClaudeService()
+        self.claude_service = ClaudeService.instance()
         self.command_parser = CommandParser()
         self.widget_service = WidgetService()
-
-    def create_conversation(
+        # Tool calls that wait for confirmation after this turn (test_mode=2);
+        # Claude may emit several in one reply
+        self._pending_confirmations: List[dict] = []
+        # Streamed replies show a confirmation popup for traced tool calls
+        self._popup_confirmations = False
+        self._command_handlers = {
+            CommandType.HELP: self._handle_help,
+            CommandType.CALENDAR: self._handle_calendar,
+            CommandType.REMINDER: self._handle_reminder,
+            CommandType.TASK: self._handle_task,
+            CommandType.NOTE: self._handle_note,
+            CommandType.SCAN: self._handle_scan,
+        }
+
+    async def create_conversation(
         self,
         user_id: UUID,
         mode: str = "chat",
@@ -54,16 +322,16 @@ class ConversationUseCases:
         )
 
         # Persist to database
-        conversation_model = self.conversation_repo.create_conversation(
+        conversation_model = await self.conversation_repo.create_conversation(
             user_id=user_id,
             title=conversation_entity.title,
             mode=mode,
             metadata={},
         )
 
-        return self.conversation_repo.conversation_to_entity(conversation_model)
+        return self.conversation_repo.conversation_to_entity(conversation_model, include_messages=False)
 
-    def get_conversation(
+    async def get_conversation(
         self,
         conversation_id: UUID,
         user_id: UUID,
@@ -78,9 +346,10 @@ class ConversationUseCases:
         Returns:
             Conversation entity or None
         """
-        conversation_model = self.conversation_repo.get_conversation(
+        conversation_model = await self.conversation_repo.get_conversation(
             conversation_id=conversation_id,
             user_id=user_id,
+            include_messages=True,
         )
 
         if not conversation_model:
@@ -88,36 +357,232 @@ class ConversationUseCases:
 
         return self.conversation_repo.conversation_to_entity(conversation_model)
 
-    def get_user_conversations(
+    async def _load_conversation(
+        self,
+        conversation_id: UUID,
+        user_id: UUID,
+        include_history: bool,
+    ) -> Optional[Conversation]:
+        """
+        Load the conversation needed to answer a message, checking access.
+        Commands and fast-path tool calls only need the conversation itself;
+        AI replies need its history.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID (for authorization)
+            include_history: Load the latest messages Claude sees
+
+        Returns:
+            Conversation entity (with its latest messages if include_history),
+            or None if not found or not owned by the user
+        """
+        await _wait_for_conversation_writes(conversation_id)
+        model = await self.conversation_repo.get_conversation(
+            conversation_id=conversation_id,
+            user_id=user_id,
+        )
+        if not model:
+            return None
+
+        conversation = self.conversation_repo.conversation_to_entity(model, include_messages=False)
+        if include_history:
+            await self._load_history(conversation)
+        return conversation
+
+    async def _load_history(self, conversation: Conversation) -> None:
+        """Load the latest messages Claude sees into the conversation."""
+        # Only the tail is loaded, however long the chat is
+        latest = await self.conversation_repo.get_latest_messages(
+            conversation.id, limit=_CLAUDE_HISTORY_MESSAGES
+        )
+        to_entity = self.conversation_repo.message_to_entity
+        conversation.messages = [to_entity(msg) for msg in latest]
+
+    async def _start_turn(
+        self,
+        conversation_id: UUID,
+        user_id: UUID,
+        content: str,
+    ) -> Tuple[ParsedCommand, Optional[DetectedIntent], Conversation, Optional[str]]:
+        """
+        Classify a user message and load what is needed to answer it.
+        Commands, fast-path tool calls and answers to an open confirmation
+        question are handled without Claude, so they skip the history load.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID (for authorization)
+            content: Message content
+
+        Returns:
+            Tuple of (parsed command, fast-path intent or None, conversation,
+            reply to an open confirmation question or None)
+
+        Raises:
+            ValueError: If conversation not found or user doesn't have access
+        """
+        parsed_command = self.command_parser.parse(content)
+        fast_path = None
+        confirmation = None
+        if not parsed_command.is_command():
+            fast_path = _intent_detector.detect_tool_call(content)
+            if fast_path is None:
+                confirmation = self.command_parser.parse_confirmation(content)
+
+        conversation = await self._load_conversation(
+            conversation_id,
+            user_id,
+            include_history=not parsed_command.is_command() and fast_path is None and confirmation is None,
+        )
+        if not conversation:
+            raise ValueError("Conversation not found or access denied")
+
+        dialog_reply = await self._advance_dialog(conversation, confirmation)
+        if dialog_reply is None and confirmation is not None:
+            # A "ja"/"nee" without an open question is answered by Claude
+            await self._load_history(conversation)
+
+        return parsed_command, fast_path, conversation, dialog_reply
+
+    async def _advance_dialog(self, conversation: Conversation, confirmation: Optional[bool]) -> Optional[str]:
+        """
+        Move the conversation's dialog state on by one user message.
+        A "ja" to an open question runs the stored tool calls and a "nee"
+        cancels them; any other message counts down the question's lifetime.
+
+        Args:
+            conversation: Conversation (with its metadata)
+            confirmation: Parsed yes/no answer, or None for other messages
+
+        Returns:
+            Reply to the answer, or None when the message is not one
+        """
+        state = conversation.dialog_state
+        if state == DialogState.IDLE:
+            return None
+
+        if state == DialogState.AWAITING_CONFIRMATION and confirmation is not None:
+            slots = conversation.dialog_slots
+            if not confirmation:
+                conversation.clear_dialog()
+                await self._save_dialog(conversation)
+                return _DIALOG_CANCELLED
+
+            # Move to EXECUTING in one conditional UPDATE first, so a second
+            # (concurrent) "ja" cannot run the calls again
+            conversation.start_executing()
+            if not await self.conversation_repo.update_metadata_if_dialog_state(
+                conversation.id, DialogState.AWAITING_CONFIRMATION.value, conversation.metadata
+            ):
+                # Another message answered the question first
+                return None
+            try:
+                replies = []
+                # Questions opened before calls were batched hold a single call
+                for call in slots.get("calls", [slots]):
+                    if call["tool_name"] == "create_calendar_event":
+                        replies.append(await self._execute_create_calendar_event(
+                            conversation.user_id, call["tool_params"], confirmed=True
+                        ))
+                    else:
+                        replies.append(await self._execute_create_reminder(
+                            conversation.user_id, call["tool_params"], confirmed=True
+                        ))
+                return "\n\n".join(replies)
+            finally:
+                conversation.clear_dialog()
+                await self._save_dialog(conversation)
+
+        # Not an answer: the question (or a stale EXECUTING state) ages out
+        conversation.tick_dialog()
+        await self._save_dialog(conversation)
+        return None
+
+    async def _finish_turn(self, conversation: Conversation) -> None:
+        """Open one confirmation question for the tool calls waiting on one; a "ja" runs them all."""
+        if not self._pending_confirmations:
+            return
+        conversation.await_confirmation({"calls": self._pending_confirmations})
+        self._pending_confirmations = []
+        await self._save_dialog(conversation)
+
+    def _hold_for_confirmation(self, tool_name: str, tool_input: dict, result: MCPExecutionResult) -> None:
+        """
+        Remember a tool call that waits for a "ja" in the chat.
+        A streamed reply with a route trace is confirmed through the client's
+        popup (POST /mcp/confirm) instead, so no chat question is opened for
+        it; otherwise a later "ja" would run the call a second time.
+
+        Args:
+            tool_name: Tool that was routed
+            tool_input: Its parameters
+            result: Result of MCPDistributor.route_and_execute
+        """
+        if not result.requires_confirmation:
+            return
+        if self._popup_confirmations and result.route_trace is not None:
+            return
+        self._pending_confirmations.append({"tool_name": tool_name, "tool_params": tool_input})
+
+    async def _save_dialog(self, conversation: Conversation) -> None:
+        """Persist the conversation's dialog state."""
+        await self.conversation_repo.update_conversation(conversation.id, metadata=conversation.metadata)
+
+    async def _direct_reply(
+        self,
+        parsed_command: ParsedCommand,
+        fast_path: Optional[DetectedIntent],
+        dialog_reply: Optional[str],
+        conversation: Conversation,
+    ) -> Optional[str]:
+        """Answer a message that needs no Claude turn, or return None."""
+        if dialog_reply is not None:
+            return dialog_reply
+        if fast_path:
+            return await self._execute_fast_path(fast_path, conversation.user_id)
+        if parsed_command.is_command():
+            return await self._handle_command(parsed_command, conversation)
+        return None
+
+    async def get_user_conversations(
         self,
         user_id: UUID,
         mode: Optional[str] = None,
         limit: int = 50,
+        cursor: Optional[Cursor] = None,
         offset: int = 0,
-    ) -> List[Conversation]:
+    ) -> Tuple[List[Conversation], Optional[Cursor]]:
         """
-        Get all conversations for a user.
+        Get all conversations for a user, most recently updated first.
 
         Args:
             user_id: User ID
             mode: Optional filter by mode
             limit: Max results
-            offset: Offset for pagination
+            cursor: Cursor returned with the previous page (None for the first page)
+            offset: Legacy offset pagination (ignored when cursor is given)
 
         Returns:
-            List of Conversation entities
+            Tuple of (Conversation entities, cursor for the next page or None)
         """
-        conversation_models = self.conversation_repo.get_user_conversations(
+        conversation_models = await self.conversation_repo.get_user_conversations(
             user_id=user_id,
             mode=mode,
             limit=limit,
+            cursor=cursor,
             offset=offset,
+            include_messages=True,  # message count and latest message are listed
         )
 
-        return [
+        conversations = [
             self.conversation_repo.conversation_to_entity(model)
             for model in conversation_models
         ]
+        next_cursor = None
+        if len(conversations) == limit:
+            next_cursor = (conversations[-1].updated_at, conversations[-1].id)
+        return conversations, next_cursor
 
     async def send_message(
         self,
@@ -141,24 +606,23 @@ class ConversationUseCases:
         Raises:
             ValueError: If conversation not found or user doesn't have access
         """
-        # Get conversation
-        conversation = self.get_conversation(conversation_id, user_id)
-        if not conversation:
-            raise ValueError("Conversation not found or access denied")
-
-        # Check for commands
-        parsed_command = self.command_parser.parse(content)
+        # Classify the message and load the conversation, checking access
+        parsed_command, fast_path, conversation, dialog_reply = await self._start_turn(
+            conversation_id, user_id, content
+        )
 
-        # Save user message
-        user_message = self.conversation_repo.add_message(
+        # The user message is saved together with the reply below; the
+        # conversation sees it in memory already
+        received_at = datetime.utcnow()
+        user_metadata = self._user_message_metadata(parsed_command)
+        conversation.messages.append(Message(
+            id=None,
             conversation_id=conversation_id,
             role="user",
             content=content,
-            metadata={
-                "command": parsed_command.command_type.value if parsed_command.is_command() else None,
-                "command_params": parsed_command.parameters if parsed_command.is_command() else None,
-            },
-        )
+            created_at=received_at,
+            metadata=user_metadata,
+        ))
 
         # Detect widget intent
         widget_intent = await self.widget_service.detect_widget_intent(content)
@@ -168,29 +632,23 @@ class ConversationUseCases:
         if widget_intent.widget_type and widget_intent.confidence >= 0.7:
             widget_data = await self.widget_service.create_widget_for_intent(widget_intent)
 
-        # Handle special commands
-        if parsed_command.is_command():
-            response_content = await self._handle_command(parsed_command, conversation)
-        else:
-            # Get AI response
+        # Handle commands, fast-path tool calls and confirmations, or get AI response
+        response_content = await self._direct_reply(parsed_command, fast_path, dialog_reply, conversation)
+        if response_content is None:
             response_content = await self._get_ai_response(conversation, mode or conversation.mode)
-
-        # Save assistant response (with widget if available)
-        assistant_message = self.conversation_repo.add_message(
-            conversation_id=conversation_id,
-            role="assistant",
-            content=response_content,
-            metadata={"widget": widget_data} if widget_data else None,
+        await self._finish_turn(conversation)
+
+        # Save user message and assistant response (with widget if available)
+        # in one transaction
+        _, assistant_message = await self.conversation_repo.add_messages(
+            conversation_id,
+            [
+                {"role": "user", "content": content, "metadata": user_metadata, "created_at": received_at},
+                self._assistant_row(response_content, widget_data),
+            ],
         )
 
-        return Message(
-            id=str(assistant_message.id),
-            conversation_id=assistant_message.conversation_id,
-            role=assistant_message.role,
-            content=assistant_message.content,
-            created_at=assistant_message.created_at,
-            metadata=assistant_message.metadata or {},
-        )
+        return assistant_message
 
     async def send_message_stream(
         self,
@@ -218,31 +676,30 @@ class ConversationUseCases:
         """
         # Store test_mode for use in tool execution
         self._test_mode = test_mode
-        # Get conversation
-        conversation = self.get_conversation(conversation_id, user_id)
-        if not conversation:
-            raise ValueError("Conversation not found or access denied")
-
-        # Check for commands
-        parsed_command = self.command_parser.parse(content)
+        self._popup_confirmations = True
+        # Classify the message and load the conversation, checking access
+        parsed_command, fast_path, conversation, dialog_reply = await self._start_turn(
+            conversation_id, user_id, content
+        )
 
-        # Save user message
-        user_message = self.conversation_repo.add_message(
+        # Save the user message in the background, overlapping the write with
+        # the reply; the conversation sees it in memory already
+        received_at = datetime.utcnow()
+        user_metadata = self._user_message_metadata(parsed_command)
+        user_write = self._save_messages_in_background(
+            conversation_id,
+            [{"role": "user", "content": content, "metadata": user_metadata, "created_at": received_at}],
+        )
+        conversation.messages.append(Message(
+            id=None,
             conversation_id=conversation_id,
             role="user",
             content=content,
-            metadata={
-                "command": parsed_command.command_type.value if parsed_command.is_command() else None,
-                "command_params": parsed_command.parameters if parsed_command.is_command() else None,
-            },
-        )
+            created_at=received_at,
+            metadata=user_metadata,
+        ))
 
-        # Reload conversation to include the new user message
-        conversation = self.get_conversation(conversation_id, user_id)
-        if not conversation:
-            raise ValueError("Failed to reload conversation")
-
-        # Detect widget intent before processing
+        # Detect widget intent
         widget_intent = await self.widget_service.detect_widget_intent(content)
         widget_data = None
 
@@ -250,73 +707,131 @@ class ConversationUseCases:
         if widget_intent.widget_type and widget_intent.confidence >= 0.7:
             widget_data = await self.widget_service.create_widget_for_intent(widget_intent)
 
-        # Handle commands or get AI response
-        if parsed_command.is_command():
-            response_content = await self._handle_command(parsed_command, conversation)
-            # Save response (with widget if available)
-            self.conversation_repo.add_message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=response_content,
-                metadata={"widget": widget_data} if widget_data else None,
+        # Handle commands, fast-path tool calls and confirmations, or get AI response
+        response_content = await self._direct_reply(parsed_command, fast_path, dialog_reply, conversation)
+        if response_content is not None:
+            await self._finish_turn(conversation)
+            # Save response (with widget if available) in the background
+            self._save_messages_in_background(
+                conversation_id, [self._assistant_row(response_content, widget_data)], after=user_write
             )
             yield response_content
         else:
             # Stream AI response
-            full_response = ""
+            parts: List[str] = []
             async for chunk in self._get_ai_response_stream(conversation, mode or conversation.mode):
-                full_response += chunk
+                parts.append(chunk)
                 yield chunk
+            full_response = "".join(parts)
+            await self._finish_turn(conversation)
 
-            # Save complete response (with widget if available)
-            self.conversation_repo.add_message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=full_response,
-                metadata={"widget": widget_data} if widget_data else None,
+            # Save complete response (with widget if available) in the background
+            self._save_messages_in_background(
+                conversation_id, [self._assistant_row(full_response, widget_data)], after=user_write
             )
 
+    @staticmethod
+    def _save_messages_in_background(
+        conversation_id: UUID,
+        rows: List[dict],
+        after: Optional[asyncio.Task] = None,
+    ) -> asyncio.Task:
+        """
+        Save messages without making the caller wait for the write.
+        Uses its own session, since the request's session may be closed (or
+        used by other calls) while the write runs.
+
+        Args:
+            conversation_id: Conversation ID
+            rows: Message dicts for ConversationRepository.add_messages
+            after: Optional earlier write to finish first (keeps insert order);
+                defaults to the conversation's latest pending write
+
+        Returns:
+            The background task
+        """
+        if after is None:
+            after = _latest_writes.get(conversation_id)
+
+        async def run() -> None:
+            if after is not None:
+                await asyncio.wait([after])
+            async with AsyncSessionLocal() as db:
+                await ConversationRepository(db).add_messages(conversation_id, rows)
+
+        def on_done(task: asyncio.Task) -> None:
+            _pending_writes.discard(task)
+            if _latest_writes.get(conversation_id) is task:
+                del _latest_writes[conversation_id]
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("Failed to save messages for %s: %s", conversation_id, task.exception())
+
+        task = asyncio.create_task(run())
+        _pending_writes.add(task)
+        _latest_writes[conversation_id] = task
+        task.add_done_callback(on_done)
+        return task
+
+    @staticmethod
+    def _assistant_row(content: str, widget_data: Optional[dict] = None) -> dict:
+        """Build the add_messages row for an assistant reply (with widget if available)."""
+        return {
+            "role": "assistant",
+            "content": content,
+            "metadata": {"widget": widget_data} if widget_data else None,
+            "created_at": datetime.utcnow(),
+        }
+
+    @staticmethod
+    def _user_message_metadata(parsed_command) -> dict:
+        """Build the command metadata stored with a user message."""
+        is_command = parsed_command.is_command()
+        return {
+            "command": parsed_command.command_type.value if is_command else None,
+            "command_params": parsed_command.parameters if is_command else None,
+        }
+
     async def _handle_command(self, parsed_command, conversation: Conversation) -> str:
         """Handle special commands."""
-        if parsed_command.command_type == CommandType.HELP:
-            topic = parsed_command.parameters.get("topic")
-            if topic:
-                # Create temp command to get its help text
-                temp_cmd = type('obj', (object,), {'command_type': topic, 'get_help_text': lambda: CommandParser().parse(f"#{topic.value}").get_help_text()})()
-                return temp_cmd.get_help_text()
-            return parsed_command.get_help_text()
-
-        elif parsed_command.command_type == CommandType.CALENDAR:
-            # Use Claude to extract calendar event details from the command
-            # Then route through MCP Distributor for test mode support
-            try:
-                from app.infrastructure.services.mcp_distributor import MCPDistributor, InputSource
-                from app.infrastructure.repositories.user_settings_repository import UserSettingsRepository
-                from app.core.test_mode_context import get_test_mode
-
-                # Use Amsterdam timezone for correct date parsing
-                tz_nl = ZoneInfo("Europe/Amsterdam")
-                now = datetime.now(tz_nl)
-
-                # Create two-week view for better date parsing
-                days_nl = ['maandag', 'dinsdag', 'woensdag', 'donderdag', 'vrijdag', 'zaterdag', 'zondag']
-
-                # This week
-                this_week_info = []
-                for i in range(7):
-                    day = now + timedelta(days=i)
-                    day_name = days_nl[day.weekday()]
-                    label = " (VANDAAG)" if i == 0 else " (MORGEN)" if i == 1 else ""
-                    this_week_info.append(f"  - {day_name.capitalize()} {day.strftime('%d-%m-%Y')}{label}")
-
-                # Next week
-                next_week_info = []
-                for i in range(7, 14):
-                    day = now + timedelta(days=i)
-                    day_name = days_nl[day.weekday()]
-                    next_week_info.append(f"  - {day_name.capitalize()} {day.strftime('%d-%m-%Y')}")
-
-                extraction_prompt = f"""Extract calendar event details from this request: "{parsed_command.original_text}"
+        handler = self._command_handlers.get(parsed_command.command_type)
+        if handler is None:
+            return UNKNOWN_COMMAND_TEXT
+        return await handler(parsed_command, conversation)
+
+    async def _handle_help(self, parsed_command, conversation: Conversation) -> str:
+        """Handle #help: general help or help for one command."""
+        topic = parsed_command.parameters.get("topic")
+        if topic:
+            return HELP_TEXTS.get(topic, UNKNOWN_COMMAND_TEXT)
+        return parsed_command.get_help_text()
+
+    async def _handle_calendar(self, parsed_command, conversation: Conversation) -> str:
+        """Handle #calendar: extract event details with Claude and create the event."""
+        # Use Claude to extract calendar event details from the command
+        # Then route through MCP Distributor for test mode support
+        try:
+            # Use Amsterdam timezone for correct date parsing
+            now = datetime.now(_TZ_NL)
+
+            # Create two-week view for better date parsing
+
+            days = [now + delta for delta in _TD_DAYS]
+
+            # This week
+            this_week_info = []
+            for i in range(7):
+                day = days[i]
+                day_name = _DAYS_NL[day.weekday()]
+                label = f" ({_WEEK_LABELS[i]})" if _WEEK_LABELS[i] else ""
+                this_week_info.append(f"  - {day_name.capitalize()} {day.strftime('%d-%m-%Y')}{label}")
+
+            # Next week
+            next_week_info = []
+            for day in days[7:]:
+                day_name = _DAYS_NL[day.weekday()]
+                next_week_info.append(f"  - {day_name.capitalize()} {day.strftime('%d-%m-%Y')}")
+
+            extraction_prompt = f"""Extract calendar event details from this request: "{parsed_command.original_text}"
 
 Return JSON with:
 - title (string, required)
@@ -326,7 +841,7 @@ Return JSON with:
 - location (string, optional)
 - provider (string, optional - "google" or "microsoft" if mentioned)
 
-HUIDIGE DATUM EN TIJD: {days_nl[now.weekday()]} {now.strftime('%d-%m-%Y')} om {now.strftime('%H:%M')}
+HUIDIGE DATUM EN TIJD: {_DAYS_NL[now.weekday()]} {now.strftime('%d-%m-%Y')} om {now.strftime('%H:%M')}
 
 DEZE WEEK:
 {chr(10).join(this_week_info)}
@@ -337,99 +852,75 @@ VOLGENDE WEEK:
 BELANGRIJKE REGELS:
 1. Als de gebruiker een weekdag noemt ZONDER "volgende week" → gebruik de datum van DEZE WEEK
 2. Als de gebruiker "volgende week [weekdag]" zegt → gebruik de datum van VOLGENDE WEEK
-3. "morgen" = {(now + timedelta(days=1)).strftime('%d-%m-%Y')}
-4. "overmorgen" = {(now + timedelta(days=2)).strftime('%d-%m-%Y')}
+3. "morgen" = {days[1].strftime('%d-%m-%Y')}
+4. "overmorgen" = {days[2].strftime('%d-%m-%Y')}
 5. Standaard duur voor afspraken: 1 uur
 6. GEEN timezone suffix (+00:00) in de datetime - gebruik alleen YYYY-MM-DDTHH:MM:SS"""
 
-                response = await self.claude_service.send_message(
-                    messages=[{"role": "user", "content": extraction_prompt}],
-                    system_prompt="You are a calendar assistant. Extract event details and respond with valid JSON only."
-                )
+            response = await self.claude_service.send_message(
+                messages=[{"role": "user", "content": extraction_prompt}],
+                system_prompt="You are a calendar assistant. Extract event details and respond with valid JSON only."
+            )
 
-                event_data = json.loads(response["content"][0]["text"])
-
-                # Get user's primary calendar provider
-                settings_repo = UserSettingsRepository(self.db)
-                settings = settings_repo.get_settings(conversation.user_id)
-                primary_provider = settings.primary_calendar_provider if settings else "microsoft"
-
-                # Build tool params for MCP
-                tool_params = {
-                    "title": event_data["title"],
-                    "start_time": event_data["start_time"],
-                    "end_time": event_data["end_time"],
-                    "description": event_data.get("description"),
-                    "location": event_data.get("location"),
-                    "provider": event_data.get("provider"),  # May override default
-                }
-
-                # Route through MCP Distributor (test_mode read from context)
-                distributor = MCPDistributor(primary_provider=primary_provider)
-                result = await distributor.route_and_execute(
-                    tool_name="create_calendar_event",
-                    tool_params=tool_params,
-                    user_id=str(conversation.user_id),
-                    input_source=InputSource.COMMAND,
-                    original_input=parsed_command.original_text,
-                    provider=tool_params.get("provider"),
+            event_data = orjson.loads(response["content"][0]["text"])
+
+            # Get user's primary calendar provider (cached)
+            primary_provider = await get_cached_primary_provider(self.sync_db, conversation.user_id)
+
+            # Build tool params for MCP
+            tool_params = {
+                "title": event_data["title"],
+                "start_time": event_data["start_time"],
+                "end_time": event_data["end_time"],
+                "description": event_data.get("description"),
+                "location": event_data.get("location"),
+                "provider": event_data.get("provider"),  # May override default
+            }
+
+            # Route through MCP Distributor (test_mode read from context)
+            distributor = get_distributor(primary_provider)
+            result = await distributor.route_and_execute(
+                tool_name="create_calendar_event",
+                tool_params=tool_params,
+                user_id=str(conversation.user_id),
+                input_source=InputSource.COMMAND,
+                original_input=parsed_command.original_text,
+                provider=tool_params.get("provider"),
+            )
+
+            logger.info(
+                "[#CALENDAR CMD] test_mode=%s, result.success=%s, has_trace=%s, provider=%s",
+                get_test_mode(), result.success, result.route_trace is not None, tool_params.get("provider"),
+            )
+
+            # Test mode answers with the route trace instead of the result
+            test_mode_response = _test_mode_response(result)
+            if test_mode_response is not None:
+                return test_mode_response
+
+            # Normal execution result
+            if result.success and result.data:
+                provider_name = "Google Calendar" if tool_params.get("provider") == "google" else "Office 365"
+                return _TPL_CALENDAR_OK.format(
+                    title=tool_params["title"],
+                    start=tool_params["start_time"],
+                    end=tool_params["end_time"],
+                    location=tool_params.get("location") or "Geen locatie",
+                    provider_name=provider_name,
                 )
+            else:
+                return f"❌ Kon de afspraak niet maken: {result.error}"
 
-                # Get test_mode from context
-                test_mode = get_test_mode()
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.info(f"[#CALENDAR CMD] test_mode={test_mode}, result.success={result.success}, has_trace={result.route_trace is not None}, provider={tool_params.get('provider')}")
-
-                # Handle test mode responses
-                if test_mode == 1:
-                    trace = result.route_trace
-                    logger.info(f"[#CALENDAR CMD] test_mode=1, trace exists={trace is not None}")
-                    if trace:
-                        try:
-                            params_json = json.dumps(trace.tool_params, indent=2, ensure_ascii=False)
-                            msg = f"🔧 **TEST MODE: Alleen logging**\n\n" \
-                                  f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                                  f"🔧 Tool: {trace.tool_name}\n" \
-                                  f"📋 Parameters:\n```json\n{params_json}\n```\n\n" \
-                                  f"⚠️ Geen uitvoering (test_mode=1)"
-                            logger.info(f"[#CALENDAR CMD] Returning message, len={len(msg)}")
-                            return msg
-                        except Exception as format_err:
-                            logger.error(f"[#CALENDAR CMD] Format error: {format_err}")
-                            return f"🔧 Test mode: format error: {format_err}"
-                    return "🔧 Test mode: geen uitvoering (no trace)"
-
-                if test_mode == 2 and result.requires_confirmation:
-                    trace = result.route_trace
-                    if trace:
-                        return f"🔧 **TEST MODE: Bevestiging vereist**\n\n" \
-                               f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                               f"🔧 Tool: {trace.tool_name}\n" \
-                               f"📋 Parameters:\n```json\n{json.dumps(trace.tool_params, indent=2, ensure_ascii=False)}\n```\n\n" \
-                               f"⏳ Wacht op bevestiging via popup..."
-                    return "🔧 Wacht op bevestiging..."
-
-                # Normal execution result
-                if result.success and result.data:
-                    provider_name = "Google Calendar" if tool_params.get("provider") == "google" else "Office 365"
-                    return f"✅ Agenda-afspraak aangemaakt!\n\n📅 **{tool_params['title']}**\n🕐 {tool_params['start_time']} - {tool_params['end_time']}\n📍 {tool_params.get('location') or 'Geen locatie'}\n\nDe afspraak is toegevoegd aan je {provider_name}."
-                else:
-                    return f"❌ Kon de afspraak niet maken: {result.error}"
-
-            except Exception as e:
-                return f"❌ Kon de afspraak niet maken: {str(e)}\n\nZorg dat je een kalender hebt gekoppeld in Settings."
-
-        elif parsed_command.command_type == CommandType.REMINDER:
-            # Reminder is just like calendar but with a simpler message and 5 min duration
-            # Routes through MCP Distributor for test mode support
-            try:
-                from app.infrastructure.services.mcp_distributor import MCPDistributor, InputSource
-                from app.infrastructure.repositories.user_settings_repository import UserSettingsRepository
-                from app.core.test_mode_context import get_test_mode
+        except Exception as e:
+            return f"❌ Kon de afspraak niet maken: {str(e)}\n\nZorg dat je een kalender hebt gekoppeld in Settings."
 
-                today = datetime.now().strftime('%Y-%m-%d %H:%M')
-                extraction_prompt = f"""Extract reminder/event details from this request: "{parsed_command.original_text}"
+    async def _handle_reminder(self, parsed_command, conversation: Conversation) -> str:
+        """Handle #reminder: extract reminder details with Claude and create a 5-minute event."""
+        # Reminder is just like calendar but with a simpler message and 5 min duration
+        # Routes through MCP Distributor for test mode support
+        try:
+            today = datetime.now().strftime('%Y-%m-%d %H:%M')
+            extraction_prompt = f"""Extract reminder/event details from this request: "{parsed_command.original_text}"
 
 Return JSON with:
 - title (string, required - just the title without emoji)
@@ -443,193 +934,168 @@ Note: Do NOT include end_time - reminders are 5 minutes by default.
 Current date and time context: {today}
 Use this as reference for relative dates like "morgen" (tomorrow), "vanavond" (tonight), etc."""
 
-                response = await self.claude_service.send_message(
-                    messages=[{"role": "user", "content": extraction_prompt}],
-                    system_prompt="You are a calendar assistant. Extract event details and respond with valid JSON only."
-                )
+            response = await self.claude_service.send_message(
+                messages=[{"role": "user", "content": extraction_prompt}],
+                system_prompt="You are a calendar assistant. Extract event details and respond with valid JSON only."
+            )
 
-                event_data = json.loads(response["content"][0]["text"])
-
-                # Parse ISO 8601 datetime strings
-                start_time = datetime.fromisoformat(event_data["start_time"].replace('Z', '+00:00'))
-                # Reminders are 5 minutes long
-                end_time = start_time + timedelta(minutes=5)
-
-                # Add bell emoji to title
-                title_with_icon = f"🔔 {event_data['title']}"
-
-                # Get user's primary calendar provider
-                settings_repo = UserSettingsRepository(self.db)
-                settings = settings_repo.get_settings(conversation.user_id)
-                primary_provider = settings.primary_calendar_provider if settings else "microsoft"
-
-                # Build tool params for MCP
-                tool_params = {
-                    "title": title_with_icon,
-                    "start_time": start_time.isoformat(),
-                    "end_time": end_time.isoformat(),
-                    "description": event_data.get("description"),
-                    "location": event_data.get("location"),
-                    "provider": event_data.get("provider"),  # May override default
-                }
-
-                # Route through MCP Distributor (test_mode read from context)
-                distributor = MCPDistributor(primary_provider=primary_provider)
-                result = await distributor.route_and_execute(
-                    tool_name="create_reminder",
-                    tool_params=tool_params,
-                    user_id=str(conversation.user_id),
-                    input_source=InputSource.COMMAND,
-                    original_input=parsed_command.original_text,
-                    provider=tool_params.get("provider"),
-                )
+            event_data = orjson.loads(response["content"][0]["text"])
 
-                # Get test_mode from context
-                test_mode = get_test_mode()
-
-                # Handle test mode responses
-                if test_mode == 1:
-                    trace = result.route_trace
-                    if trace:
-                        return f"🔧 **TEST MODE: Alleen logging**\n\n" \
-                               f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                               f"🔧 Tool: {trace.tool_name}\n" \
-                               f"📋 Parameters:\n```json\n{json.dumps(trace.tool_params, indent=2, ensure_ascii=False)}\n```\n\n" \
-                               f"⚠️ Geen uitvoering (test_mode=1)"
-                    return "🔧 Test mode: geen uitvoering"
-
-                if test_mode == 2 and result.requires_confirmation:
-                    trace = result.route_trace
-                    if trace:
-                        return f"🔧 **TEST MODE: Bevestiging vereist**\n\n" \
-                               f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                               f"🔧 Tool: {trace.tool_name}\n" \
-                               f"📋 Parameters:\n```json\n{json.dumps(trace.tool_params, indent=2, ensure_ascii=False)}\n```\n\n" \
-                               f"⏳ Wacht op bevestiging via popup..."
-                    return "🔧 Wacht op bevestiging..."
-
-                # Normal execution result
-                if result.success and result.data:
-                    return f"⏰ Herinnering aangemaakt!\n\n📝 {event_data['title']}\n🕐 {start_time.strftime('%d-%m-%Y %H:%M')}\n\nDe herinnering is toegevoegd aan je kalender."
-                else:
-                    return f"❌ Kon de herinnering niet maken: {result.error}"
-
-            except Exception as e:
-                return f"❌ Kon de herinnering niet maken: {str(e)}\n\nZorg dat je een kalender hebt gekoppeld in Settings."
-
-        elif parsed_command.command_type == CommandType.TASK:
-            # Handle task creation
-            try:
-                from app.application.use_cases.task_use_cases import TaskUseCases
-                task_use_cases = TaskUseCases(self.db)
-
-                # Get parameters from command parser
-                params = parsed_command.parameters
-                title = params.get("title") or parsed_command.command_text
-
-                if not title or len(title.strip()) == 0:
-                    return "❌ Taak titel kan niet leeg zijn.\n\nVoorbeeld: #task Rapport maken deadline volgende week @Maria"
-
-                # Create task
-                task = task_use_cases.create_task(
-                    user_id=conversation.user_id,
-                    title=title,
-                    delegated_to_name=params.get("delegated_to"),
-                    due_date=params.get("due_date"),
-                    priority=params.get("priority", "medium"),
-                    tags=params.get("tags", []),
+            # Parse ISO 8601 datetime strings
+            start_time = datetime.fromisoformat(event_data["start_time"].replace('Z', '+00:00'))
+            # Reminders are 5 minutes long
+            end_time = start_time + timedelta(minutes=5)
+
+            # Add bell emoji to title
+            title_with_icon = f"🔔 {event_data['title']}"
+
+            # Get user's primary calendar provider (cached)
+            primary_provider = await get_cached_primary_provider(self.sync_db, conversation.user_id)
+
+            # Build tool params for MCP
+            tool_params = {
+                "title": title_with_icon,
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+                "description": event_data.get("description"),
+                "location": event_data.get("location"),
+                "provider": event_data.get("provider"),  # May override default
+            }
+
+            # Route through MCP Distributor (test_mode read from context)
+            distributor = get_distributor(primary_provider)
+            result = await distributor.route_and_execute(
+                tool_name="create_reminder",
+                tool_params=tool_params,
+                user_id=str(conversation.user_id),
+                input_source=InputSource.COMMAND,
+                original_input=parsed_command.original_text,
+                provider=tool_params.get("provider"),
+            )
+
+            # Test mode answers with the route trace instead of the result
+            test_mode_response = _test_mode_response(result)
+            if test_mode_response is not None:
+                return test_mode_response
+
+            # Normal execution result
+            if result.success and result.data:
+                return _TPL_REMINDER_OK.format(
+                    title=event_data["title"],
+                    start=start_time.strftime('%d-%m-%Y %H:%M'),
+                    calendar_name="kalender",
                 )
+            else:
+                return f"❌ Kon de herinnering niet maken: {result.error}"
 
-                # Build response message
-                response_lines = [
-                    f"✅ Taak aangemaakt!",
-                    f"",
-                    f"**{task['formatted_id']}**: {task['title']}",
-                ]
+        except Exception as e:
+            return f"❌ Kon de herinnering niet maken: {str(e)}\n\nZorg dat je een kalender hebt gekoppeld in Settings."
 
-                if task.get("delegated_person_name"):
-                    response_lines.append(f"👤 Gedelegeerd aan: {task['delegated_person_name']}")
+    async def _handle_task(self, parsed_command, conversation: Conversation) -> str:
+        """Handle #task: create a task from the parsed parameters."""
+        # Handle task creation
+        try:
+            task_use_cases = TaskUseCases(self.sync_db)
+
+            # Get parameters from command parser
+            params = parsed_command.parameters
+            title = params.get("title") or parsed_command.command_text
+
+            if not title or len(title.strip()) == 0:
+                return "❌ Taak titel kan niet leeg zijn.\n\nVoorbeeld: #task Rapport maken deadline volgende week @Maria"
+
+            # Create task
+            task = await run_in_db_pool(
+                task_use_cases.create_task,
+                user_id=conversation.user_id,
+                title=title,
+                delegated_to_name=params.get("delegated_to"),
+                due_date=params.get("due_date"),
+                priority=params.get("priority", "medium"),
+                tags=params.get("tags", []),
+            )
 
-                if task.get("due_date"):
-                    response_lines.append(f"📅 Deadline: {task['due_date']}")
+            # Build response message
+            response_lines = [
+                f"✅ Taak aangemaakt!",
+                f"",
+                f"**{task['formatted_id']}**: {task['title']}",
+            ]
 
-                response_lines.append(f"⚡ Prioriteit: {task['priority']}")
+            if task.get("delegated_person_name"):
+                response_lines.append(f"👤 Gedelegeerd aan: {task['delegated_person_name']}")
 
-                if task.get("tags"):
-                    response_lines.append(f"🏷️  Tags: {', '.join(task['tags'])}")
+            if task.get("due_date"):
+                response_lines.append(f"📅 Deadline: {task['due_date']}")
 
-                return "\n".join(response_lines)
+            response_lines.append(f"⚡ Prioriteit: {task['priority']}")
 
-            except Exception as e:
-                return f"❌ Kon de taak niet maken: {str(e)}"
+            if task.get("tags"):
+                response_lines.append(f"🏷️  Tags: {', '.join(task['tags'])}")
 
-        elif parsed_command.command_type == CommandType.NOTE:
-            return "📝 Notitie functie wordt geactiveerd. Wat wil je noteren?\n\n" + parsed_command.get_help_text()
+            return "\n".join(response_lines)
 
-        elif parsed_command.command_type == CommandType.SCAN:
-            return "📸 Scan functie wordt geactiveerd. Upload een document om te scannen.\n\n" + parsed_command.get_help_text()
+        except Exception as e:
+            return f"❌ Kon de taak niet maken: {str(e)}"
 
-        else:
-            return f"Onbekend commando. Typ #help voor beschikbare commando's."
+    async def _handle_note(self, parsed_command, conversation: Conversation) -> str:
+        """Handle #note: prompt the user for the note."""
+        return _NOTE_PROMPT + parsed_command.get_help_text()
+
+    async def _handle_scan(self, parsed_command, conversation: Conversation) -> str:
+        """Handle #scan: prompt the user to upload a document."""
+        return _SCAN_PROMPT + parsed_command.get_help_text()
 
     async def _get_ai_response(self, conversation: Conversation, mode: str) -> str:
         """Get AI response for conversation."""
         # Get recent messages for context
-        messages = conversation.get_messages_for_claude(max_messages=50)
+        messages = conversation.get_messages_for_claude(max_messages=_CLAUDE_HISTORY_MESSAGES)
 
         # Get system prompt for mode
         system_prompt = self.claude_service.get_system_prompt(mode)
 
-        # Call Claude API
+        # Call Claude API (system prompt and history are cached across turns)
         response = await self.claude_service.send_message(
             messages=messages,
             system_prompt=system_prompt,
+            cache_prompt=True,
         )
 
-        # Extract text from response
+        # Extract text from response (usually a single text block)
         content_blocks = response.get("content", [])
-        text_parts = [block.get("text", "") for block in content_blocks if block.get("type") == "text"]
+        if len(content_blocks) == 1 and content_blocks[0].get("type") == "text":
+            return content_blocks[0].get("text", "")
 
-        return "".join(text_parts)
+        return "".join(block.get("text", "") for block in content_blocks if block.get("type") == "text")
 
-    async def _get_ai_response_stream(self, conversation: Conversation, mode: str) -> AsyncIterator[str]:
-        """Stream AI response for conversation with tool use support."""
-        # Get recent messages for context
-        messages = conversation.get_messages_for_claude(max_messages=50)
-
-        # Get system prompt for mode
-        system_prompt = self.claude_service.get_system_prompt(mode)
-
-        # Get calendar tools
-        tools = self.claude_service.get_calendar_tools()
+    @classmethod
+    def _get_date_context(cls) -> str:
+        """
+        Get the date/time context block for the chat system prompt.
+        Cached per minute (Europe/Amsterdam), since that is its resolution.
 
-        # Add current date/time to system prompt for better date parsing
+        Returns:
+            Date context text to append to the system prompt
+        """
         # Use Amsterdam/Europe timezone
-        tz_nl = ZoneInfo("Europe/Amsterdam")
-        now = datetime.now(tz_nl)
+        now = datetime.now(_TZ_NL)
+        bucket = now.strftime('%Y%m%d%H%M')
+        cached = cls._DATE_CONTEXT_CACHE.get(bucket)
+        if cached is not None:
+            return cached
 
         # Create a week view for better date parsing
-        days_nl = ['maandag', 'dinsdag', 'woensdag', 'donderdag', 'vrijdag', 'zaterdag', 'zondag']
+        days = [now + _TD_DAYS[i] for i in range(7)]
         week_info = []
-        for i in range(7):
-            day = now + timedelta(days=i)
-            day_name = days_nl[day.weekday()]
-            label = "VANDAAG" if i == 0 else "MORGEN" if i == 1 else ""
-            week_info.append(f"  - {day_name.capitalize()} {day.strftime('%d-%m-%Y')} {label}")
+        for i, day in enumerate(days):
+            day_name = _DAYS_NL[day.weekday()]
+            week_info.append(f"  - {day_name.capitalize()} {day.strftime('%d-%m-%Y')} {_WEEK_LABELS[i]}")
 
         week_view = "\n".join(week_info)
 
-        # Calculate next occurrence of each weekday
-        def next_weekday(target_weekday: int) -> str:
-            days_ahead = target_weekday - now.weekday()
-            if days_ahead <= 0:  # Target day already happened this week
-                days_ahead += 7
-            return (now + timedelta(days=days_ahead)).strftime('%d-%m-%Y')
-
-        enhanced_system_prompt = f"""{system_prompt}
-
+        date_context = f"""
 HUIDIGE DATUM EN TIJD CONTEXT:
-Vandaag is {days_nl[now.weekday()]} {now.strftime('%d-%m-%Y')} om {now.strftime('%H:%M')}
+Vandaag is {_DAYS_NL[now.weekday()]} {now.strftime('%d-%m-%Y')} om {now.strftime('%H:%M')}
 
 Komende week (voor datum referentie):
 {week_view}
@@ -637,8 +1103,8 @@ Komende week (voor datum referentie):
 KRITIEKE REGELS VOOR DATUM PARSING:
 1. GEBRUIK ALTIJD de exacte datums uit de lijst hierboven
 2. Als de gebruiker een weekdag noemt (bijv. "donderdag"), zoek die dag in de lijst hierboven en gebruik DIE datum
-3. "morgen" = {(now + timedelta(days=1)).strftime('%d-%m-%Y')} ({days_nl[(now + timedelta(days=1)).weekday()]})
-4. "overmorgen" = {(now + timedelta(days=2)).strftime('%d-%m-%Y')} ({days_nl[(now + timedelta(days=2)).weekday()]})
+3. "morgen" = {days[1].strftime('%d-%m-%Y')} ({_DAYS_NL[days[1].weekday()]})
+4. "overmorgen" = {days[2].strftime('%d-%m-%Y')} ({_DAYS_NL[days[2].weekday()]})
 5. NOOIT een datum gokken - gebruik ALLEEN de datums uit de context hierboven
 6. Bij twijfel: VRAAG om bevestiging voordat je de tool aanroept
 
@@ -649,230 +1115,298 @@ KRITIEKE REGELS VOOR PROVIDER SELECTIE:
 4. Let op: de gebruiker kan zeggen "zet in mijn google agenda" of "in outlook" - detecteer dit!
 """
 
+        # DEBUG: Log the week view being sent to Claude
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("=== CALENDAR DEBUG ===")
+            logger.info("Week view sent to Claude:\n%s", week_view)
+            logger.info("morgen = %s", days[1].strftime('%d-%m-%Y'))
+            logger.info("=== END CALENDAR DEBUG ===")
+
+        # Keep only the current minute
+        cls._DATE_CONTEXT_CACHE.clear()
+        cls._DATE_CONTEXT_CACHE[bucket] = date_context
+        return date_context
+
+    async def _get_ai_response_stream(self, conversation: Conversation, mode: str) -> AsyncIterator[str]:
+        """Stream AI response for conversation with tool use support."""
+        # Get recent messages for context
+        messages = conversation.get_messages_for_claude(max_messages=_CLAUDE_HISTORY_MESSAGES)
+
+        # Get system prompt for mode
+        system_prompt = self.claude_service.get_system_prompt(mode)
+
+        # Get calendar tools
+        tools = self.claude_service.get_calendar_tools()
+
         # Stream from Claude API
         tool_uses = []  # Collect tool uses during streaming
-        text_response = ""
 
-        # DEBUG: Log the week view being sent to Claude
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info("=== CALENDAR DEBUG ===")
-        logger.info(f"Week view sent to Claude:\n{week_view}")
-        logger.info(f"morgen = {(now + timedelta(days=1)).strftime('%d-%m-%Y')}")
-        logger.info("=== END CALENDAR DEBUG ===")
-
-        async for event in self.claude_service.send_message_stream(
-            messages=messages,
-            system_prompt=enhanced_system_prompt,
-            tools=tools,
-        ):
-            if event["type"] == "text":
-                # Regular text response
-                text_response += event["text"]
-                yield event["text"]
-
-            elif event["type"] == "tool_use":
-                # Claude wants to use a tool
-                tool_uses.append(event)
-
-        # After streaming completes, execute any tool uses
+        async def text_chunks() -> AsyncIterator[str]:
+            async for event in self.claude_service.send_message_stream(
+                messages=messages,
+                system_prompt=system_prompt,
+                tools=tools,
+                # Current date/time context for better date parsing (rebuilt at
+                # most once per minute); appended after the cached static prompt
+                system_context=self._get_date_context(),
+                cache_prompt=True,
+            ):
+                if event["type"] == "text":
+                    # Regular text response
+                    yield event["text"]
+
+                elif event["type"] == "tool_use":
+                    # Claude wants to use a tool
+                    tool_uses.append(event)
+
+        # Send text in batches rather than one tiny chunk per delta
+        async for batch in _coalesce(text_chunks()):
+            yield batch
+
+        # After streaming completes, execute any tool uses concurrently and
+        # yield their results in the order Claude emitted them
         if tool_uses:
-            for tool_use in tool_uses:
-                tool_name = tool_use["name"]
-                tool_input = tool_use["input"]
+            # Resolve the primary provider once up front, so the concurrent
+            # executions hit the cache instead of sharing the session
+            await get_cached_primary_provider(self.sync_db, conversation.user_id)
+            tasks = [
+                asyncio.create_task(self._dispatch_tool(tool_use, conversation.user_id))
+                for tool_use in tool_uses
+            ]
+            for task in tasks:
+                result = await task
+                if result is not None:
+                    yield result
+
+    async def _execute_fast_path(self, intent: DetectedIntent, user_id: UUID) -> str:
+        """
+        Run the tool for a fully specified request without asking Claude.
 
-                # DEBUG: Log tool calls
-                logger.info(f"=== TOOL CALL DEBUG ===")
-                logger.info(f"Tool: {tool_name}")
-                logger.info(f"Input: {tool_input}")
-                logger.info(f"=== END TOOL CALL DEBUG ===")
+        Args:
+            intent: Result of IntentDetector.detect_tool_call
+            user_id: User ID
 
-                try:
-                    if tool_name == "create_calendar_event":
-                        # Execute calendar event creation
-                        result = await self._execute_create_calendar_event(
-                            conversation.user_id,
-                            tool_input
-                        )
-                        # Yield the result message
-                        yield f"\n\n{result}"
-
-                    elif tool_name == "create_reminder":
-                        # Execute reminder creation
-                        result = await self._execute_create_reminder(
-                            conversation.user_id,
-                            tool_input
-                        )
-                        # Yield the result message
-                        yield f"\n\n{result}"
-
-                except Exception as e:
-                    error_msg = f"\n\n❌ Fout bij uitvoeren actie: {str(e)}"
-                    yield error_msg
-
-    async def _execute_create_calendar_event(self, user_id: UUID, tool_input: dict, original_input: str = "") -> str:
-        """Execute calendar event creation via MCP Distributor."""
-        from app.infrastructure.services.mcp_distributor import MCPDistributor, InputSource
-        from app.infrastructure.repositories.user_settings_repository import UserSettingsRepository
-        from app.core.test_mode_context import get_test_mode
-        import json
+        Returns:
+            Tool result text
+        """
+        logger.info("Fast path: %s without Claude", intent.intent_type.value)
+
+        if intent.intent_type == IntentType.CALENDAR_CREATE:
+            return await self._execute_create_calendar_event(user_id, intent.extracted_params, intent.raw_input)
+        return await self._execute_create_reminder(user_id, intent.extracted_params, intent.raw_input)
+
+    async def _dispatch_tool(self, tool_use: dict, user_id: UUID) -> Optional[str]:
+        """
+        Execute one tool use emitted by Claude.
+
+        Args:
+            tool_use: Tool use event with "name" and "input"
+            user_id: User ID
+
+        Returns:
+            Result text to append to the response, or None for unknown tools
+        """
+        tool_name = tool_use["name"]
+        tool_input = tool_use["input"]
+
+        # DEBUG: Log tool calls
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("=== TOOL CALL DEBUG ===")
+            logger.info("Tool: %s", tool_name)
+            logger.info("Input: %s", tool_input)
+            logger.info("=== END TOOL CALL DEBUG ===")
 
         try:
-            # Get user's primary calendar provider
-            settings_repo = UserSettingsRepository(self.db)
-            settings = settings_repo.get_settings(user_id)
-            primary_provider = settings.primary_calendar_provider if settings else "microsoft"
+            if tool_name == "create_calendar_event":
+                # Execute calendar event creation
+                result = await self._execute_create_calendar_event(user_id, tool_input)
+                return f"\n\n{result}"
 
-            # Create distributor
-            distributor = MCPDistributor(primary_provider=primary_provider)
+            elif tool_name == "create_reminder":
+                # Execute reminder creation
+                result = await self._execute_create_reminder(user_id, tool_input)
+                return f"\n\n{result}"
 
-            # Execute via MCP Distributor (test_mode read from context automatically)
-            result = await distributor.route_and_execute(
-                tool_name="create_calendar_event",
-                tool_params=tool_input,
-                user_id=str(user_id),
-                input_source=InputSource.CHAT,
-                original_input=original_input,
-                provider=tool_input.get("provider"),
-            )
+        except Exception as e:
+            return f"\n\n❌ Fout bij uitvoeren actie: {str(e)}"
 
-            # Get test_mode from context to format response
-            test_mode = get_test_mode()
-
-            # Handle test mode responses
-            if test_mode == 1:
-                trace = result.route_trace
-                if trace:
-                    return f"🔧 **TEST MODE: Alleen logging**\n\n" \
-                           f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                           f"🔧 Tool: {trace.tool_name}\n" \
-                           f"📋 Parameters:\n```json\n{json.dumps(trace.tool_params, indent=2, ensure_ascii=False)}\n```\n\n" \
-                           f"⚠️ Geen uitvoering (test_mode=1)"
-                return "🔧 Test mode: geen uitvoering"
-
-            if test_mode == 2 and result.requires_confirmation:
-                trace = result.route_trace
-                if trace:
-                    return f"🔧 **TEST MODE: Bevestiging vereist**\n\n" \
-                           f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                           f"🔧 Tool: {trace.tool_name}\n" \
-                           f"📋 Parameters:\n```json\n{json.dumps(trace.tool_params, indent=2, ensure_ascii=False)}\n```\n\n" \
-                           f"⏳ Wacht op bevestiging via popup..."
-                return "🔧 Wacht op bevestiging..."
+        return None
+
+    async def _execute_create_calendar_event(
+        self,
+        user_id: UUID,
+        tool_input: dict,
+        original_input: str = "",
+        confirmed: bool = False,
+    ) -> str:
+        """
+        Execute calendar event creation via MCP Distributor.
+
+        Args:
+            user_id: User ID
+            tool_input: Tool input from Claude or the fast path
+            original_input: User message that led to the call
+            confirmed: The user confirmed this call; run it without test-mode routing
+        """
+        try:
+            # Get user's primary calendar provider (cached)
+            primary_provider = await get_cached_primary_provider(self.sync_db, user_id)
+
+            # Get shared distributor
+            distributor = get_distributor(primary_provider)
+
+            if confirmed:
+                result = await distributor.confirm_and_execute(
+                    tool_name="create_calendar_event",
+                    tool_params=tool_input,
+                    user_id=str(user_id),
+                    provider=tool_input.get("provider"),
+                )
+            else:
+                # Execute via MCP Distributor (test_mode read from context automatically)
+                result = await distributor.route_and_execute(
+                    tool_name="create_calendar_event",
+                    tool_params=tool_input,
+                    user_id=str(user_id),
+                    input_source=InputSource.CHAT,
+                    original_input=original_input,
+                    provider=tool_input.get("provider"),
+                )
+                self._hold_for_confirmation("create_calendar_event", tool_input, result)
+
+            # Test mode answers with the route trace instead of the result
+            test_mode_response = _test_mode_response(result)
+            if test_mode_response is not None:
+                return test_mode_response
 
             # Normal execution result
             if result.success and result.data:
                 provider_name = "Google Calendar" if tool_input.get("provider") == "google" else "Office 365"
-                return f"✅ Agenda-afspraak aangemaakt!\n\n📅 **{tool_input['title']}**\n🕐 {tool_input['start_time']} - {tool_input['end_time']}\n📍 {tool_input.get('location') or 'Geen locatie'}\n\nDe afspraak is toegevoegd aan je {provider_name}."
+                return _TPL_CALENDAR_OK.format(
+                    title=tool_input["title"],
+                    start=tool_input["start_time"],
+                    end=tool_input["end_time"],
+                    location=tool_input.get("location") or "Geen locatie",
+                    provider_name=provider_name,
+                )
             else:
                 return f"❌ Kon de afspraak niet maken: {result.error}"
 
         except Exception as e:
             return f"❌ Kon de afspraak niet maken: {str(e)}\n\nZorg dat je een kalender hebt gekoppeld in Settings."
 
-    async def _execute_create_reminder(self, user_id: UUID, tool_input: dict, original_input: str = "") -> str:
-        """Execute reminder creation via MCP Distributor."""
-        from app.infrastructure.services.mcp_distributor import MCPDistributor, InputSource
-        from app.infrastructure.repositories.user_settings_repository import UserSettingsRepository
-        from app.core.test_mode_context import get_test_mode
-        import json
+    async def _execute_create_reminder(
+        self,
+        user_id: UUID,
+        tool_input: dict,
+        original_input: str = "",
+        confirmed: bool = False,
+    ) -> str:
+        """
+        Execute reminder creation via MCP Distributor.
 
+        Args:
+            user_id: User ID
+            tool_input: Tool input from Claude or the fast path
+            original_input: User message that led to the call
+            confirmed: The user confirmed this call; run it without test-mode routing
+        """
         try:
-            # Get user's primary calendar provider
-            settings_repo = UserSettingsRepository(self.db)
-            settings = settings_repo.get_settings(user_id)
-            primary_provider = settings.primary_calendar_provider if settings else "microsoft"
+            # Get user's primary calendar provider (cached)
+            primary_provider = await get_cached_primary_provider(self.sync_db, user_id)
 
-            # Create distributor
-            distributor = MCPDistributor(primary_provider=primary_provider)
+            # Get shared distributor
+            distributor = get_distributor(primary_provider)
 
-            # Execute via MCP Distributor (test_mode read from context automatically)
-            result = await distributor.route_and_execute(
-                tool_name="create_reminder",
-                tool_params=tool_input,
-                user_id=str(user_id),
-                input_source=InputSource.CHAT,
-                original_input=original_input,
-                provider=tool_input.get("provider"),
-            )
+            if confirmed:
+                result = await distributor.confirm_and_execute(
+                    tool_name="create_reminder",
+                    tool_params=tool_input,
+                    user_id=str(user_id),
+                    provider=tool_input.get("provider"),
+                )
+            else:
+                # Execute via MCP Distributor (test_mode read from context automatically)
+                result = await distributor.route_and_execute(
+                    tool_name="create_reminder",
+                    tool_params=tool_input,
+                    user_id=str(user_id),
+                    input_source=InputSource.CHAT,
+                    original_input=original_input,
+                    provider=tool_input.get("provider"),
+                )
+                self._hold_for_confirmation("create_reminder", tool_input, result)
 
-            # Get test_mode from context to format response
-            test_mode = get_test_mode()
-
-            # Handle test mode responses
-            if test_mode == 1:
-                trace = result.route_trace
-                if trace:
-                    return f"🔧 **TEST MODE: Alleen logging**\n\n" \
-                           f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                           f"🔧 Tool: {trace.tool_name}\n" \
-                           f"📋 Parameters:\n```json\n{json.dumps(trace.tool_params, indent=2, ensure_ascii=False)}\n```\n\n" \
-                           f"⚠️ Geen uitvoering (test_mode=1)"
-                return "🔧 Test mode: geen uitvoering"
-
-            if test_mode == 2 and result.requires_confirmation:
-                trace = result.route_trace
-                if trace:
-                    return f"🔧 **TEST MODE: Bevestiging vereist**\n\n" \
-                           f"📍 Route: {trace.input_source} → {trace.detected_intent} → {trace.selected_mcp}\n" \
-                           f"🔧 Tool: {trace.tool_name}\n" \
-                           f"📋 Parameters:\n```json\n{json.dumps(trace.tool_params, indent=2, ensure_ascii=False)}\n```\n\n" \
-                           f"⏳ Wacht op bevestiging via popup..."
-                return "🔧 Wacht op bevestiging..."
+            # Test mode answers with the route trace instead of the result
+            test_mode_response = _test_mode_response(result)
+            if test_mode_response is not None:
+                return test_mode_response
 
             # Normal execution result
             if result.success and result.data:
                 provider_name = "Google Calendar" if tool_input.get("provider") == "google" else "Office 365"
-                return f"⏰ Herinnering aangemaakt!\n\n📝 {tool_input['title']}\n🕐 {tool_input['reminder_time']}\n\nDe herinnering is toegevoegd aan je {provider_name}."
+                return _TPL_REMINDER_OK.format(
+                    title=tool_input["title"],
+                    start=tool_input["reminder_time"],
+                    calendar_name=provider_name,
+                )
             else:
                 return f"❌ Kon de herinnering niet maken: {result.error}"
 
         except Exception as e:
             return f"❌ Kon de herinnering niet maken: {str(e)}\n\nZorg dat je een kalender hebt gekoppeld in Settings."
 
-    def get_messages(
+    async def get_messages(
         self,
         conversation_id: UUID,
         user_id: UUID,
         limit: int = 100,
+        cursor: Optional[Cursor] = None,
         offset: int = 0,
-    ) -> List[Message]:
+    ) -> Tuple[List[Message], Optional[Cursor]]:
         """
-        Get messages from a conversation.
+        Get messages from a conversation, oldest first.
 
         Args:
             conversation_id: Conversation ID
             user_id: User ID (for authorization)
             limit: Max messages
-            offset: Offset for pagination
+            cursor: Cursor returned with the previous page (None for the first page)
+            offset: Legacy offset pagination (ignored when cursor is given)
 
         Returns:
-            List of Message entities
+            Tuple of (Message entities, cursor for the next page or None)
         """
-        # Verify access
-        conversation = self.get_conversation(conversation_id, user_id)
-        if not conversation:
-            raise ValueError("Conversation not found or access denied")
-
-        message_models = self.conversation_repo.get_messages(
-            conversation_id=conversation_id,
-            limit=limit,
-            offset=offset,
-        )
+        await _wait_for_conversation_writes(conversation_id)
 
-        return [
-            Message(
-                id=str(msg.id),
-                conversation_id=msg.conversation_id,
-                role=msg.role,
-                content=msg.content,
-                created_at=msg.created_at,
-                metadata=msg.metadata or {},
+        if offset and cursor is None:
+            # Legacy offset pages can be empty, so check access separately
+            if not await self.conversation_repo.get_conversation(conversation_id, user_id):
+                raise ValueError("Conversation not found or access denied")
+            message_models = await self.conversation_repo.get_messages(
+                conversation_id=conversation_id,
+                limit=limit,
+                offset=offset,
             )
-            for msg in message_models
-        ]
+        else:
+            # Access check and fetch in one query
+            message_models = await self.conversation_repo.get_messages_authorized(
+                conversation_id=conversation_id,
+                user_id=user_id,
+                limit=limit,
+                cursor=cursor,
+            )
+            if message_models is None:
+                raise ValueError("Conversation not found or access denied")
+
+        to_entity = self.conversation_repo.message_to_entity
+        messages = [to_entity(msg) for msg in message_models]
+        next_cursor = None
+        if len(message_models) == limit:
+            next_cursor = (message_models[-1].created_at, message_models[-1].id)
+        return messages, next_cursor
 
-    def delete_conversation(
+    async def delete_conversation(
         self,
         conversation_id: UUID,
         user_id: UUID,
@@ -890,12 +1424,11 @@ KRITIEKE REGELS VOOR PROVIDER SELECTIE:
         Raises:
             ValueError: If conversation not found or access denied
         """
-        # Verify access
-        conversation = self.get_conversation(conversation_id, user_id)
-        if not conversation:
+        # Ownership is part of the DELETE itself
+        if not await self.conversation_repo.delete_conversation_authorized(conversation_id, user_id):
             raise ValueError("Conversation not found or access denied")
 
-        return self.conversation_repo.delete_conversation(conversation_id)
+        return True
 
     async def generate_title(
         self,
@@ -918,44 +1451,39 @@ KRITIEKE REGELS VOOR PROVIDER SELECTIE:
         Raises:
             ValueError: If conversation not found or access denied
         """
-        # Get conversation
-        conversation = self.get_conversation(conversation_id, user_id)
-        if not conversation:
+        await _wait_for_conversation_writes(conversation_id)
+
+        # Get the first few messages (max 5) with the access check in one query
+        first_messages = await self.conversation_repo.get_messages_authorized(
+            conversation_id=conversation_id,
+            user_id=user_id,
+            limit=5,
+        )
+        if first_messages is None:
             raise ValueError("Conversation not found or access denied")
 
         # If no messages, return default
-        if not conversation.messages or len(conversation.messages) == 0:
+        if not first_messages:
             return "Nieuwe chat"
 
         # Get first few messages for context (max 5 messages or 500 chars)
-        messages_context = []
-        total_chars = 0
-        for msg in conversation.messages[:5]:
-            if total_chars > 500:
-                break
-            messages_context.append(f"{msg.role}: {msg.content}")
-            total_chars += len(msg.content)
+        context = _title_context(first_messages)
 
-        context = "\n".join(messages_context)
+        # Reuse the title of an identical conversation opening
+        cache_key = _title_cache_key(context)
+        with _title_cache_lock:
+            cached_title = _title_cache.get(cache_key)
+        if cached_title is not None:
+            await self.conversation_repo.update_conversation(conversation_id, title=cached_title)
+            return cached_title
 
         # Ask Claude to generate a short title
-        prompt = f"""Geef een korte, beschrijvende titel (2-5 woorden) voor dit gesprek:
-
-{context}
-
-Regels:
-- Maximaal 5 woorden
-- Beschrijf het hoofdonderwerp
-- In het Nederlands
-- Geen aanhalingstekens of speciale tekens
-- Gewoon de titel, niets anders
-
-Titel:"""
+        prompt = _TPL_TITLE_PROMPT.format(context=context)
 
         try:
             response = await self.claude_service.send_message(
                 messages=[{"role": "user", "content": prompt}],
-                system_prompt="Je bent een expert in het maken van korte, beschrijvende titels. Geef alleen de titel, niets anders.",
+                system_prompt=_TITLE_SYSTEM_PROMPT,
                 max_tokens=50,
                 temperature=0.7,
             )
@@ -970,14 +1498,20 @@ Titel:"""
             if len(title) > 50:
                 title = title[:50].strip()
 
+            with _title_cache_lock:
+                _title_cache[cache_key] = title
+
             # Update conversation title
-            self.conversation_repo.update_conversation(conversation_id, title=title)
+            await self.conversation_repo.update_conversation(conversation_id, title=title)
 
             return title
 
         except Exception as e:
             # Fallback to first message preview if AI generation fails
-            first_user_msg = next((msg for msg in conversation.messages if msg.role == "user"), None)
+            # A chat almost always opens with the user's message
+            first_user_msg = first_messages[0]
+            if first_user_msg.role != "user":
+                first_user_msg = next((msg for msg in first_messages if msg.role == "user"), None)
             if first_user_msg:
                 fallback = first_user_msg.content[:30].strip()
                 if len(first_user_msg.content) > 30:
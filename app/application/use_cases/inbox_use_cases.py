@@ -2,17 +2,352 @@
 InboxItem use cases.
 Part of Application layer - orchestrates inbox processing with AI.
 """
-import json
-from typing import Optional, List, Dict, Any
-from uuid import UUID
+import asyncio
+import logging
+from contextlib import aclosing
 from datetime import datetime
-from sqlalchemy.orm import Session
+from operator import attrgetter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from uuid import UUID
+import httpx
+from pydantic import BaseModel, ConfigDict, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.inbox_item import InboxItem, InboxItemType, InboxStatus, Priority
+from app.infrastructure.database.session import AsyncSessionLocal
 from app.infrastructure.repositories.inbox_repository import InboxRepository
 from app.infrastructure.repositories.task_repository import TaskRepository
 from app.infrastructure.repositories.note_repository import NoteRepository
-from app.infrastructure.services.claude_service import ClaudeService
+from app.infrastructure.services import suggestion_cache
+from app.infrastructure.services.claude_service import ClaudeAPIError, ClaudeService
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# Static system prompt for inbox suggestions. Kept byte-identical across
+# requests so Anthropic's prompt cache can reuse it.
+_SUGGESTION_SYSTEM_PROMPT = """Je bent PAI, een Nederlandse persoonlijke assistent.
+Je helpt met het verwerken van inbox items door suggesties te doen.
+
+Analyseer het inbox item en bepaal de beste actie:
+- create_task: Als het een actiepunt is dat gedaan moet worden
+- create_note: Als het informatie is die bewaard moet worden
+- create_event: Als het een afspraak of gebeurtenis is (niet geïmplementeerd)
+- delegate: Als het gedelegeerd moet worden aan iemand anders
+- archive: Als het geen actie vereist
+
+Geef je antwoord in JSON format met deze velden:
+{
+  "action": "create_task|create_note|archive|delegate",
+  "confidence": 0.0-1.0,
+  "reasoning": "waarom je deze actie voorstelt",
+  "suggested_data": {
+    "title": "...",
+    "content": "...",
+    "priority": "low|medium|high|urgent",
+    "tags": ["tag1", "tag2"],
+    ... (andere relevante velden)
+  },
+  "alternative_actions": [
+    {"action": "...", "reasoning": "..."}
+  ]
+}
+"""
+
+# Extra instructions for several items in one request
+_BULK_SUGGESTION_SYSTEM_PROMPT = _SUGGESTION_SYSTEM_PROMPT + """
+Je krijgt meerdere genummerde inbox items ([1], [2], ...). Geef voor elk item
+een suggestie in het formaat hierboven, in dezelfde volgorde, samen in één JSON object:
+{"suggestions": [{...}, {...}]}
+"""
+
+# Inbox items per Claude call in request_ai_suggestions_bulk
+MAX_BULK_SUGGESTION_ITEMS = 10
+
+
+def _default_suggestion() -> dict:
+    """Get the suggestion used when Claude's reply cannot be parsed."""
+    return {
+        "action": "archive",
+        "confidence": 0.5,
+        "reasoning": "Kon geen duidelijke actie bepalen",
+        "suggested_data": {},
+        "alternative_actions": [],
+    }
+
+
+class _Suggestion(BaseModel):
+    """
+    Suggestion fields Claude is asked for. Validated and coerced while the
+    JSON is parsed (in pydantic-core); missing fields get defaults and
+    extra fields are kept.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    action: str = "archive"
+    confidence: float = 0.5
+    reasoning: str = ""
+    suggested_data: Dict[str, Any] = {}
+    alternative_actions: List[Any] = []
+
+
+class _BulkSuggestions(BaseModel):
+    """Reply to the bulk suggestion prompt; entries are validated one by one."""
+    suggestions: List[Any] = []
+
+
+def _parse_suggestion(payload: Optional[str]) -> Optional[dict]:
+    """
+    Parse and validate a suggestion reply.
+
+    Args:
+        payload: JSON object text from Claude's reply
+
+    Returns:
+        Suggestion dict, or None if the reply is missing or invalid
+    """
+    if payload is None:
+        return None
+    try:
+        return _Suggestion.model_validate_json(payload).model_dump()
+    except ValidationError:
+        return None
+
+
+def _parse_bulk_suggestions(payload: Optional[str], count: int) -> List[Optional[dict]]:
+    """
+    Parse and validate a bulk suggestion reply.
+
+    Args:
+        payload: JSON object text from Claude's reply
+        count: Number of items in the prompt
+
+    Returns:
+        One suggestion dict per item, in prompt order; None where the reply
+        has no valid suggestion for the item
+    """
+    entries: List[Any] = []
+    if payload is not None:
+        try:
+            entries = _BulkSuggestions.model_validate_json(payload).suggestions[:count]
+        except ValidationError:
+            pass
+
+    suggestions: List[Optional[dict]] = []
+    for entry in entries:
+        try:
+            suggestions.append(_Suggestion.model_validate(entry).model_dump())
+        except ValidationError:
+            suggestions.append(None)
+    return suggestions + [None] * (count - len(suggestions))
+
+
+class _JsonObjectScanner:
+    """
+    Finds the first complete top-level JSON object in streamed text.
+    Text before the opening brace (prose, a markdown fence) is skipped;
+    braces inside strings are ignored.
+    """
+
+    __slots__ = ("_parts", "_depth", "_in_string", "_escaped")
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> Optional[str]:
+        """
+        Consume the next chunk of text.
+
+        Args:
+            text: Next text delta
+
+        Returns:
+            The complete JSON object text once its closing brace arrives,
+            otherwise None
+        """
+        if self._depth == 0:
+            start = text.find("{")
+            if start < 0:
+                return None
+            text = text[start:]
+
+        for index, char in enumerate(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[:index + 1])
+                    return "".join(self._parts)
+
+        self._parts.append(text)
+        return None
+
+
+# Item description sent to Claude for a suggestion
+_ITEM_TEMPLATE = "Type: {type}\nBron: {source}\nOnderwerp: {subject}\n\nInhoud:\n{content}\n"
+
+# Longer item content is cut off before it is sent to Claude (tokens scale with length)
+MAX_SUGGESTION_CONTENT_CHARS = 8000
+
+
+def _format_item(item_model) -> str:
+    """
+    Format an inbox item for the suggestion prompt.
+
+    Args:
+        item_model: InboxItemModel
+
+    Returns:
+        Item description, with the content truncated to MAX_SUGGESTION_CONTENT_CHARS
+    """
+    content = item_model.content or "Geen inhoud"
+    if len(content) > MAX_SUGGESTION_CONTENT_CHARS:
+        content = content[:MAX_SUGGESTION_CONTENT_CHARS] + "\n[... ingekort]"
+    return _ITEM_TEMPLATE.format_map({
+        "type": item_model.type,
+        "source": item_model.source,
+        "subject": item_model.subject or "Geen onderwerp",
+        "content": content,
+    })
+
+
+# Inbox item response fields, read from a model in one C-level call
+_INBOX_FIELD_NAMES = (
+    "id", "user_id", "type", "source", "status", "priority", "subject", "content",
+    "raw_data", "ai_suggestion", "user_decision", "linked_items",
+    "processed_at", "created_at", "updated_at",
+)
+_get_inbox_fields = attrgetter(*_INBOX_FIELD_NAMES)
+
+
+def _row_to_dict(row, linked_map: Optional[Dict[tuple, dict]] = None) -> dict:
+    """
+    Convert an inbox_items row to a dict for API response.
+
+    Args:
+        row: Row from the inbox list query
+        linked_map: Current details of linked items by (type, id), merged
+            into the matching linked_items entries
+
+    Returns:
+        Inbox item dict
+    """
+    values = row._mapping
+    linked_items = values["linked_items"] or []
+    if linked_map:
+        linked_items = [
+            {**linked, **linked_map.get((linked.get("type"), linked.get("id")), {})}
+            for linked in linked_items
+        ]
+    return {
+        "id": str(values["id"]),
+        "user_id": str(values["user_id"]),
+        "type": values["type"],
+        "source": values["source"],
+        "status": values["status"],
+        "priority": values["priority"],
+        "subject": values["subject"],
+        "content": values["content"],
+        "raw_data": values["raw_data"] or {},
+        "ai_suggestion": values["ai_suggestion"],
+        "user_decision": values["user_decision"],
+        "linked_items": linked_items,
+        "processed_at": values["processed_at"],
+        "created_at": values["created_at"],
+        "updated_at": values["updated_at"],
+    }
+
+
+# AI suggestions are saved by one background worker per process, so the
+# suggest endpoint does not wait for the UPDATE. Queue and worker are created
+# lazily on the running event loop.
+_suggestion_writes: Optional[asyncio.Queue] = None
+_suggestion_writer: Optional[asyncio.Task] = None
+# Latest queued write per inbox item; later calls for the item wait for it
+_pending_suggestions: Dict[UUID, asyncio.Future] = {}
+# Above this many queued writes, suggestions are saved inline instead
+MAX_QUEUED_SUGGESTION_WRITES = 100
+
+
+async def _write_suggestions(queue: asyncio.Queue) -> None:
+    """Save queued AI suggestions one by one, each with its own session."""
+    while True:
+        item_id, user_id, suggestion, done = await queue.get()
+        try:
+            async with AsyncSessionLocal() as db:
+                await InboxRepository(db).update_inbox_item(
+                    item_id=item_id,
+                    user_id=user_id,
+                    ai_suggestion=suggestion,
+                    status=InboxStatus.PENDING_REVIEW,
+                )
+        except Exception as e:
+            # Keep the worker alive for the next write
+            logger.error(f"Failed to save AI suggestion for inbox item {item_id}: {e}")
+        finally:
+            done.set_result(None)
+            if _pending_suggestions.get(item_id) is done:
+                del _pending_suggestions[item_id]
+            queue.task_done()
+
+
+def _queue_suggestion_write(item_id: UUID, user_id: UUID, suggestion: dict) -> bool:
+    """
+    Queue an AI suggestion to be saved in the background.
+
+    Args:
+        item_id: Inbox item ID
+        user_id: User ID
+        suggestion: Suggestion to store
+
+    Returns:
+        True if queued, False if the queue is full and the caller must save it
+    """
+    global _suggestion_writes, _suggestion_writer
+    if _suggestion_writes is None:
+        _suggestion_writes = asyncio.Queue()
+        _suggestion_writer = asyncio.create_task(_write_suggestions(_suggestion_writes))
+    if _suggestion_writes.qsize() >= MAX_QUEUED_SUGGESTION_WRITES:
+        return False
+
+    done = asyncio.get_running_loop().create_future()
+    _pending_suggestions[item_id] = done
+    _suggestion_writes.put_nowait((item_id, user_id, suggestion, done))
+    return True
+
+
+async def _wait_for_suggestion_write(item_id: UUID) -> None:
+    """Wait for this process's queued suggestion write for an item to finish."""
+    pending = _pending_suggestions.get(item_id)
+    if pending is not None:
+        await asyncio.wait([pending])
+
+
+async def flush_suggestion_writes() -> None:
+    """Save queued AI suggestions and stop the worker (application shutdown)."""
+    global _suggestion_writes, _suggestion_writer
+    if _suggestion_writes is None:
+        return
+
+    await _suggestion_writes.join()
+    _suggestion_writer.cancel()
+    _suggestion_writes = None
+    _suggestion_writer = None
 
 
 class InboxUseCases:
@@ -21,14 +356,36 @@ class InboxUseCases:
     Handles inbox item lifecycle from creation to processing.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.inbox_repo = InboxRepository(db)
-        self.task_repo = TaskRepository(db)
-        self.note_repo = NoteRepository(db)
-        self.claude_service = ClaudeService()
+        # The task and note repositories are sync; they share the async
+        # session's connection and transaction through _sync()
+        self.task_repo = TaskRepository(db.sync_session)
+        self.note_repo = NoteRepository(db.sync_session)
+        self.claude_service = ClaudeService.instance()
+        # Accepted actions that create a linked item; other actions only
+        # update the inbox item
+        self._action_handlers: Dict[str, Callable[..., Awaitable[Optional[dict]]]] = {
+            "create_task": self._create_task,
+            "create_note": self._create_note,
+        }
+
+    async def _sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a sync task or note repository call on this use case's session.
 
-    def create_inbox_item(
+        Args:
+            fn: Bound method of self.task_repo or self.note_repo
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The call's return value
+        """
+        return await self.db.run_sync(lambda _: fn(*args, **kwargs))
+
+    async def create_inbox_item(
         self,
         user_id: UUID,
         type: InboxItemType,
@@ -65,7 +422,7 @@ class InboxUseCases:
         )
 
         # Create in database
-        item_model = self.inbox_repo.create_inbox_item(
+        item_model = await self.inbox_repo.create_inbox_item(
             user_id=user_id,
             type=item_entity.type,
             source=item_entity.source,
@@ -78,14 +435,16 @@ class InboxUseCases:
 
         return self._model_to_dict(item_model)
 
-    def get_inbox_item(self, item_id: UUID, user_id: UUID) -> Optional[dict]:
+    async def get_inbox_item(self, item_id: UUID, user_id: UUID) -> Optional[dict]:
         """Get a single inbox item."""
-        item_model = self.inbox_repo.get_inbox_item(item_id, user_id)
+        # A suggestion saved in the background must land first
+        await _wait_for_suggestion_write(item_id)
+        item_model = await self.inbox_repo.get_inbox_item(item_id, user_id)
         if not item_model:
             return None
         return self._model_to_dict(item_model)
 
-    def get_inbox_items(
+    async def get_inbox_items(
         self,
         user_id: UUID,
         status: Optional[str] = None,
@@ -95,7 +454,7 @@ class InboxUseCases:
         limit: int = 100,
     ) -> Dict[str, Any]:
         """Get inbox items with filters."""
-        items, total = self.inbox_repo.get_user_inbox_items(
+        rows, total, unprocessed_count = await self.inbox_repo.get_user_inbox_items_with_counts(
             user_id=user_id,
             status=status,
             type=type,
@@ -104,16 +463,50 @@ class InboxUseCases:
             limit=limit,
         )
 
+        linked_map = await self._hydrate_linked_items(rows, user_id)
+
         return {
-            "items": [self._model_to_dict(item) for item in items],
+            "items": [_row_to_dict(row, linked_map) for row in rows],
             "total": total,
+            "unprocessed_count": unprocessed_count,
             "skip": skip,
             "limit": limit,
         }
 
-    def get_unprocessed_count(self, user_id: UUID) -> int:
+    async def _hydrate_linked_items(self, rows, user_id: UUID) -> Dict[tuple, dict]:
+        """
+        Look up the current title (and task status) of the tasks and notes
+        linked from a page of inbox items, with one query per item type.
+
+        Args:
+            rows: Rows from the inbox list query
+            user_id: User ID
+
+        Returns:
+            Details by (type, id) for each linked item that still exists
+        """
+        ids_by_type: Dict[str, set] = {"task": set(), "note": set()}
+        for row in rows:
+            for linked in row._mapping["linked_items"] or []:
+                ids = ids_by_type.get(linked.get("type"))
+                if ids is not None and linked.get("id"):
+                    try:
+                        ids.add(UUID(linked["id"]))
+                    except ValueError:
+                        continue
+
+        linked_map: Dict[tuple, dict] = {}
+        tasks = await self._sync(self.task_repo.get_tasks_by_ids, list(ids_by_type["task"]), user_id)
+        for task in tasks:
+            linked_map[("task", str(task.id))] = {"title": task.title, "status": task.status}
+        notes = await self._sync(self.note_repo.get_notes_by_ids, list(ids_by_type["note"]), user_id)
+        for note in notes:
+            linked_map[("note", str(note.id))] = {"title": note.title}
+        return linked_map
+
+    async def get_unprocessed_count(self, user_id: UUID) -> int:
         """Get count of unprocessed items."""
-        return self.inbox_repo.get_unprocessed_count(user_id)
+        return await self.inbox_repo.get_unprocessed_count(user_id)
 
     async def request_ai_suggestion(
         self, item_id: UUID, user_id: UUID
@@ -128,101 +521,145 @@ class InboxUseCases:
         Returns:
             Updated inbox item with AI suggestion
         """
-        item_model = self.inbox_repo.get_inbox_item(item_id, user_id)
+        item_model = await self.inbox_repo.get_inbox_item(item_id, user_id)
         if not item_model:
             return None
 
-        # Build prompt for Claude
-        system_prompt = """Je bent PAI, een Nederlandse persoonlijke assistent.
-Je helpt met het verwerken van inbox items door suggesties te doen.
+        item_content = _format_item(item_model)
 
-Analyseer het inbox item en bepaal de beste actie:
-- create_task: Als het een actiepunt is dat gedaan moet worden
-- create_note: Als het informatie is die bewaard moet worden
-- create_event: Als het een afspraak of gebeurtenis is (niet geïmplementeerd)
-- delegate: Als het gedelegeerd moet worden aan iemand anders
-- archive: Als het geen actie vereist
+        cache_key = suggestion_cache.content_hash(item_content)
 
-Geef je antwoord in JSON format met deze velden:
-{
-  "action": "create_task|create_note|archive|delegate",
-  "confidence": 0.0-1.0,
-  "reasoning": "waarom je deze actie voorstelt",
-  "suggested_data": {
-    "title": "...",
-    "content": "...",
-    "priority": "low|medium|high|urgent",
-    "tags": ["tag1", "tag2"],
-    ... (andere relevante velden)
-  },
-  "alternative_actions": [
-    {"action": "...", "reasoning": "..."}
-  ]
-}
-"""
+        try:
+            # Identical content gets the cached suggestion without a Claude call
+            suggestion = suggestion_cache.get(cache_key)
+            if suggestion is None:
+                suggestion = _parse_suggestion(await self._ask_suggestion(item_content))
+                if suggestion is not None:
+                    suggestion_cache.put(cache_key, suggestion)
+                else:
+                    # If JSON parsing fails, create a default suggestion
+                    suggestion = _default_suggestion()
+        except (httpx.HTTPError, ClaudeAPIError) as e:
+            # Return the item without suggestion; the user can retry
+            logger.warning(f"AI suggestion failed for inbox item {item_id}: {e}")
+            return self._model_to_dict(item_model)
 
-        # Prepare item content for analysis
-        item_content = f"""Type: {item_model.type}
-Bron: {item_model.source}
-Onderwerp: {item_model.subject or 'Geen onderwerp'}
+        # Save the suggestion in the background and answer with the item as
+        # it will be stored
+        if _queue_suggestion_write(item_id, user_id, suggestion):
+            item = self._model_to_dict(item_model)
+            item["ai_suggestion"] = suggestion
+            item["status"] = InboxStatus.PENDING_REVIEW.value
+            item["updated_at"] = datetime.utcnow()
+            return item
 
-Inhoud:
-{item_model.content or 'Geen inhoud'}
-"""
+        updated_item = await self.inbox_repo.update_inbox_item(
+            item_id=item_id,
+            user_id=user_id,
+            ai_suggestion=suggestion,
+            status=InboxStatus.PENDING_REVIEW,
+        )
 
-        messages = [{"role": "user", "content": item_content}]
+        if not updated_item:
+            return None
 
-        try:
-            # Get AI suggestion
-            response = await self.claude_service.send_message(
-                messages=messages,
-                system_prompt=system_prompt,
-                temperature=0.3,  # Lower temperature for more deterministic output
-            )
+        return self._model_to_dict(updated_item)
 
-            # Extract suggestion from response
-            content_text = response["content"][0]["text"]
+    async def request_ai_suggestions_bulk(
+        self, item_ids: List[UUID], user_id: UUID
+    ) -> List[dict]:
+        """
+        Request AI suggestions for several inbox items.
+        Items are sent to Claude in numbered batches of up to
+        MAX_BULK_SUGGESTION_ITEMS per call, items with cached suggestions
+        are not sent at all, and all suggestions are stored in one UPDATE.
+
+        Args:
+            item_ids: Inbox item IDs
+            user_id: User ID
 
-            # Try to parse JSON from response
+        Returns:
+            Inbox items (updated where a suggestion was made); unknown IDs
+            are skipped
+        """
+        items = await self.inbox_repo.get_many(item_ids, user_id)
+
+        suggestions: Dict[UUID, dict] = {}
+        pending = []
+        for item in items:
+            item_content = _format_item(item)
+            cache_key = suggestion_cache.content_hash(item_content)
+            suggestion = suggestion_cache.get(cache_key)
+            if suggestion is not None:
+                suggestions[item.id] = suggestion
+            else:
+                pending.append((item, item_content, cache_key))
+
+        for start in range(0, len(pending), MAX_BULK_SUGGESTION_ITEMS):
+            batch = pending[start:start + MAX_BULK_SUGGESTION_ITEMS]
+            prompt = "\n".join(
+                f"[{number}]\n{item_content}"
+                for number, (_, item_content, _) in enumerate(batch, 1)
+            )
             try:
-                # Sometimes Claude wraps JSON in markdown code blocks
-                if "```json" in content_text:
-                    json_start = content_text.find("```json") + 7
-                    json_end = content_text.find("```", json_start)
-                    content_text = content_text[json_start:json_end].strip()
-                elif "```" in content_text:
-                    json_start = content_text.find("```") + 3
-                    json_end = content_text.find("```", json_start)
-                    content_text = content_text[json_start:json_end].strip()
-
-                suggestion = json.loads(content_text)
-            except json.JSONDecodeError:
-                # If JSON parsing fails, create a default suggestion
-                suggestion = {
-                    "action": "archive",
-                    "confidence": 0.5,
-                    "reasoning": "Kon geen duidelijke actie bepalen",
-                    "suggested_data": {},
-                    "alternative_actions": [],
-                }
-
-            # Update item with AI suggestion
-            updated_item = self.inbox_repo.update_inbox_item(
-                item_id=item_id,
-                user_id=user_id,
-                ai_suggestion=suggestion,
-                status=InboxStatus.PENDING_REVIEW,
+                payload = await self._ask_suggestion(prompt, _BULK_SUGGESTION_SYSTEM_PROMPT)
+            except (httpx.HTTPError, ClaudeAPIError) as e:
+                # Leave this batch without suggestion; the user can retry
+                logger.warning(f"Bulk AI suggestion failed for {len(batch)} inbox items: {e}")
+                continue
+
+            replies = _parse_bulk_suggestions(payload, len(batch))
+            for (item, _, cache_key), suggestion in zip(batch, replies):
+                if suggestion is not None:
+                    suggestion_cache.put(cache_key, suggestion)
+                else:
+                    suggestion = _default_suggestion()
+                suggestions[item.id] = suggestion
+
+        updated = {
+            item.id: item
+            for item in await self.inbox_repo.bulk_update_ai_suggestions(
+                list(suggestions.items()), user_id
             )
+        }
+        return [self._model_to_dict(updated.get(item.id, item)) for item in items]
 
-            if not updated_item:
-                return None
+    async def _ask_suggestion(
+        self, item_content: str, system_prompt: str = _SUGGESTION_SYSTEM_PROMPT
+    ) -> Optional[str]:
+        """
+        Ask Claude for a processing suggestion.
 
-            return self._model_to_dict(updated_item)
+        Args:
+            item_content: Formatted inbox item(s)
+            system_prompt: Single-item or bulk suggestion prompt
 
-        except Exception as e:
-            # Log error and return item without suggestion
-            print(f"Error getting AI suggestion: {e}")
-            return self._model_to_dict(item_model)
+        Returns:
+            Text of the first JSON object in the reply, or None if there is none
+
+        Raises:
+            ClaudeAPIError: If the Claude API answers with an error
+            httpx.HTTPError: If the request fails
+        """
+        messages = [{"role": "user", "content": item_content}]
+        scanner = _JsonObjectScanner()
+        payload = None
+
+        # Stream the reply and stop reading as soon as the JSON object is
+        # complete; any explanation Claude adds after it is never generated
+        async with aclosing(self.claude_service.send_message_stream(
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=0.3,  # Lower temperature for more deterministic output
+            cache_prompt=True,
+        )) as events:
+            async for event in events:
+                if event["type"] == "text":
+                    payload = scanner.feed(event["text"])
+                    if payload is not None:
+                        break
+
+        return payload
 
     async def accept_suggestion(
         self, item_id: UUID, user_id: UUID
@@ -237,58 +674,24 @@ Inhoud:
         Returns:
             Result with created item info
         """
-        item_model = self.inbox_repo.get_inbox_item(item_id, user_id)
+        await _wait_for_suggestion_write(item_id)
+        item_model = await self.inbox_repo.get_inbox_item(item_id, user_id)
         if not item_model or not item_model.ai_suggestion:
             return None
 
         suggestion = item_model.ai_suggestion
-        action = suggestion.get("action")
-        suggested_data = suggestion.get("suggested_data", {})
-
-        created_item = None
-
-        # Execute action based on suggestion
-        if action == "create_task":
-            # Create task from suggestion
-            task_model = self.task_repo.create_task(
-                user_id=user_id,
-                title=suggested_data.get("title", item_model.subject or "Nieuwe taak"),
-                memo=suggested_data.get("content", item_model.content),
-                priority=suggested_data.get("priority", "medium"),
-                tags=suggested_data.get("tags", []),
-                due_date=suggested_data.get("due_date"),
-            )
-            created_item = {
-                "type": "task",
-                "id": str(task_model.id),
-                "task_number": task_model.task_number,
-            }
-
-        elif action == "create_note":
-            # Create note from suggestion
-            note_model = self.note_repo.create_note(
-                user_id=user_id,
-                title=suggested_data.get("title", item_model.subject),
-                content=suggested_data.get("content", item_model.content),
-                categories=suggested_data.get("tags", []),
-                color=suggested_data.get("color", "yellow"),
-            )
-            created_item = {
-                "type": "note",
-                "id": str(note_model.id),
-            }
-
-        elif action == "archive":
-            # Just mark as archived
-            pass
+        created_item = await self._execute_action(
+            item_model, user_id, suggestion.get("action"), suggestion.get("suggested_data") or {}
+        )
 
-        # Update inbox item status
-        updated_item = self.inbox_repo.update_inbox_item(
+        # Update inbox item status; this commits the created task or note in
+        # the same transaction
+        updated_item = await self.inbox_repo.update_inbox_item(
             item_id=item_id,
             user_id=user_id,
             status=InboxStatus.ACCEPTED,
-            processed_at=datetime.utcnow(),
-            user_decision={"action": "accepted", "timestamp": datetime.utcnow().isoformat()},
+            processed=True,
+            user_decision={"action": "accepted"},
             linked_items=[created_item] if created_item else [],
         )
 
@@ -297,7 +700,7 @@ Inhoud:
             "created_item": created_item,
         }
 
-    def modify_and_accept(
+    async def modify_and_accept(
         self,
         item_id: UUID,
         user_id: UUID,
@@ -314,55 +717,23 @@ Inhoud:
         Returns:
             Result with created item info
         """
-        item_model = self.inbox_repo.get_inbox_item(item_id, user_id)
+        await _wait_for_suggestion_write(item_id)
+        item_model = await self.inbox_repo.get_inbox_item(item_id, user_id)
         if not item_model:
             return None
 
-        action = modifications.get("action")
-        data = modifications.get("data", {})
-
-        created_item = None
-
-        # Execute action based on modifications
-        if action == "create_task":
-            task_model = self.task_repo.create_task(
-                user_id=user_id,
-                title=data.get("title", item_model.subject or "Nieuwe taak"),
-                memo=data.get("content", item_model.content),
-                priority=data.get("priority", "medium"),
-                tags=data.get("tags", []),
-                due_date=data.get("due_date"),
-            )
-            created_item = {
-                "type": "task",
-                "id": str(task_model.id),
-                "task_number": task_model.task_number,
-            }
-
-        elif action == "create_note":
-            note_model = self.note_repo.create_note(
-                user_id=user_id,
-                title=data.get("title", item_model.subject),
-                content=data.get("content", item_model.content),
-                categories=data.get("tags", []),
-                color=data.get("color", "yellow"),
-            )
-            created_item = {
-                "type": "note",
-                "id": str(note_model.id),
-            }
+        created_item = await self._execute_action(
+            item_model, user_id, modifications.get("action"), modifications.get("data") or {}
+        )
 
-        # Update inbox item
-        updated_item = self.inbox_repo.update_inbox_item(
+        # Update inbox item; this commits the created task or note in the
+        # same transaction
+        updated_item = await self.inbox_repo.update_inbox_item(
             item_id=item_id,
             user_id=user_id,
             status=InboxStatus.MODIFIED,
-            processed_at=datetime.utcnow(),
-            user_decision={
-                "action": "modified",
-                "modifications": modifications,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
+            processed=True,
+            user_decision={"action": "modified", "modifications": modifications},
             linked_items=[created_item] if created_item else [],
         )
 
@@ -371,20 +742,72 @@ Inhoud:
             "created_item": created_item,
         }
 
-    def reject_item(
+    async def _execute_action(
+        self, item_model, user_id: UUID, action: Optional[str], data: Dict[str, Any]
+    ) -> Optional[dict]:
+        """
+        Execute an accepted action without committing.
+
+        Args:
+            item_model: InboxItemModel the action is for
+            user_id: User ID
+            action: Suggested or modified action
+            data: Data for the created item (title, content, tags, ...)
+
+        Returns:
+            Linked item info for the created task or note, or None when the
+            action creates nothing (e.g. archive)
+        """
+        handler = self._action_handlers.get(action)
+        if handler is None:
+            return None
+        return await handler(item_model, data, user_id)
+
+    async def _create_task(self, item_model, data: Dict[str, Any], user_id: UUID) -> dict:
+        """Create a task from an inbox item; committed with the inbox update."""
+        task_model = await self._sync(
+            self.task_repo.create_task,
+            user_id=user_id,
+            title=data.get("title", item_model.subject or "Nieuwe taak"),
+            memo=data.get("content", item_model.content),
+            priority=data.get("priority", "medium"),
+            tags=data.get("tags", []),
+            due_date=data.get("due_date"),
+            commit=False,
+        )
+        return {
+            "type": "task",
+            "id": str(task_model.id),
+            "task_number": task_model.task_number,
+        }
+
+    async def _create_note(self, item_model, data: Dict[str, Any], user_id: UUID) -> dict:
+        """Create a note from an inbox item; committed with the inbox update."""
+        note_model = await self._sync(
+            self.note_repo.create_note,
+            user_id=user_id,
+            title=data.get("title", item_model.subject),
+            content=data.get("content", item_model.content),
+            categories=data.get("tags", []),
+            color=data.get("color", "yellow"),
+            commit=False,
+        )
+        return {
+            "type": "note",
+            "id": str(note_model.id),
+        }
+
+    async def reject_item(
         self, item_id: UUID, user_id: UUID, reason: Optional[str] = None
     ) -> Optional[dict]:
         """Reject an inbox item."""
-        updated_item = self.inbox_repo.update_inbox_item(
+        await _wait_for_suggestion_write(item_id)
+        updated_item = await self.inbox_repo.update_inbox_item(
             item_id=item_id,
             user_id=user_id,
             status=InboxStatus.REJECTED,
-            processed_at=datetime.utcnow(),
-            user_decision={
-                "action": "rejected",
-                "reason": reason,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
+            processed=True,
+            user_decision={"action": "rejected", "reason": reason},
         )
 
         if not updated_item:
@@ -392,13 +815,14 @@ Inhoud:
 
         return self._model_to_dict(updated_item)
 
-    def archive_item(self, item_id: UUID, user_id: UUID) -> Optional[dict]:
+    async def archive_item(self, item_id: UUID, user_id: UUID) -> Optional[dict]:
         """Archive an inbox item without processing."""
-        updated_item = self.inbox_repo.update_inbox_item(
+        await _wait_for_suggestion_write(item_id)
+        updated_item = await self.inbox_repo.update_inbox_item(
             item_id=item_id,
             user_id=user_id,
             status=InboxStatus.ARCHIVED,
-            processed_at=datetime.utcnow(),
+            processed=True,
         )
 
         if not updated_item:
@@ -406,26 +830,15 @@ Inhoud:
 
         return self._model_to_dict(updated_item)
 
-    def delete_item(self, item_id: UUID, user_id: UUID) -> bool:
+    async def delete_item(self, item_id: UUID, user_id: UUID) -> bool:
         """Delete an inbox item."""
-        return self.inbox_repo.delete_inbox_item(item_id, user_id)
+        return await self.inbox_repo.delete_inbox_item(item_id, user_id)
 
     def _model_to_dict(self, model) -> dict:
         """Convert database model to dict for API response."""
-        return {
-            "id": str(model.id),
-            "user_id": str(model.user_id),
-            "type": model.type,
-            "source": model.source,
-            "status": model.status,
-            "priority": model.priority,
-            "subject": model.subject,
-            "content": model.content,
-            "raw_data": model.raw_data or {},
-            "ai_suggestion": model.ai_suggestion,
-            "user_decision": model.user_decision,
-            "linked_items": model.linked_items or [],
-            "processed_at": model.processed_at.isoformat() if model.processed_at else None,
-            "created_at": model.created_at.isoformat(),
-            "updated_at": model.updated_at.isoformat(),
-        }
+        item = dict(zip(_INBOX_FIELD_NAMES, _get_inbox_fields(model)))
+        item["id"] = str(item["id"])
+        item["user_id"] = str(item["user_id"])
+        item["raw_data"] = item["raw_data"] or {}
+        item["linked_items"] = item["linked_items"] or []
+        return item
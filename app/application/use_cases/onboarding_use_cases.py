@@ -1,30 +1,61 @@
 """
 Onboarding use cases.
 Part of Application layer - orchestrates onboarding flow.
+
+The use cases do not commit: writes are flushed (or sent as UPDATE
+statements) and the request's session from get_db commits them once,
+after the route has returned.
 """
+import base64
+import hmac
 import os
 import secrets
-import string
 import re
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
 from uuid import UUID
+from sqlalchemy import exists, select, update
 from sqlalchemy.orm import Session
 
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.infrastructure.database.models import UserModel
 from app.infrastructure.services.email_service import get_email_service
 
+# Characters not allowed in an inbox prefix (input is lowercased first)
+_PREFIX_INVALID_RE = re.compile(r'[^a-z0-9-]')
+_HYPHEN_RUN_RE = re.compile(r'-+')
+# Characters dropped when normalizing a phone number
+_PHONE_INVALID_RE = re.compile(r'[^0-9+]')
+
 
 def generate_verification_code() -> str:
     """Generate a 6-digit verification code."""
-    return ''.join(secrets.choice(string.digits) for _ in range(6))
+    return f"{secrets.randbelow(1_000_000):06d}"
 
 
 def generate_inbox_token() -> str:
-    """Generate a 6-character alphanumeric token for inbox address."""
-    alphabet = string.ascii_lowercase + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(6))
+    """Generate a 6-character alphanumeric token for inbox address (base32: a-z, 2-7)."""
+    return base64.b32encode(secrets.token_bytes(4))[:6].decode().lower()
+
+
+def _send_now(send: Callable[..., Any], **kwargs: Any) -> None:
+    """Send an email inline (when the caller cannot schedule it for later)."""
+    send(**kwargs)
+
+
+def codes_match(expected: str, code: str) -> bool:
+    """
+    Compare a stored verification code with user input in constant time.
+
+    Args:
+        expected: Stored verification code
+        code: Code entered by the user
+
+    Returns:
+        True if the codes are equal
+    """
+    # Compared as bytes: compare_digest rejects non-ASCII str input
+    return hmac.compare_digest(expected.encode(), code.encode())
 
 
 def sanitize_email_prefix(email: str) -> str:
@@ -40,9 +71,9 @@ def sanitize_email_prefix(email: str) -> str:
     # Replace dots with hyphens
     local_part = local_part.replace('.', '-')
     # Remove any character that's not alphanumeric or hyphen
-    local_part = re.sub(r'[^a-z0-9-]', '', local_part)
+    local_part = _PREFIX_INVALID_RE.sub('', local_part)
     # Remove consecutive hyphens
-    local_part = re.sub(r'-+', '-', local_part)
+    local_part = _HYPHEN_RUN_RE.sub('-', local_part)
     # Remove leading/trailing hyphens
     local_part = local_part.strip('-')
     return local_part
@@ -58,47 +89,50 @@ class StartEmailVerificationUseCase:
         self.user_repository = user_repository
         self.db = db
 
-    def execute(self, user_id: UUID) -> dict:
+    def execute(self, user_id: UUID, send_later: Optional[Callable[..., Any]] = None) -> dict:
         """
         Start email verification process.
 
         Args:
             user_id: User's UUID
+            send_later: Schedules a call to run after the response is sent
+                (e.g. BackgroundTasks.add_task); the email is sent inline if None
 
         Returns:
             Dict with success status and message
         """
-        # Query UserModel directly to get a mutable ORM object
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
-        if not db_user:
-            raise ValueError("User not found")
-
-        if db_user.email_verified:
-            return {"success": True, "message": "Email already verified"}
-
         # Generate verification code
         code = generate_verification_code()
         expires = datetime.utcnow() + timedelta(minutes=15)
 
-        # Update user with verification code
-        db_user.email_verification_code = code
-        db_user.email_verification_expires = expires
-        self.db.commit()
+        # Store the code in one UPDATE ... RETURNING, unless already verified
+        email = self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id, UserModel.email_verified.is_(False))
+            .values(email_verification_code=code, email_verification_expires=expires)
+            .returning(UserModel.email)
+        ).scalar()
+
+        if email is None:
+            if not self.db.execute(select(UserModel.id).where(UserModel.id == user_id)).first():
+                raise ValueError("User not found")
+            return {"success": True, "message": "Email already verified"}
 
         # Send email via SendGrid
         email_service = get_email_service()
-        email_result = email_service.send_email_verification_code(
-            to_email=db_user.email,
+        (send_later or _send_now)(
+            email_service.send_email_verification_code,
+            to_email=email,
             code=code
         )
 
         result = {
             "success": True,
-            "message": f"Verification code sent to {db_user.email}",
+            "message": f"Verification code sent to {email}",
         }
 
         # Include code in dev mode for testing (when email is faked)
-        if email_result.get("fake"):
+        if email_service.fake:
             result["_dev_code"] = code
 
         return result
@@ -124,8 +158,35 @@ class VerifyEmailUseCase:
         Returns:
             Dict with success status
         """
-        # Query UserModel directly to get a mutable ORM object
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        # Verify in one UPDATE ... RETURNING; the database checks that the
+        # code matches and has not expired
+        verified = self.db.execute(
+            update(UserModel)
+            .where(
+                UserModel.id == user_id,
+                UserModel.email_verified.is_(False),
+                UserModel.email_verification_code == code,
+                UserModel.email_verification_expires >= datetime.utcnow(),
+            )
+            .values(
+                email_verified=True,
+                email_verification_code=None,
+                email_verification_expires=None,
+            )
+            .returning(UserModel.id)
+        ).first()
+
+        if verified:
+            return {"success": True, "message": "Email verified successfully"}
+
+        # Nothing updated: find out why
+        db_user = self.db.execute(
+            select(
+                UserModel.email_verified,
+                UserModel.email_verification_code,
+                UserModel.email_verification_expires,
+            ).where(UserModel.id == user_id)
+        ).first()
         if not db_user:
             raise ValueError("User not found")
 
@@ -138,16 +199,11 @@ class VerifyEmailUseCase:
         if datetime.utcnow() > db_user.email_verification_expires:
             raise ValueError("Verification code expired. Please request a new one.")
 
-        if db_user.email_verification_code != code:
+        if not codes_match(db_user.email_verification_code, code):
             raise ValueError("Invalid verification code")
 
-        # Mark email as verified and clear code
-        db_user.email_verified = True
-        db_user.email_verification_code = None
-        db_user.email_verification_expires = None
-        self.db.commit()
-
-        return {"success": True, "message": "Email verified successfully"}
+        # The code was replaced or used by a concurrent request
+        raise ValueError("Verification code expired. Please request a new one.")
 
 
 class SuggestInboxAddressUseCase:
@@ -169,28 +225,29 @@ class SuggestInboxAddressUseCase:
         Returns:
             Dict with suggested inbox address
         """
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
-        if not db_user:
+        email = self.db.execute(
+            select(UserModel.email).where(UserModel.id == user_id)
+        ).scalar()
+        if email is None:
             raise ValueError("User not found")
 
-        base = sanitize_email_prefix(db_user.email)
+        base = sanitize_email_prefix(email)
 
-        # Try to find a unique combination
-        for _ in range(10):  # Max 10 attempts
-            token = generate_inbox_token()
-            local_part = f"{base}-{token}"
+        # Check a batch of candidates in one query; a collision is rare, so
+        # the first batch almost always has a free address
+        for _ in range(2):
+            candidates = [f"{base}-{generate_inbox_token()}" for _ in range(10)]
+            taken = set(self.db.execute(
+                select(UserModel.inbox_prefix).where(UserModel.inbox_prefix.in_(candidates))
+            ).scalars())
 
-            # Check if unique
-            existing = self.db.query(UserModel).filter(
-                UserModel.inbox_prefix == local_part
-            ).first()
-
-            if not existing:
-                return {
-                    "success": True,
-                    "suggested_address": f"{local_part}@inbox.pai-ai.com",
-                    "local_part": local_part
-                }
+            for local_part in candidates:
+                if local_part not in taken:
+                    return {
+                        "success": True,
+                        "suggested_address": f"{local_part}@inbox.pai-ai.com",
+                        "local_part": local_part
+                    }
 
         # Fallback: extremely unlikely to reach here
         raise ValueError("Could not generate unique address. Please try again.")
@@ -217,7 +274,7 @@ class GenerateInboxAddressUseCase:
             Dict with inbox address info
         """
         # Query UserModel directly to get a mutable ORM object
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        db_user = self.db.get(UserModel, user_id)
         if not db_user:
             raise ValueError("User not found")
 
@@ -242,11 +299,11 @@ class GenerateInboxAddressUseCase:
             }
 
         # Check uniqueness
-        existing = self.db.query(UserModel).filter(
+        taken = self.db.query(exists().where(
             UserModel.inbox_prefix == local_part,
             UserModel.id != user_id
-        ).first()
-        if existing:
+        )).scalar()
+        if taken:
             return {
                 "success": False,
                 "message": "Dit adres is al in gebruik. Pas het aan."
@@ -255,7 +312,7 @@ class GenerateInboxAddressUseCase:
         # Update user - store the full local part in inbox_prefix, no separate token needed
         db_user.inbox_prefix = local_part
         db_user.inbox_token = "x"  # Placeholder for backwards compatibility
-        self.db.commit()
+        self.db.flush()
 
         inbox_email = f"{local_part}@inbox.pai-ai.com"
 
@@ -276,17 +333,19 @@ class SendInboxVerificationUseCase:
         self.user_repository = user_repository
         self.db = db
 
-    def execute(self, user_id: UUID) -> dict:
+    def execute(self, user_id: UUID, send_later: Optional[Callable[..., Any]] = None) -> dict:
         """
         Send inbox verification email.
 
         Args:
             user_id: User's UUID
+            send_later: Schedules a call to run after the response is sent
+                (e.g. BackgroundTasks.add_task); the email is sent inline if None
 
         Returns:
             Dict with success status
         """
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        db_user = self.db.get(UserModel, user_id)
         if not db_user:
             raise ValueError("User not found")
 
@@ -302,7 +361,7 @@ class SendInboxVerificationUseCase:
 
         db_user.inbox_verification_token = token
         db_user.inbox_verification_expires = expires
-        self.db.commit()
+        self.db.flush()
 
         inbox_email = db_user.inbox_email
         # Use production URL - can be overridden by env var later
@@ -311,7 +370,8 @@ class SendInboxVerificationUseCase:
 
         # Send email via SendGrid FROM inbox_email TO db_user.email
         email_service = get_email_service()
-        email_result = email_service.send_inbox_verification_email(
+        (send_later or _send_now)(
+            email_service.send_inbox_verification_email,
             pai_inbox=inbox_email,
             user_email=db_user.email,
             verification_url=verification_url
@@ -323,7 +383,7 @@ class SendInboxVerificationUseCase:
         }
 
         # Include URL in dev mode for testing (when email is faked)
-        if email_result.get("fake"):
+        if email_service.fake:
             result["_dev_verification_url"] = verification_url
 
         return result
@@ -348,8 +408,31 @@ class VerifyInboxUseCase:
         Returns:
             Dict with success status
         """
-        db_user = self.db.query(UserModel).filter(
-            UserModel.inbox_verification_token == token
+        # Verify in one UPDATE ... RETURNING; the database checks that the
+        # link has not expired
+        verified = self.db.execute(
+            update(UserModel)
+            .where(
+                UserModel.inbox_verification_token == token,
+                UserModel.inbox_verified.is_(False),
+                UserModel.inbox_verification_expires >= datetime.utcnow(),
+            )
+            .values(
+                inbox_verified=True,
+                inbox_verification_token=None,
+                inbox_verification_expires=None,
+            )
+            .returning(UserModel.id)
+        ).first()
+
+        if verified:
+            return {"success": True, "message": "Inbox verified successfully"}
+
+        # Nothing updated: find out why
+        db_user = self.db.execute(
+            select(UserModel.inbox_verified).where(
+                UserModel.inbox_verification_token == token
+            )
         ).first()
 
         if not db_user:
@@ -358,16 +441,7 @@ class VerifyInboxUseCase:
         if db_user.inbox_verified:
             return {"success": True, "message": "Inbox already verified"}
 
-        if datetime.utcnow() > db_user.inbox_verification_expires:
-            raise ValueError("Verification link expired. Please request a new one.")
-
-        # Mark inbox as verified and clear token
-        db_user.inbox_verified = True
-        db_user.inbox_verification_token = None
-        db_user.inbox_verification_expires = None
-        self.db.commit()
-
-        return {"success": True, "message": "Inbox verified successfully"}
+        raise ValueError("Verification link expired. Please request a new one.")
 
 
 class StartPhoneVerificationUseCase:
@@ -391,12 +465,12 @@ class StartPhoneVerificationUseCase:
             Dict with success status
         """
         # Query UserModel directly to get a mutable ORM object
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        db_user = self.db.get(UserModel, user_id)
         if not db_user:
             raise ValueError("User not found")
 
         # Normalize phone number (basic cleanup)
-        phone = re.sub(r'[^0-9+]', '', phone_number)
+        phone = _PHONE_INVALID_RE.sub('', phone_number)
         if not phone.startswith('+'):
             # Assume Dutch number if no country code
             if phone.startswith('0'):
@@ -412,7 +486,7 @@ class StartPhoneVerificationUseCase:
         db_user.phone_number = phone
         db_user.phone_verification_code = code
         db_user.phone_verification_expires = expires
-        self.db.commit()
+        self.db.flush()
 
         # TODO: Actually send SMS via Twilio or similar
         print(f"[FAKE SMS] Verification code to {phone}: {code}")
@@ -445,8 +519,35 @@ class VerifyPhoneUseCase:
         Returns:
             Dict with success status
         """
-        # Query UserModel directly to get a mutable ORM object
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        # Verify in one UPDATE ... RETURNING; the database checks that the
+        # code matches and has not expired
+        verified = self.db.execute(
+            update(UserModel)
+            .where(
+                UserModel.id == user_id,
+                UserModel.phone_verified.is_(False),
+                UserModel.phone_verification_code == code,
+                UserModel.phone_verification_expires >= datetime.utcnow(),
+            )
+            .values(
+                phone_verified=True,
+                phone_verification_code=None,
+                phone_verification_expires=None,
+            )
+            .returning(UserModel.id)
+        ).first()
+
+        if verified:
+            return {"success": True, "message": "Phone verified successfully"}
+
+        # Nothing updated: find out why
+        db_user = self.db.execute(
+            select(
+                UserModel.phone_verified,
+                UserModel.phone_verification_code,
+                UserModel.phone_verification_expires,
+            ).where(UserModel.id == user_id)
+        ).first()
         if not db_user:
             raise ValueError("User not found")
 
@@ -459,16 +560,11 @@ class VerifyPhoneUseCase:
         if datetime.utcnow() > db_user.phone_verification_expires:
             raise ValueError("Verification code expired. Please request a new one.")
 
-        if db_user.phone_verification_code != code:
+        if not codes_match(db_user.phone_verification_code, code):
             raise ValueError("Invalid verification code")
 
-        # Mark phone as verified and clear code
-        db_user.phone_verified = True
-        db_user.phone_verification_code = None
-        db_user.phone_verification_expires = None
-        self.db.commit()
-
-        return {"success": True, "message": "Phone verified successfully"}
+        # The code was replaced or used by a concurrent request
+        raise ValueError("Verification code expired. Please request a new one.")
 
 
 class CompleteOnboardingUseCase:
@@ -491,7 +587,7 @@ class CompleteOnboardingUseCase:
             Dict with success status
         """
         # Query UserModel directly to get a mutable ORM object
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        db_user = self.db.get(UserModel, user_id)
         if not db_user:
             raise ValueError("User not found")
 
@@ -507,7 +603,7 @@ class CompleteOnboardingUseCase:
         #     raise ValueError("Phone must be verified first")
 
         db_user.onboarding_completed = True
-        self.db.commit()
+        self.db.flush()
 
         return {
             "success": True,
@@ -524,7 +620,7 @@ class GetOnboardingStatusUseCase:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    def execute(self, user_id: UUID) -> dict:
+    async def execute(self, user_id: UUID) -> dict:
         """
         Get current onboarding status.
 
@@ -534,14 +630,14 @@ class GetOnboardingStatusUseCase:
         Returns:
             Dict with onboarding status
         """
-        user = self.user_repository.get_by_id(user_id)
+        user = await self.user_repository.get_onboarding_status(user_id)
         if not user:
             raise ValueError("User not found")
 
         return {
             "email": user.email,
             "email_verified": user.email_verified,
-            "inbox_email": user.inbox_email,
+            "inbox_email": f"{user.inbox_prefix}@inbox.pai-ai.com" if user.inbox_prefix else None,
             "inbox_prefix": user.inbox_prefix,
             "inbox_verified": user.inbox_verified,
             "phone_number": user.phone_number,
@@ -551,7 +647,7 @@ class GetOnboardingStatusUseCase:
         }
 
     def _determine_current_step(self, user) -> int:
-        """Determine which onboarding step the user is on."""
+        """Determine which onboarding step the user is on (from the status row)."""
         if not user.email_verified:
             return 1  # Email verification
         if not user.inbox_prefix:
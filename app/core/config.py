@@ -22,10 +22,19 @@ class Settings(BaseSettings):
 
     # Security
     SECRET_KEY: str = "CHANGE_THIS_IN_PRODUCTION"
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # HS256 is fastest; we are the only signer and verifier
+    JWT_PRIVATE_KEY: Optional[str] = None  # PEM, only for RS*/ES* algorithms
+    JWT_PUBLIC_KEY: Optional[str] = None  # PEM, only for RS*/ES* algorithms
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # 30 minuten (kort voor veiligheid)
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # 30 dagen
 
+    # Password hashing (existing hashes are upgraded on login)
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # bcrypt or argon2
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB (64 MB)
+    ARGON2_PARALLELISM: int = 2
+
     # CORS
     ALLOWED_ORIGINS: list[str] = ["*"]
 
@@ -40,6 +49,7 @@ class Settings(BaseSettings):
 
     # External APIs
     ANTHROPIC_API_KEY: Optional[str] = None  # For Claude AI integration (later)
+    CLAUDE_CONCURRENCY: int = 10  # Max concurrent Claude API requests per process
 
     # Email (SendGrid)
     SENDGRID_API_KEY: Optional[str] = None
@@ -2,12 +2,14 @@
 FastAPI dependencies for dependency injection.
 Following Clean Architecture principles.
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.infrastructure.database.session import SessionLocal
+from app.infrastructure.database.session import AsyncSessionLocal, SessionLocal
 from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.repositories.refresh_token_repository import RefreshTokenRepository
 from app.application.use_cases.auth_use_cases import GetCurrentUserUseCase
 from app.infrastructure.services.jwt import extract_user_id_from_token
 
@@ -19,20 +21,39 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency that provides a database session.
-    Automatically closes the session after the request.
+    Commits after the request succeeds (one transaction per request), rolls
+    back if it raised, and closes the session.
     """
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
-def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency that provides an async database session.
+    Automatically closes the session after the request.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_user_repository(db: AsyncSession = Depends(get_async_db)) -> UserRepository:
     """Dependency to get user repository."""
     return UserRepository(db)
 
 
+def get_refresh_token_repository(db: AsyncSession = Depends(get_async_db)) -> RefreshTokenRepository:
+    """Dependency to get refresh token repository."""
+    return RefreshTokenRepository(db)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     user_repo: UserRepository = Depends(get_user_repository),
@@ -50,7 +71,7 @@ async def get_current_user(
         )
 
     use_case = GetCurrentUserUseCase(user_repo)
-    user = use_case.execute(str(user_id))
+    user = await use_case.execute(str(user_id))
 
     if not user:
         raise HTTPException(
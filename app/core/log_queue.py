@@ -0,0 +1,46 @@
+"""
+Non-blocking log output.
+
+Handlers such as StreamHandler write and flush while holding a lock, which
+stalls the event loop whenever a coroutine logs. start_log_queue() puts a
+QueueHandler on the root logger instead; a background thread takes the
+records off the queue and passes them to the real handlers.
+"""
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+_listener: Optional[QueueListener] = None
+_root_handlers: List[logging.Handler] = []
+
+
+def start_log_queue() -> None:
+    """Route root logger output through a queue (application startup)."""
+    global _listener, _root_handlers
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    # Without configured handlers, records would go to logging.lastResort
+    # (stderr, WARNING and up); keep that output
+    _root_handlers = list(root.handlers)
+    handlers = _root_handlers or [logging.StreamHandler()]
+    if not _root_handlers:
+        handlers[0].setLevel(logging.WARNING)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.handlers = [QueueHandler(log_queue)]
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_log_queue() -> None:
+    """Write out queued records and restore the root handlers (application shutdown)."""
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    _listener = None
+    logging.getLogger().handlers = _root_handlers
@@ -4,11 +4,27 @@ Part of Domain layer - contains business logic and rules.
 """
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum
 from typing import Optional, List
 from uuid import UUID
 
 
-@dataclass
+class DialogState(str, Enum):
+    """
+    Where a conversation is in a confirmation dialog.
+    IDLE → AWAITING_CONFIRMATION (an action waits for "ja"/"nee")
+    → EXECUTING (confirmed, running) → IDLE.
+    """
+    IDLE = "idle"
+    AWAITING_CONFIRMATION = "awaiting_confirmation"
+    EXECUTING = "executing"
+
+
+# Metadata key holding the dialog state, its slots and remaining lifetime
+DIALOG_METADATA_KEY = "dialog"
+
+
+@dataclass(slots=True)
 class Message:
     """
     Single message in a conversation.
@@ -41,7 +57,7 @@ class Message:
         return first_word[1:].lower()  # Remove # and lowercase
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """
     Conversation domain entity.
@@ -89,6 +105,59 @@ class Conversation:
             metadata={},
         )
 
+    @property
+    def dialog_state(self) -> DialogState:
+        """Current dialog state (IDLE when none is stored)."""
+        dialog = (self.metadata or {}).get(DIALOG_METADATA_KEY)
+        return DialogState(dialog["state"]) if dialog else DialogState.IDLE
+
+    @property
+    def dialog_slots(self) -> dict:
+        """Slots of the pending action (empty when IDLE)."""
+        dialog = (self.metadata or {}).get(DIALOG_METADATA_KEY)
+        return dialog["slots"] if dialog else {}
+
+    def await_confirmation(self, slots: dict, lifetime: int = 2) -> None:
+        """
+        Wait for the user to confirm an action.
+
+        Args:
+            slots: Everything needed to run the action once confirmed
+            lifetime: Number of user messages the question stays open for
+        """
+        self._set_dialog(DialogState.AWAITING_CONFIRMATION, slots, lifetime)
+
+    def start_executing(self) -> None:
+        """Mark the confirmed action as running, so it cannot be confirmed twice."""
+        self._set_dialog(DialogState.EXECUTING, self.dialog_slots, 0)
+
+    def clear_dialog(self) -> None:
+        """Return to IDLE."""
+        if self.metadata:
+            self.metadata.pop(DIALOG_METADATA_KEY, None)
+
+    def tick_dialog(self) -> None:
+        """
+        Count one user message that did not answer the question.
+        The question expires (back to IDLE) when its lifetime runs out.
+        """
+        dialog = (self.metadata or {}).get(DIALOG_METADATA_KEY)
+        if not dialog:
+            return
+        if dialog["lifetime"] <= 1:
+            self.clear_dialog()
+        else:
+            dialog["lifetime"] -= 1
+
+    def _set_dialog(self, state: DialogState, slots: dict, lifetime: int) -> None:
+        if self.metadata is None:
+            self.metadata = {}
+        self.metadata[DIALOG_METADATA_KEY] = {
+            "state": state.value,
+            "slots": slots,
+            "lifetime": lifetime,
+        }
+
     def add_message(
         self,
         role: str,
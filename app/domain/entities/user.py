@@ -4,9 +4,16 @@ Part of Domain layer - contains business logic and rules.
 """
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 from uuid import UUID, uuid4
 
+# Login status bits (see User.status_mask)
+STATUS_LOCAL = 0b001
+STATUS_ACTIVE = 0b010
+STATUS_HAS_PASSWORD = 0b100
+STATUS_CAN_LOGIN = STATUS_LOCAL | STATUS_ACTIVE | STATUS_HAS_PASSWORD
+
 
 @dataclass
 class User:
@@ -105,6 +112,25 @@ class User:
         """Check if user uses local authentication."""
         return self.provider == "local"
 
+    @property
+    def status_mask(self) -> int:
+        """Login status bits: local provider, active, has a password hash."""
+        return (
+            (STATUS_LOCAL if self.provider == "local" else 0)
+            | (STATUS_ACTIVE if self.is_active else 0)
+            | (STATUS_HAS_PASSWORD if self.hashed_password else 0)
+        )
+
+    @cached_property
+    def id_str(self) -> str:
+        """User ID as string (memoized, the ID never changes)."""
+        return str(self.id)
+
+    @cached_property
+    def created_at_iso(self) -> str:
+        """Creation timestamp in ISO format (memoized, never changes)."""
+        return self.created_at.isoformat()
+
     @property
     def inbox_email(self) -> Optional[str]:
         """Get full PAI inbox email address."""
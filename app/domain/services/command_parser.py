@@ -18,24 +18,9 @@ class CommandType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
-class ParsedCommand:
-    """
-    Parsed command result.
-    """
-    command_type: CommandType
-    original_text: str
-    command_text: str  # Text after the command keyword
-    parameters: Dict[str, Any]  # Extracted parameters
-
-    def is_command(self) -> bool:
-        """Check if this is a valid command (not unknown)."""
-        return self.command_type != CommandType.UNKNOWN
-
-    def get_help_text(self) -> str:
-        """Get help text for the command."""
-        help_texts = {
-            CommandType.CALENDAR: """📅 Calendar commando's:
+# Help text per command type (built once, at import)
+HELP_TEXTS: Dict[CommandType, str] = {
+    CommandType.CALENDAR: """📅 Calendar commando's:
 
 #calendar afspraak maken - Maak nieuwe afspraak
 #calendar lijst - Toon komende afspraken
@@ -47,7 +32,7 @@ Voorbeelden:
 - #calendar lijst deze week
 - #calendar verwijder afspraak <id>
 """,
-            CommandType.REMINDER: """⏰ Reminder commando's:
+    CommandType.REMINDER: """⏰ Reminder commando's:
 
 #reminder - Maak een snelle herinnering
 
@@ -56,7 +41,7 @@ Voorbeelden:
 - #reminder Tandarts morgen 10:00
 - #reminder Bel moeder vrijdag 15:00
 """,
-            CommandType.TASK: """✅ Taak commando's:
+    CommandType.TASK: """✅ Taak commando's:
 
 #task of #taak - Maak een nieuwe taak
 
@@ -68,7 +53,7 @@ Voorbeelden:
 
 Gebruik @persoon om een taak te delegeren
 """,
-            CommandType.NOTE: """📝 Notitie commando's:
+    CommandType.NOTE: """📝 Notitie commando's:
 
 #note maken - Nieuwe notitie
 #note lijst - Toon notities
@@ -79,7 +64,7 @@ Voorbeelden:
 - #note lijst vandaag
 - #note zoek vergadering
 """,
-            CommandType.SCAN: """📸 Scan commando's:
+    CommandType.SCAN: """📸 Scan commando's:
 
 #scan document - Scan en verwerk document
 #scan foto - Scan foto/afbeelding
@@ -89,7 +74,7 @@ Voorbeelden:
 - #scan document contract.pdf
 - #scan bon voor declaratie
 """,
-            CommandType.HELP: """❓ Beschikbare commando's:
+    CommandType.HELP: """❓ Beschikbare commando's:
 
 📅 #calendar - Agenda beheer
 ⏰ #reminder - Snelle herinneringen
@@ -101,9 +86,28 @@ Voorbeelden:
 Gebruik #help <commando> voor meer info over een specifiek commando.
 Bijvoorbeeld: #help calendar of #help task
 """,
-        }
+}
+
+UNKNOWN_COMMAND_TEXT = "Onbekend commando. Typ #help voor beschikbare commando's."
+
+
+@dataclass
+class ParsedCommand:
+    """
+    Parsed command result.
+    """
+    command_type: CommandType
+    original_text: str
+    command_text: str  # Text after the command keyword
+    parameters: Dict[str, Any]  # Extracted parameters
 
-        return help_texts.get(self.command_type, "Onbekend commando. Typ #help voor beschikbare commando's.")
+    def is_command(self) -> bool:
+        """Check if this is a valid command (not unknown)."""
+        return self.command_type != CommandType.UNKNOWN
+
+    def get_help_text(self) -> str:
+        """Get help text for the command."""
+        return HELP_TEXTS.get(self.command_type, UNKNOWN_COMMAND_TEXT)
 
 
 class CommandParser:
@@ -129,6 +133,35 @@ class CommandParser:
         "hulp": CommandType.HELP,
     }
 
+    # Answers to a yes/no question (compared after lowercasing and
+    # stripping punctuation). Only explicit yeses: a confirmation runs an
+    # action, so everyday words like "ok" or "prima" do not count.
+    AFFIRMATIONS = frozenset({
+        "ja", "jazeker", "ja graag", "ja hoor", "ja doe maar", "doe maar", "yes",
+    })
+    NEGATIONS = frozenset({
+        "nee", "neen", "nee dank je", "nee bedankt", "niet doen", "laat maar",
+        "annuleer", "annuleren", "stop", "no",
+    })
+
+    @classmethod
+    def parse_confirmation(cls, text: str) -> Optional[bool]:
+        """
+        Parse a short answer to a yes/no question.
+
+        Args:
+            text: User input text
+
+        Returns:
+            True for an affirmation, False for a negation, None otherwise
+        """
+        answer = " ".join(text.lower().replace(",", " ").strip(" .!").split())
+        if answer in cls.AFFIRMATIONS:
+            return True
+        if answer in cls.NEGATIONS:
+            return False
+        return None
+
     @classmethod
     def parse(cls, text: str) -> ParsedCommand:
         """
@@ -3,7 +3,7 @@ SQLAlchemy database models.
 Part of Infrastructure layer - persistence models.
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, JSON, Integer, Sequence, Index
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, JSON, Integer, Sequence, Index, LargeBinary, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -23,7 +23,7 @@ class UserModel(Base):
     full_name = Column(String(255), nullable=False)
     provider = Column(String(50), nullable=False)  # google, microsoft, local
     hashed_password = Column(String(255), nullable=True)  # Only for local users
-    photo_url = Column(Text, nullable=True)  # Profile photo URL (base64 data URL)
+    photo_url = Column(String(512), nullable=True)  # Profile photo URL (bytes live in user_photos)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -55,6 +55,15 @@ class UserModel(Base):
     oauth_tokens = relationship("OAuthTokenModel", back_populates="user", cascade="all, delete-orphan")
     settings = relationship("UserSettingsModel", back_populates="user", uselist=False, cascade="all, delete-orphan")
     refresh_tokens = relationship("RefreshTokenModel", back_populates="user", cascade="all, delete-orphan")
+    photo = relationship("UserPhotoModel", back_populates="user", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Partial: only users with an inbox (or a pending inbox verification)
+        Index('ix_users_inbox_prefix', 'inbox_prefix', unique=True,
+              postgresql_where=text('inbox_prefix IS NOT NULL')),
+        Index('ix_users_inbox_verification_token', 'inbox_verification_token',
+              postgresql_where=text('inbox_verification_token IS NOT NULL')),
+    )
 
     @property
     def inbox_email(self) -> str | None:
@@ -67,6 +76,27 @@ class UserModel(Base):
         return f"<UserModel(id={self.id}, email={self.email}, provider={self.provider})>"
 
 
+class UserPhotoModel(Base):
+    """
+    Profile photo bytes, kept out of the users table.
+    Maps to the 'user_photos' table in PostgreSQL.
+    """
+
+    __tablename__ = "user_photos"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    content_type = Column(String(50), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    token = Column(String(64), unique=True, nullable=False)  # Random per-upload token used in the photo URL
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    user = relationship("UserModel", back_populates="photo")
+
+    def __repr__(self) -> str:
+        return f"<UserPhotoModel(user_id={self.user_id}, content_type={self.content_type})>"
+
+
 class OAuthTokenModel(Base):
     """
     OAuth token storage for calendar providers.
@@ -134,7 +164,22 @@ class ConversationModel(Base):
 
     # Relationships
     user = relationship("UserModel")
-    messages = relationship("MessageModel", back_populates="conversation", cascade="all, delete-orphan", order_by="MessageModel.created_at")
+    # Never lazy-loaded: queries must ask for messages explicitly (selectinload)
+    # instead of firing a hidden query on attribute access. Deletes leave the
+    # messages to the database's ON DELETE CASCADE.
+    messages = relationship(
+        "MessageModel",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        order_by="MessageModel.created_at",
+        lazy="raise",
+        passive_deletes=True,
+    )
+
+    # Keyset pagination of a user's conversations (newest first)
+    __table_args__ = (
+        Index('ix_conversations_user_updated', 'user_id', 'updated_at', 'id'),
+    )
 
     def __repr__(self) -> str:
         return f"<ConversationModel(id={self.id}, user_id={self.user_id}, mode={self.mode})>"
@@ -149,7 +194,7 @@ class MessageModel(Base):
     __tablename__ = "messages"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False, index=True)
+    conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True)
     role = Column(String(50), nullable=False)  # user, assistant, system
     content = Column(Text, nullable=False)
     meta = Column(JSON, nullable=True)  # For commands, attachments, etc. (renamed from metadata - reserved keyword)
@@ -158,6 +203,11 @@ class MessageModel(Base):
     # Relationships
     conversation = relationship("ConversationModel", back_populates="messages")
 
+    # Keyset pagination of a conversation's messages
+    __table_args__ = (
+        Index('ix_messages_conversation_created', 'conversation_id', 'created_at', 'id'),
+    )
+
     def __repr__(self) -> str:
         return f"<MessageModel(id={self.id}, conversation_id={self.conversation_id}, role={self.role})>"
 
@@ -345,7 +395,7 @@ class RefreshTokenModel(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    token = Column(String(500), nullable=False, unique=True, index=True)
+    token_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)  # SHA-256 of the token
     expires_at = Column(DateTime, nullable=False)
     revoked = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,27 @@
+"""
+Shared SQL expression helpers.
+Part of Infrastructure layer.
+"""
+from typing import Iterable
+from uuid import UUID
+from sqlalchemy import any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.sql.elements import ColumnElement
+
+_UUID_ARRAY = ARRAY(PG_UUID(as_uuid=True))
+
+
+def uuid_in(column, ids: Iterable[UUID]) -> ColumnElement[bool]:
+    """
+    Match a UUID column against a list of IDs: column = ANY(:ids::uuid[]).
+    The list is sent as one array parameter instead of one placeholder per
+    ID, so every batch size shares the same statement.
+
+    Args:
+        column: UUID column
+        ids: IDs to match
+
+    Returns:
+        SQL condition
+    """
+    return column == any_(literal(list(ids), _UUID_ARRAY))
@@ -2,7 +2,12 @@
 Database session management.
 Part of Infrastructure layer.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -17,5 +22,54 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for non-blocking request paths
+async_engine = create_async_engine(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    pool_pre_ping=True,
+    echo=settings.DEBUG,
+)
+
+# Create AsyncSessionLocal class (no expiry on commit: entities are read after commit)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for SQLAlchemy models
 Base = declarative_base()
+
+T = TypeVar("T")
+
+# Thread pool for blocking calls on sync sessions from async code (created
+# lazily). Sized to the sync engine's default pool: 5 connections + 10 overflow.
+_db_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_pool() -> ThreadPoolExecutor:
+    """Get or create the thread pool used for blocking database calls."""
+    global _db_pool
+    if _db_pool is None:
+        _db_pool = ThreadPoolExecutor(max_workers=15, thread_name_prefix="db")
+    return _db_pool
+
+
+def shutdown_db_pool() -> None:
+    """Shut down the database thread pool (application shutdown)."""
+    global _db_pool
+    if _db_pool is not None:
+        _db_pool.shutdown(wait=False, cancel_futures=True)
+        _db_pool = None
+
+
+async def run_in_db_pool(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking database call in the thread pool without blocking the event loop.
+    Calls sharing one Session must still be awaited one after another.
+
+    Args:
+        fn: Blocking callable (e.g. a sync repository method)
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_pool(), partial(fn, *args, **kwargs))
@@ -2,22 +2,32 @@
 Conversation repository - data access layer.
 Part of Infrastructure layer.
 """
-from typing import Optional, List
-from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from datetime import datetime
+from typing import Optional, List, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import and_, delete, desc, insert, select, tuple_, update
 
 from app.infrastructure.database.models import ConversationModel, MessageModel
 from app.domain.entities.conversation import Conversation, Message
 
+# Keyset pagination position: (timestamp, id) of the last row on the previous page
+Cursor = Tuple[datetime, UUID]
+
 
 class ConversationRepository:
-    """Repository for conversation persistence operations."""
+    """
+    Repository for conversation persistence operations.
+    Uses an AsyncSession so database I/O never blocks the event loop; relations
+    are never lazy-loaded, so load messages explicitly where they are needed.
+    """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_conversation(
+    async def create_conversation(
         self,
         user_id: UUID,
         title: str,
@@ -43,16 +53,18 @@ class ConversationRepository:
             meta=metadata or {},
         )
 
+        # ID and timestamps are client-side defaults and the session does not
+        # expire on commit, so no refresh is needed
         self.db.add(conversation)
-        self.db.commit()
-        self.db.refresh(conversation)
+        await self.db.commit()
 
         return conversation
 
-    def get_conversation(
+    async def get_conversation(
         self,
         conversation_id: UUID,
         user_id: Optional[UUID] = None,
+        include_messages: bool = False,
     ) -> Optional[ConversationModel]:
         """
         Get a conversation by ID.
@@ -60,53 +72,76 @@ class ConversationRepository:
         Args:
             conversation_id: Conversation ID
             user_id: Optional user ID to verify ownership
+            include_messages: Load all messages in one extra SELECT ... IN query;
+                otherwise messages are not loaded and stay empty
 
         Returns:
             ConversationModel or None
         """
-        query = self.db.query(ConversationModel).filter(
+        messages_option = (
+            selectinload(ConversationModel.messages)
+            if include_messages
+            else noload(ConversationModel.messages)
+        )
+        query = select(ConversationModel).options(messages_option).where(
             ConversationModel.id == conversation_id
         )
 
         if user_id:
-            query = query.filter(ConversationModel.user_id == user_id)
+            query = query.where(ConversationModel.user_id == user_id)
 
-        return query.first()
+        return (await self.db.execute(query)).scalars().first()
 
-    def get_user_conversations(
+    async def get_user_conversations(
         self,
         user_id: UUID,
         mode: Optional[str] = None,
         limit: int = 50,
+        cursor: Optional[Cursor] = None,
         offset: int = 0,
+        include_messages: bool = False,
     ) -> List[ConversationModel]:
         """
-        Get all conversations for a user.
+        Get all conversations for a user, most recently updated first.
 
         Args:
             user_id: User ID
             mode: Optional filter by mode
             limit: Maximum number of results
-            offset: Offset for pagination
+            cursor: (updated_at, id) of the last conversation on the previous
+                page; only older conversations are returned
+            offset: Legacy offset pagination (ignored when cursor is given)
+            include_messages: Load all messages in one extra SELECT ... IN query;
+                otherwise messages are not loaded and stay empty
 
         Returns:
             List of ConversationModel
         """
-        query = self.db.query(ConversationModel).options(
-            joinedload(ConversationModel.messages)
-        ).filter(
+        messages_option = (
+            selectinload(ConversationModel.messages)
+            if include_messages
+            else noload(ConversationModel.messages)
+        )
+        query = select(ConversationModel).options(messages_option).where(
             ConversationModel.user_id == user_id
         )
 
         if mode:
-            query = query.filter(ConversationModel.mode == mode)
+            query = query.where(ConversationModel.mode == mode)
 
-        query = query.order_by(desc(ConversationModel.updated_at))
-        query = query.limit(limit).offset(offset)
+        if cursor is not None:
+            query = query.where(
+                tuple_(ConversationModel.updated_at, ConversationModel.id) < cursor
+            )
+        elif offset:
+            query = query.offset(offset)
+
+        query = query.order_by(desc(ConversationModel.updated_at), desc(ConversationModel.id))
+        query = query.limit(limit)
 
-        return query.all()
+        return list((await self.db.execute(query)).scalars().all())
 
-    def update_conversation(
+    async def update_conversation(
         self,
         conversation_id: UUID,
         title: Optional[str] = None,
@@ -123,9 +158,7 @@ class ConversationRepository:
         Returns:
             Updated ConversationModel or None
         """
-        conversation = self.db.query(ConversationModel).filter(
-            ConversationModel.id == conversation_id
-        ).first()
+        conversation = await self.get_conversation(conversation_id)
 
         if not conversation:
             return None
@@ -135,13 +168,49 @@ class ConversationRepository:
 
         if metadata is not None:
             conversation.meta = metadata
+            # The dict may be the loaded one changed in place, which the
+            # JSON column cannot detect by comparison
+            flag_modified(conversation, "meta")
 
-        self.db.commit()
-        self.db.refresh(conversation)
+        await self.db.commit()
 
         return conversation
 
-    def delete_conversation(self, conversation_id: UUID) -> bool:
+    async def update_metadata_if_dialog_state(
+        self,
+        conversation_id: UUID,
+        state: str,
+        metadata: dict,
+    ) -> bool:
+        """
+        Replace a conversation's metadata only while its dialog is in a state.
+        The check and the write are one UPDATE, so of two concurrent callers
+        moving the dialog on from the same state only one succeeds.
+
+        Args:
+            conversation_id: Conversation ID
+            state: Dialog state the stored metadata must still be in
+            metadata: New metadata
+
+        Returns:
+            True if updated, False if the dialog was no longer in the state
+        """
+        result = await self.db.execute(
+            update(ConversationModel)
+            .where(
+                ConversationModel.id == conversation_id,
+                ConversationModel.meta[("dialog", "state")].as_string() == state,
+            )
+            .values(meta=metadata)
+            .returning(ConversationModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.first() is not None
+        await self.db.commit()
+
+        return updated
+
+    async def delete_conversation(self, conversation_id: UUID) -> bool:
         """
         Delete a conversation and all its messages.
 
@@ -151,19 +220,39 @@ class ConversationRepository:
         Returns:
             True if deleted, False if not found
         """
-        conversation = self.db.query(ConversationModel).filter(
-            ConversationModel.id == conversation_id
-        ).first()
+        conversation = await self.get_conversation(conversation_id)
 
         if not conversation:
             return False
 
-        self.db.delete(conversation)
-        self.db.commit()
+        await self.db.delete(conversation)
+        await self.db.commit()
 
         return True
 
-    def add_message(
+    async def delete_conversation_authorized(self, conversation_id: UUID, user_id: UUID) -> bool:
+        """
+        Delete a conversation owned by a user in a single DELETE statement.
+        Messages are removed by the database's ON DELETE CASCADE.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: Owner's user ID
+
+        Returns:
+            True if deleted, False if not found or not owned by the user
+        """
+        result = await self.db.execute(
+            delete(ConversationModel).where(
+                ConversationModel.id == conversation_id,
+                ConversationModel.user_id == user_id,
+            )
+        )
+        await self.db.commit()
+
+        return result.rowcount > 0
+
+    async def add_message(
         self,
         conversation_id: UUID,
         role: str,
@@ -191,24 +280,72 @@ class ConversationRepository:
 
         self.db.add(message)
 
-        # Update conversation updated_at timestamp
-        conversation = self.db.query(ConversationModel).filter(
-            ConversationModel.id == conversation_id
-        ).first()
-
-        if conversation:
-            from datetime import datetime
-            conversation.updated_at = datetime.utcnow()
+        # Update conversation updated_at timestamp without loading it
+        await self.db.execute(
+            update(ConversationModel)
+            .where(ConversationModel.id == conversation_id)
+            .values(updated_at=datetime.utcnow())
+        )
 
-        self.db.commit()
-        self.db.refresh(message)
+        await self.db.commit()
 
         return message
 
-    def get_messages(
+    async def add_messages(self, conversation_id: UUID, rows: List[dict]) -> List[Message]:
+        """
+        Add several messages to a conversation in one transaction.
+        The messages go in as a single multi-row INSERT, without ORM unit of
+        work; IDs and timestamps are assigned client-side, so nothing needs
+        to be read back.
+
+        Args:
+            conversation_id: Conversation ID
+            rows: Message dicts with role, content, optional metadata and
+                optional created_at (defaults to now)
+
+        Returns:
+            Created Message domain entities, in the given order
+        """
+        now = datetime.utcnow()
+        values = [
+            {
+                "id": uuid4(),
+                "conversation_id": conversation_id,
+                "role": row["role"],
+                "content": row["content"],
+                "meta": row.get("metadata") or {},
+                "created_at": row.get("created_at") or now,
+            }
+            for row in rows
+        ]
+        await self.db.execute(insert(MessageModel).values(values))
+
+        # Update conversation updated_at timestamp without loading it
+        await self.db.execute(
+            update(ConversationModel)
+            .where(ConversationModel.id == conversation_id)
+            .values(updated_at=now)
+        )
+
+        await self.db.commit()
+
+        return [
+            Message(
+                id=str(value["id"]),
+                conversation_id=conversation_id,
+                role=value["role"],
+                content=value["content"],
+                created_at=value["created_at"],
+                metadata=value["meta"],
+            )
+            for value in values
+        ]
+
+    async def get_messages(
         self,
         conversation_id: UUID,
         limit: int = 100,
+        cursor: Optional[Cursor] = None,
         offset: int = 0,
     ) -> List[MessageModel]:
         """
@@ -217,18 +354,66 @@ class ConversationRepository:
         Args:
             conversation_id: Conversation ID
             limit: Maximum number of messages
-            offset: Offset for pagination
+            cursor: (created_at, id) of the last message on the previous page;
+                only later messages are returned
+            offset: Legacy offset pagination (ignored when cursor is given)
 
         Returns:
             List of MessageModel ordered by created_at
         """
-        messages = self.db.query(MessageModel).filter(
+        query = select(MessageModel).where(
             MessageModel.conversation_id == conversation_id
-        ).order_by(MessageModel.created_at).limit(limit).offset(offset).all()
+        )
+
+        if cursor is not None:
+            query = query.where(tuple_(MessageModel.created_at, MessageModel.id) > cursor)
+        elif offset:
+            query = query.offset(offset)
+
+        query = query.order_by(MessageModel.created_at, MessageModel.id).limit(limit)
+        return list((await self.db.execute(query)).scalars().all())
+
+    async def get_messages_authorized(
+        self,
+        conversation_id: UUID,
+        user_id: UUID,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+    ) -> Optional[List[MessageModel]]:
+        """
+        Get messages for a conversation owned by a user, in one query.
+        The conversation is outer-joined to its messages, so an owned but
+        empty conversation still returns a row.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: Owner's user ID
+            limit: Maximum number of messages
+            cursor: (created_at, id) of the last message on the previous page;
+                only later messages are returned
 
-        return messages
+        Returns:
+            List of MessageModel ordered by created_at, or None if the
+            conversation is not found or not owned by the user
+        """
+        join_on = MessageModel.conversation_id == ConversationModel.id
+        if cursor is not None:
+            join_on = and_(join_on, tuple_(MessageModel.created_at, MessageModel.id) > cursor)
+
+        rows = (await self.db.execute(
+            select(ConversationModel.id, MessageModel).select_from(
+                ConversationModel
+            ).outerjoin(MessageModel, join_on).where(
+                ConversationModel.id == conversation_id,
+                ConversationModel.user_id == user_id,
+            ).order_by(MessageModel.created_at, MessageModel.id).limit(limit)
+        )).all()
+
+        if not rows:
+            return None
+        return [message for _, message in rows if message is not None]
 
-    def get_latest_messages(
+    async def get_latest_messages(
         self,
         conversation_id: UUID,
         limit: int = 50,
@@ -243,34 +428,30 @@ class ConversationRepository:
         Returns:
             List of MessageModel (ordered oldest to newest)
         """
-        messages = self.db.query(MessageModel).filter(
-            MessageModel.conversation_id == conversation_id
-        ).order_by(desc(MessageModel.created_at)).limit(limit).all()
+        messages = (await self.db.execute(
+            select(MessageModel).where(
+                MessageModel.conversation_id == conversation_id
+            ).order_by(desc(MessageModel.created_at), desc(MessageModel.id)).limit(limit)
+        )).scalars().all()
 
         # Reverse to get chronological order (oldest first)
         return list(reversed(messages))
 
-    def conversation_to_entity(self, model: ConversationModel) -> Conversation:
+    def conversation_to_entity(
+        self, model: ConversationModel, include_messages: bool = True
+    ) -> Conversation:
         """
         Convert ConversationModel to domain entity.
 
         Args:
             model: ConversationModel from database
+            include_messages: Convert the messages too (they must have been
+                loaded with the query); otherwise the entity's message list is empty
 
         Returns:
             Conversation domain entity
         """
-        messages = [
-            Message(
-                id=str(msg.id),
-                conversation_id=msg.conversation_id,
-                role=msg.role,
-                content=msg.content,
-                created_at=msg.created_at,
-                metadata=msg.meta or {},
-            )
-            for msg in model.messages
-        ]
+        messages = [self.message_to_entity(msg) for msg in model.messages] if include_messages else []
 
         return Conversation(
             id=model.id,
@@ -282,3 +463,23 @@ class ConversationRepository:
             messages=messages,
             metadata=model.meta or {},
         )
+
+    @staticmethod
+    def message_to_entity(model: MessageModel) -> Message:
+        """
+        Convert MessageModel to domain entity.
+
+        Args:
+            model: MessageModel from database
+
+        Returns:
+            Message domain entity
+        """
+        return Message(
+            id=str(model.id),
+            conversation_id=model.conversation_id,
+            role=model.role,
+            content=model.content,
+            created_at=model.created_at,
+            metadata=model.meta or {},
+        )
@@ -2,23 +2,33 @@
 InboxItem repository implementation.
 Part of Infrastructure layer - handles database operations.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, and_, cast, column, delete, func, select, true, update, values
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 
 from app.infrastructure.database.models import InboxItemModel
+from app.infrastructure.database.queries import uuid_in
 from app.domain.entities.inbox_item import InboxItem, InboxItemType, InboxStatus, Priority
 
+# Current UTC time from the database clock (timestamps are stored as naive UTC)
+UTC_NOW = func.timezone("utc", func.now())
+# to_char() pattern matching datetime.isoformat() with microseconds
+ISO_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.US'
+
 
 class InboxRepository:
-    """Repository for InboxItem persistence."""
+    """
+    Repository for InboxItem persistence.
+    Uses an AsyncSession so database I/O never blocks the event loop.
+    """
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.db = db_session
 
-    def create_inbox_item(
+    async def create_inbox_item(
         self,
         user_id: UUID,
         type: InboxItemType,
@@ -48,25 +58,44 @@ class InboxRepository:
             linked_items=linked_items or [],
             processed_at=processed_at,
         )
+        # ID and timestamps are client-side defaults and the session does not
+        # expire on commit, so no refresh is needed
         self.db.add(item)
-        self.db.commit()
-        self.db.refresh(item)
+        await self.db.commit()
         return item
 
-    def get_inbox_item(self, item_id: UUID, user_id: UUID) -> Optional[InboxItemModel]:
+    async def get_inbox_item(self, item_id: UUID, user_id: UUID) -> Optional[InboxItemModel]:
         """Get a single inbox item by ID."""
-        return (
-            self.db.query(InboxItemModel)
-            .filter(
-                and_(
-                    InboxItemModel.id == item_id,
-                    InboxItemModel.user_id == user_id,
-                )
+        return (await self.db.execute(
+            select(InboxItemModel).where(
+                InboxItemModel.id == item_id,
+                InboxItemModel.user_id == user_id,
             )
-            .first()
-        )
+        )).scalars().first()
+
+    async def get_many(self, item_ids: List[UUID], user_id: UUID) -> List[InboxItemModel]:
+        """
+        Get several inbox items by ID in one query. The IDs are sent as one
+        array parameter, so any batch size uses the same statement.
 
-    def get_user_inbox_items(
+        Args:
+            item_ids: Inbox item IDs
+            user_id: User ID to verify ownership
+
+        Returns:
+            List of InboxItemModel (unknown or foreign IDs are skipped)
+        """
+        if not item_ids:
+            return []
+
+        return list((await self.db.execute(
+            select(InboxItemModel).where(
+                uuid_in(InboxItemModel.id, item_ids),
+                InboxItemModel.user_id == user_id,
+            )
+        )).scalars().all())
+
+    async def get_user_inbox_items_with_counts(
         self,
         user_id: UUID,
         status: Optional[str] = None,
@@ -74,52 +103,92 @@ class InboxRepository:
         priority: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[InboxItemModel], int]:
-        """Get inbox items for a user with optional filters."""
-        query = self.db.query(InboxItemModel).filter(
-            InboxItemModel.user_id == user_id
-        )
+    ) -> tuple[Sequence[Row], int, int]:
+        """
+        Get a page of inbox items for a user, with the total number of
+        matching items and the user's unprocessed count, in one query.
+        Both counts are window functions over all of the user's items, so
+        the unprocessed count ignores the filters. Only the columns are
+        selected, so no ORM instances are built; read the values with
+        row._mapping.
 
-        # Apply filters
+        Args:
+            user_id: User ID
+            status: Comma-separated statuses
+            type: Comma-separated types
+            priority: Comma-separated priorities
+            skip: Number of items to skip
+            limit: Maximum number of items
+
+        Returns:
+            Tuple of (rows newest first, total matching items, unprocessed count)
+        """
+        conditions = []
+
+        # Apply filters (each supports multiple values separated by comma)
         if status:
-            # Support multiple statuses separated by comma
-            statuses = [s.strip() for s in status.split(",")]
-            query = query.filter(InboxItemModel.status.in_(statuses))
+            conditions.append(InboxItemModel.status.in_([s.strip() for s in status.split(",")]))
 
         if type:
-            # Support multiple types separated by comma
-            types = [t.strip() for t in type.split(",")]
-            query = query.filter(InboxItemModel.type.in_(types))
+            conditions.append(InboxItemModel.type.in_([t.strip() for t in type.split(",")]))
 
         if priority:
-            # Support multiple priorities separated by comma
-            priorities = [p.strip() for p in priority.split(",")]
-            query = query.filter(InboxItemModel.priority.in_(priorities))
+            conditions.append(InboxItemModel.priority.in_([p.strip() for p in priority.split(",")]))
 
-        # Get total count before pagination
-        total = query.count()
+        matches = and_(true(), *conditions)
+        counted = (
+            select(
+                *InboxItemModel.__table__.columns,
+                matches.label("matches"),
+                func.count().filter(matches).over().label("total"),
+                func.count().filter(
+                    InboxItemModel.status == InboxStatus.UNPROCESSED.value
+                ).over().label("unprocessed_count"),
+            )
+            .where(InboxItemModel.user_id == user_id)
+            .subquery()
+        )
 
         # Apply sorting and pagination
-        items = (
-            query.order_by(InboxItemModel.created_at.desc())
+        rows = (await self.db.execute(
+            select(counted)
+            .where(counted.c.matches)
+            .order_by(counted.c.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
-        )
+        )).all()
 
-        return items, total
+        if rows:
+            return rows, rows[0].total, rows[0].unprocessed_count
 
-    def update_inbox_item(
+        # Empty page: the window counts came back with no rows, count directly
+        total = (await self.db.execute(
+            select(func.count()).select_from(InboxItemModel).where(
+                InboxItemModel.user_id == user_id, matches
+            )
+        )).scalar_one()
+        return rows, total, await self.get_unprocessed_count(user_id)
+
+    async def update_inbox_item(
         self,
         item_id: UUID,
         user_id: UUID,
+        processed: bool = False,
         **updates,
     ) -> Optional[InboxItemModel]:
-        """Update an inbox item."""
-        item = self.get_inbox_item(item_id, user_id)
-        if not item:
-            return None
+        """
+        Update an inbox item.
+
+        Args:
+            item_id: Inbox item ID
+            user_id: User ID
+            processed: Mark the item processed: processed_at and the
+                user_decision timestamp are set from the database clock
+            **updates: Field values to set (None values are skipped)
 
+        Returns:
+            Updated InboxItemModel or None if not found
+        """
         # Update allowed fields
         allowed_fields = {
             "status",
@@ -133,40 +202,109 @@ class InboxRepository:
             "processed_at",
         }
 
+        changes = {}
         for key, value in updates.items():
             if key in allowed_fields and value is not None:
                 # Convert enums to values if needed
                 if hasattr(value, "value"):
                     value = value.value
-                setattr(item, key, value)
-
-        item.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(item)
-        return item
+                changes[key] = value
 
-    def delete_inbox_item(self, item_id: UUID, user_id: UUID) -> bool:
-        """Delete an inbox item."""
-        item = self.get_inbox_item(item_id, user_id)
-        if not item:
-            return False
+        if processed:
+            changes["processed_at"] = UTC_NOW
+            if "user_decision" in changes:
+                changes["user_decision"] = cast(changes["user_decision"], JSONB).op("||")(
+                    func.jsonb_build_object("timestamp", func.to_char(UTC_NOW, ISO_FORMAT))
+                )
 
-        self.db.delete(item)
-        self.db.commit()
-        return True
+        changes["updated_at"] = UTC_NOW
 
-    def get_unprocessed_count(self, user_id: UUID) -> int:
-        """Get count of unprocessed items for a user."""
-        return (
-            self.db.query(InboxItemModel)
-            .filter(
-                and_(
+        # One UPDATE ... RETURNING; loaded as ORM rows so an item already in
+        # the session gets the new values without another SELECT
+        item = (await self.db.execute(
+            select(InboxItemModel)
+            .from_statement(
+                update(InboxItemModel)
+                .where(
+                    InboxItemModel.id == item_id,
                     InboxItemModel.user_id == user_id,
-                    InboxItemModel.status == InboxStatus.UNPROCESSED.value,
                 )
+                .values(**changes)
+                .returning(InboxItemModel)
+            )
+            .execution_options(populate_existing=True)
+        )).scalars().first()
+        await self.db.commit()
+
+        return item
+
+    async def bulk_update_ai_suggestions(
+        self,
+        updates: Sequence[Tuple[UUID, Dict[str, Any]]],
+        user_id: UUID,
+    ) -> List[InboxItemModel]:
+        """
+        Store AI suggestions for several inbox items in one
+        UPDATE ... FROM (VALUES ...) statement and mark them pending review.
+
+        Args:
+            updates: (item_id, suggestion) pairs
+            user_id: User ID to verify ownership
+
+        Returns:
+            Updated InboxItemModels (unknown or foreign IDs are skipped)
+        """
+        if not updates:
+            return []
+
+        suggestions = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("ai_suggestion", JSONB),
+            name="suggestions",
+        ).data(list(updates))
+
+        statement = (
+            update(InboxItemModel)
+            .where(
+                InboxItemModel.id == suggestions.c.id,
+                InboxItemModel.user_id == user_id,
+            )
+            .values(
+                ai_suggestion=suggestions.c.ai_suggestion,
+                status=InboxStatus.PENDING_REVIEW.value,
+                updated_at=UTC_NOW,
+            )
+            .returning(InboxItemModel)
+        )
+        # Loaded as ORM rows so items already in the session get the new values
+        items = list((await self.db.execute(
+            select(InboxItemModel)
+            .from_statement(statement)
+            .execution_options(populate_existing=True)
+        )).scalars().all())
+        await self.db.commit()
+
+        return items
+
+    async def delete_inbox_item(self, item_id: UUID, user_id: UUID) -> bool:
+        """Delete an inbox item owned by a user in a single DELETE statement."""
+        result = await self.db.execute(
+            delete(InboxItemModel).where(
+                InboxItemModel.id == item_id,
+                InboxItemModel.user_id == user_id,
             )
-            .count()
         )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def get_unprocessed_count(self, user_id: UUID) -> int:
+        """Get count of unprocessed items for a user."""
+        return (await self.db.execute(
+            select(func.count()).select_from(InboxItemModel).where(
+                InboxItemModel.user_id == user_id,
+                InboxItemModel.status == InboxStatus.UNPROCESSED.value,
+            )
+        )).scalar_one()
 
     def _model_to_entity(self, model: InboxItemModel) -> InboxItem:
         """Convert database model to domain entity."""
@@ -9,6 +9,7 @@ from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy import desc, or_, and_
 
 from app.infrastructure.database.models import NoteModel, NoteGroupModel, NoteItemModel
+from app.infrastructure.database.queries import uuid_in
 from app.domain.entities.note import Note, NoteItem
 from app.domain.entities.note_group import NoteGroup
 
@@ -120,8 +121,13 @@ class NoteRepository:
         is_checklist: bool = False,
         group_id: Optional[UUID] = None,
         categories: Optional[List[str]] = None,
+        commit: bool = True,
     ) -> NoteModel:
-        """Create a new note."""
+        """
+        Create a new note.
+        With commit=False the note is only flushed (so its ID is assigned)
+        and is committed together with the caller's other writes.
+        """
         note = NoteModel(
             user_id=user_id,
             group_id=group_id,
@@ -134,6 +140,10 @@ class NoteRepository:
         )
 
         self.db.add(note)
+        if not commit:
+            self.db.flush()
+            return note
+
         self.db.commit()
         self.db.refresh(note)
 
@@ -159,6 +169,19 @@ class NoteRepository:
 
         return query.first()
 
+    def get_notes_by_ids(self, note_ids: List[UUID], user_id: UUID) -> List[NoteModel]:
+        """Get several (not deleted) notes by ID in one query."""
+        if not note_ids:
+            return []
+
+        return (
+            self.db.query(NoteModel)
+            .filter(uuid_in(NoteModel.id, note_ids))
+            .filter(NoteModel.user_id == user_id)
+            .filter(NoteModel.deleted_at.is_(None))
+            .all()
+        )
+
     def get_user_notes(
         self,
         user_id: UUID,
@@ -2,21 +2,42 @@
 Refresh token repository for database operations.
 Part of Infrastructure layer.
 """
+import hashlib
 from datetime import datetime
-from typing import Optional
-from uuid import UUID
-from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import delete, false, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.database.models import RefreshTokenModel
+from app.domain.entities.user import User
+from app.infrastructure.database.models import RefreshTokenModel, UserModel
+from app.infrastructure.repositories.user_repository import UserRepository
+
+
+def hash_token(token: str) -> bytes:
+    """
+    Hash a refresh token for storage and lookup.
+    Only the SHA-256 digest is stored, so a database dump grants no access.
+
+    Args:
+        token: The refresh token string
+
+    Returns:
+        32-byte SHA-256 digest
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 class RefreshTokenRepository:
-    """Repository for refresh token CRUD operations."""
+    """Repository for refresh token CRUD operations (tokens are stored hashed)."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, user_id: UUID, token: str, expires_at: datetime) -> RefreshTokenModel:
+    async def create(
+        self, user_id: UUID, token: str, expires_at: datetime, commit: bool = True
+    ) -> RefreshTokenModel:
         """
         Create a new refresh token.
 
@@ -24,22 +45,24 @@ class RefreshTokenRepository:
             user_id: User ID
             token: The refresh token string
             expires_at: When the token expires
+            commit: Commit immediately (False to batch with other writes)
 
         Returns:
             Created RefreshTokenModel
         """
         db_token = RefreshTokenModel(
             user_id=user_id,
-            token=token,
+            token_hash=hash_token(token),
             expires_at=expires_at,
             revoked=False,
         )
         self.db.add(db_token)
-        self.db.commit()
-        self.db.refresh(db_token)
+        if commit:
+            await self.db.commit()
+            await self.db.refresh(db_token)
         return db_token
 
-    def get_by_token(self, token: str) -> Optional[RefreshTokenModel]:
+    async def get_by_token(self, token: str) -> Optional[RefreshTokenModel]:
         """
         Get refresh token by token string.
 
@@ -49,11 +72,12 @@ class RefreshTokenRepository:
         Returns:
             RefreshTokenModel if found, None otherwise
         """
-        return self.db.query(RefreshTokenModel).filter(
-            RefreshTokenModel.token == token
-        ).first()
+        result = await self.db.execute(
+            select(RefreshTokenModel).where(RefreshTokenModel.token_hash == hash_token(token))
+        )
+        return result.scalar_one_or_none()
 
-    def get_valid_token(self, token: str) -> Optional[RefreshTokenModel]:
+    async def get_valid_token(self, token: str) -> Optional[RefreshTokenModel]:
         """
         Get a valid (not expired, not revoked) refresh token.
 
@@ -63,13 +87,132 @@ class RefreshTokenRepository:
         Returns:
             RefreshTokenModel if valid, None otherwise
         """
-        return self.db.query(RefreshTokenModel).filter(
-            RefreshTokenModel.token == token,
-            RefreshTokenModel.revoked == False,
-            RefreshTokenModel.expires_at > datetime.utcnow(),
-        ).first()
+        result = await self.db.execute(
+            select(RefreshTokenModel).where(
+                RefreshTokenModel.token_hash == hash_token(token),
+                RefreshTokenModel.revoked == False,
+                RefreshTokenModel.expires_at > datetime.utcnow(),
+            )
+        )
+        return result.scalar_one_or_none()
 
-    def revoke(self, token: str) -> bool:
+    async def get_valid_token_with_user(self, token: str) -> Optional[Tuple[UUID, User]]:
+        """
+        Get a valid refresh token together with its user in one query (JOIN).
+
+        Args:
+            token: The refresh token string
+
+        Returns:
+            Tuple of (token_id, User) if valid, None otherwise
+        """
+        result = await self.db.execute(
+            select(RefreshTokenModel.id, UserModel)
+            .join(UserModel, UserModel.id == RefreshTokenModel.user_id)
+            .where(
+                RefreshTokenModel.token_hash == hash_token(token),
+                RefreshTokenModel.revoked == False,
+                RefreshTokenModel.expires_at > datetime.utcnow(),
+            )
+        )
+        row = result.first()
+        if not row:
+            return None
+        return row[0], UserRepository._to_domain(row[1])
+
+    async def create_with_user(self, user: User, token: str, expires_at: datetime) -> bool:
+        """
+        Insert a new user and their first refresh token in a single statement
+        (INSERT ... ON CONFLICT DO NOTHING RETURNING inside a CTE feeding the INSERT).
+        Commits on success.
+
+        Args:
+            user: User domain entity to insert
+            token: The refresh token string
+            expires_at: When the token expires
+
+        Returns:
+            True if created, False if a user with this email already exists
+        """
+        inserted = (
+            insert(UserModel)
+            .values(
+                id=user.id,
+                email=user.email,
+                full_name=user.full_name,
+                provider=user.provider,
+                hashed_password=user.hashed_password,
+                photo_url=user.photo_url,
+                is_active=user.is_active,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+            )
+            .on_conflict_do_nothing(index_elements=[UserModel.email])
+            .returning(UserModel.id)
+            .cte("inserted_user")
+        )
+        stmt = (
+            insert(RefreshTokenModel)
+            .from_select(
+                ["id", "user_id", "token_hash", "expires_at", "revoked", "created_at"],
+                select(
+                    literal(uuid4(), RefreshTokenModel.id.type),
+                    inserted.c.id,
+                    literal(hash_token(token), RefreshTokenModel.token_hash.type),
+                    literal(expires_at, RefreshTokenModel.expires_at.type),
+                    false(),
+                    literal(datetime.utcnow(), RefreshTokenModel.created_at.type),
+                ),
+                include_defaults=False,
+            )
+            .returning(RefreshTokenModel.user_id)
+        )
+        created = (await self.db.execute(stmt)).first() is not None
+        await self.db.commit()
+        return created
+
+    async def rotate(self, token_id: UUID, new_token: str, expires_at: datetime) -> bool:
+        """
+        Revoke a refresh token and store its replacement in a single statement
+        (UPDATE ... RETURNING inside a CTE feeding the INSERT).
+        Commits on success.
+
+        Args:
+            token_id: ID of the refresh token being replaced
+            new_token: The new refresh token string
+            expires_at: When the new token expires
+
+        Returns:
+            True if rotated, False if the old token was already revoked
+        """
+        revoked = (
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.id == token_id, RefreshTokenModel.revoked == False)
+            .values(revoked=True)
+            .returning(RefreshTokenModel.user_id)
+            .cte("revoked")
+        )
+        stmt = (
+            insert(RefreshTokenModel)
+            .from_select(
+                ["id", "user_id", "token_hash", "expires_at", "revoked", "created_at"],
+                select(
+                    literal(uuid4(), RefreshTokenModel.id.type),
+                    revoked.c.user_id,
+                    literal(hash_token(new_token), RefreshTokenModel.token_hash.type),
+                    literal(expires_at, RefreshTokenModel.expires_at.type),
+                    false(),
+                    literal(datetime.utcnow(), RefreshTokenModel.created_at.type),
+                ),
+                include_defaults=False,
+            )
+            .returning(RefreshTokenModel.id)
+        )
+        rotated = (await self.db.execute(stmt)).first() is not None
+        await self.db.commit()
+        return rotated
+
+    async def revoke(self, token: str) -> bool:
         """
         Revoke a refresh token.
 
@@ -79,14 +222,14 @@ class RefreshTokenRepository:
         Returns:
             True if revoked, False if not found
         """
-        db_token = self.get_by_token(token)
+        db_token = await self.get_by_token(token)
         if db_token:
             db_token.revoked = True
-            self.db.commit()
+            await self.db.commit()
             return True
         return False
 
-    def revoke_all_for_user(self, user_id: UUID) -> int:
+    async def revoke_all_for_user(self, user_id: UUID) -> int:
         """
         Revoke all refresh tokens for a user (e.g., on password change or logout all).
 
@@ -96,22 +239,26 @@ class RefreshTokenRepository:
         Returns:
             Number of tokens revoked
         """
-        result = self.db.query(RefreshTokenModel).filter(
-            RefreshTokenModel.user_id == user_id,
-            RefreshTokenModel.revoked == False,
-        ).update({"revoked": True})
-        self.db.commit()
-        return result
+        result = await self.db.execute(
+            update(RefreshTokenModel)
+            .where(
+                RefreshTokenModel.user_id == user_id,
+                RefreshTokenModel.revoked == False,
+            )
+            .values(revoked=True)
+        )
+        await self.db.commit()
+        return result.rowcount
 
-    def cleanup_expired(self) -> int:
+    async def cleanup_expired(self) -> int:
         """
         Delete all expired tokens (housekeeping).
 
         Returns:
             Number of tokens deleted
         """
-        result = self.db.query(RefreshTokenModel).filter(
-            RefreshTokenModel.expires_at < datetime.utcnow(),
-        ).delete()
-        self.db.commit()
-        return result
+        result = await self.db.execute(
+            delete(RefreshTokenModel).where(RefreshTokenModel.expires_at < datetime.utcnow())
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, or_
 
 from app.infrastructure.database.models import TaskModel
+from app.infrastructure.database.queries import uuid_in
 from app.domain.entities.task import Task
 
 
@@ -28,6 +29,7 @@ class TaskRepository:
         status: str = "new",
         status_description: Optional[str] = None,
         tags: Optional[List[str]] = None,
+        commit: bool = True,
     ) -> TaskModel:
         """
         Create a new task.
@@ -42,6 +44,8 @@ class TaskRepository:
             status: Status
             status_description: Status description with annotations
             tags: List of tags
+            commit: Commit immediately (False to only flush, so the ID and
+                task number are assigned, and batch with other writes)
 
         Returns:
             Created TaskModel
@@ -59,6 +63,12 @@ class TaskRepository:
         )
 
         self.db.add(task)
+        if not commit:
+            self.db.flush()
+            # The sequence-generated number is not returned by the INSERT
+            self.db.refresh(task, ["task_number"])
+            return task
+
         self.db.commit()
         self.db.refresh(task)
 
@@ -88,6 +98,27 @@ class TaskRepository:
 
         return query.first()
 
+    def get_tasks_by_ids(self, task_ids: List[UUID], user_id: UUID) -> List[TaskModel]:
+        """
+        Get several tasks by ID in one query (one array parameter).
+
+        Args:
+            task_ids: Task IDs
+            user_id: User ID to verify ownership
+
+        Returns:
+            List of TaskModel (unknown or foreign IDs are skipped)
+        """
+        if not task_ids:
+            return []
+
+        return (
+            self.db.query(TaskModel)
+            .filter(uuid_in(TaskModel.id, task_ids))
+            .filter(TaskModel.user_id == user_id)
+            .all()
+        )
+
     def get_task_by_number(
         self,
         task_number: int,
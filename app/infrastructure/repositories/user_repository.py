@@ -2,24 +2,29 @@
 User repository for database operations.
 Part of Infrastructure layer.
 """
-from typing import Optional
+import secrets
+from datetime import datetime
+from typing import Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.domain.entities.user import User
-from app.infrastructure.database.models import UserModel
+from app.infrastructure.database.models import UserModel, UserPhotoModel
 
 
 class UserRepository:
     """
     Repository for User entity database operations.
     Implements the repository pattern for User domain entities.
+    Uses an AsyncSession so database I/O never blocks the event loop.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, user: User) -> User:
+    async def create(self, user: User) -> User:
         """
         Create a new user in the database.
 
@@ -46,14 +51,14 @@ class UserRepository:
 
         try:
             self.db.add(db_user)
-            self.db.commit()
-            self.db.refresh(db_user)
+            await self.db.commit()
+            await self.db.refresh(db_user)
             return self._to_domain(db_user)
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError(f"User with email {user.email} already exists")
 
-    def get_by_id(self, user_id: UUID) -> Optional[User]:
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """
         Get user by ID.
 
@@ -63,10 +68,11 @@ class UserRepository:
         Returns:
             User domain entity if found, None otherwise
         """
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        result = await self.db.execute(select(UserModel).where(UserModel.id == user_id))
+        db_user = result.scalar_one_or_none()
         return self._to_domain(db_user) if db_user else None
 
-    def get_by_email(self, email: str) -> Optional[User]:
+    async def get_by_email(self, email: str) -> Optional[User]:
         """
         Get user by email address.
 
@@ -76,14 +82,64 @@ class UserRepository:
         Returns:
             User domain entity if found, None otherwise
         """
-        db_user = (
-            self.db.query(UserModel)
-            .filter(UserModel.email == email.lower().strip())
-            .first()
+        result = await self.db.execute(
+            select(UserModel).where(UserModel.email == email.lower().strip())
         )
+        db_user = result.scalar_one_or_none()
         return self._to_domain(db_user) if db_user else None
 
-    def update(self, user: User) -> User:
+    async def get_auth_projection(self, email: str) -> Optional[User]:
+        """
+        Get the columns needed to authenticate a user by email.
+        Skips the onboarding/verification columns; those fields keep their
+        entity defaults, so the result must only be used for login.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            Partially populated User domain entity if found, None otherwise
+        """
+        row = (await self.db.execute(
+            select(
+                UserModel.id,
+                UserModel.email,
+                UserModel.full_name,
+                UserModel.provider,
+                UserModel.hashed_password,
+                UserModel.is_active,
+                UserModel.photo_url,
+                UserModel.created_at,
+                UserModel.updated_at,
+            ).where(UserModel.email == email.lower().strip())
+        )).first()
+        return User(**row._mapping) if row else None
+
+    async def get_onboarding_status(self, user_id: UUID) -> Optional[Row]:
+        """
+        Get the onboarding columns of a user as one row, without building
+        an ORM object or a User entity.
+
+        Args:
+            user_id: User's UUID
+
+        Returns:
+            Row with email, email_verified, inbox_prefix, inbox_verified,
+            phone_number, phone_verified and onboarding_completed, or None
+        """
+        return (await self.db.execute(
+            select(
+                UserModel.email,
+                UserModel.email_verified,
+                UserModel.inbox_prefix,
+                UserModel.inbox_verified,
+                UserModel.phone_number,
+                UserModel.phone_verified,
+                UserModel.onboarding_completed,
+            ).where(UserModel.id == user_id)
+        )).first()
+
+    async def update(self, user: User) -> User:
         """
         Update an existing user.
 
@@ -93,7 +149,8 @@ class UserRepository:
         Returns:
             Updated user domain entity
         """
-        db_user = self.db.query(UserModel).filter(UserModel.id == user.id).first()
+        result = await self.db.execute(select(UserModel).where(UserModel.id == user.id))
+        db_user = result.scalar_one_or_none()
         if not db_user:
             raise ValueError(f"User with ID {user.id} not found")
 
@@ -103,11 +160,72 @@ class UserRepository:
         db_user.is_active = user.is_active
         db_user.updated_at = user.updated_at
 
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
         return self._to_domain(db_user)
 
-    def delete(self, user_id: UUID) -> bool:
+    async def update_password(self, user_id: UUID, hashed_password: str, commit: bool = True) -> bool:
+        """
+        Replace a user's password hash.
+
+        Args:
+            user_id: User's UUID
+            hashed_password: New password hash
+            commit: Commit immediately (False to batch with other writes)
+
+        Returns:
+            True if updated, False if not found
+        """
+        result = await self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(hashed_password=hashed_password)
+        )
+        if commit:
+            await self.db.commit()
+        return result.rowcount > 0
+
+    async def save_photo(self, user_id: UUID, content_type: str, data: bytes) -> str:
+        """
+        Store (or replace) a user's profile photo bytes.
+        Every upload gets a new random token, so earlier photo URLs stop working.
+
+        Args:
+            user_id: User's UUID
+            content_type: Image MIME type
+            data: Raw image bytes
+
+        Returns:
+            The photo's token for GET /auth/photo/{token}
+        """
+        token = secrets.token_urlsafe(24)
+        values = {"content_type": content_type, "data": data, "token": token, "updated_at": datetime.utcnow()}
+        stmt = (
+            insert(UserPhotoModel)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_update(index_elements=[UserPhotoModel.user_id], set_=values)
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+        return token
+
+    async def get_photo(self, token: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Get a profile photo by its token.
+
+        Args:
+            token: Photo token from save_photo
+
+        Returns:
+            Tuple of (content_type, bytes) if found, None otherwise
+        """
+        row = (await self.db.execute(
+            select(UserPhotoModel.content_type, UserPhotoModel.data)
+            .where(UserPhotoModel.token == token)
+        )).first()
+        return (row.content_type, row.data) if row else None
+
+    async def delete(self, user_id: UUID) -> bool:
         """
         Delete a user (hard delete).
 
@@ -117,15 +235,16 @@ class UserRepository:
         Returns:
             True if deleted, False if not found
         """
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        result = await self.db.execute(select(UserModel).where(UserModel.id == user_id))
+        db_user = result.scalar_one_or_none()
         if not db_user:
             return False
 
-        self.db.delete(db_user)
-        self.db.commit()
+        await self.db.delete(db_user)
+        await self.db.commit()
         return True
 
-    def exists_by_email(self, email: str) -> bool:
+    async def exists_by_email(self, email: str) -> bool:
         """
         Check if a user with the given email exists.
 
@@ -135,12 +254,10 @@ class UserRepository:
         Returns:
             True if user exists, False otherwise
         """
-        return (
-            self.db.query(UserModel)
-            .filter(UserModel.email == email.lower().strip())
-            .first()
-            is not None
+        result = await self.db.execute(
+            select(UserModel.id).where(UserModel.email == email.lower().strip())
         )
+        return result.first() is not None
 
     @staticmethod
     def _to_domain(db_user: UserModel) -> User:
@@ -2,11 +2,71 @@
 Claude AI service - Anthropic API integration.
 Part of Infrastructure layer.
 """
+import asyncio
 import httpx
-import json
+import orjson
+from functools import lru_cache
 from typing import List, Dict, Optional, AsyncIterator, Any
 from app.core.config import settings
 
+# Prompt caching: a cache_control marker ends a cacheable prefix
+# (tools -> system -> messages); the API allows at most 4 per request
+CACHE_CONTROL_EPHEMERAL = {"type": "ephemeral"}
+MAX_CACHE_BREAKPOINTS = 4
+PROMPT_CACHING_BETA = "prompt-caching-2024-07-31"
+
+
+class ClaudeAPIError(Exception):
+    """The Claude API answered with a non-200 status."""
+
+
+# Shared HTTP client (created lazily): keeps TLS connections to the API alive
+# across requests
+_http_client: Optional[httpx.AsyncClient] = None
+# Caps concurrent API requests per process (created lazily)
+_request_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the HTTP client shared by all Claude requests."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+def get_request_semaphore() -> asyncio.Semaphore:
+    """Get or create the semaphore limiting concurrent Claude requests."""
+    global _request_semaphore
+    if _request_semaphore is None:
+        _request_semaphore = asyncio.Semaphore(settings.CLAUDE_CONCURRENCY)
+    return _request_semaphore
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (application shutdown)."""
+    global _http_client, _request_semaphore
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    _request_semaphore = None
+
+
+@lru_cache(maxsize=32)
+def _encoded_prompt(system_prompt: str, cache_prompt: bool) -> orjson.Fragment:
+    """
+    Get the JSON for a static system prompt, encoded once per prompt.
+    With caching it is the cached text block, otherwise the plain string.
+    """
+    if cache_prompt:
+        return orjson.Fragment(orjson.dumps(
+            {"type": "text", "text": system_prompt, "cache_control": CACHE_CONTROL_EPHEMERAL}
+        ))
+    return orjson.Fragment(orjson.dumps(system_prompt))
+
 
 class ClaudeService:
     """
@@ -18,6 +78,70 @@ class ClaudeService:
     DEFAULT_MODEL = "claude-3-haiku-20240307"
     DEFAULT_MAX_TOKENS = 4096
 
+    # System prompts per conversation mode (built once, at class definition)
+    SYSTEM_PROMPTS = {
+        "chat": """Je bent PAI, een slimme Nederlandse persoonlijke assistent.
+
+Je helpt met:
+- Agenda beheer via Google/Microsoft Calendar
+- Notities maken en organiseren
+- Documenten scannen en verwerken
+- Algemene vragen beantwoorden
+
+KRITIEKE REGELS VOOR ACTIES:
+- Als de gebruiker een afspraak, meeting, evenement of herinnering wil maken: VERPLICHT gebruik de 'create_calendar_event' of 'create_reminder' tool
+- NOOIT een fake success message geven zonder daadwerkelijk een tool uit te voeren
+- Als je niet 100% zeker weet wat de gebruiker bedoelt: VRAAG OM VERDUIDELIJKING, voer GEEN actie uit
+- Als datums/tijden onduidelijk zijn: VRAAG SPECIFIEK naar datum en tijd voordat je de tool gebruikt
+- Gebruik de tools ALTIJD voor agenda-gerelateerde acties, ongeacht of de gebruiker een # commando gebruikt of niet
+
+Andere regels:
+- Antwoord altijd in het Nederlands tenzij gevraagd anders
+- Wees vriendelijk, behulpzaam en to-the-point
+- Als iets onduidelijk is, stel dan verduidelijkende vragen
+
+Beschikbare commando's (optioneel):
+- #calendar - Voor afspraken en agenda
+- #note - Voor notities maken
+- #scan - Voor documenten scannen
+""",
+        "voice": """Je bent PAI, een slimme Nederlandse spraakassistent.
+
+Optimaliseer antwoorden voor spraak:
+- Korte, duidelijke zinnen
+- Geen opsommingen met bullets
+- Gebruik natuurlijke taal
+- Vraag om bevestiging bij belangrijke acties
+
+Je helpt met agenda, notities, documenten en algemene vragen.
+""",
+        "note": """Je bent PAI in notitie-modus.
+
+Help gebruikers met:
+- Notities structureren en organiseren
+- Belangrijke punten samenvatten
+- Tags en categorieën voorstellen
+- Actiepunten identificeren
+""",
+        "scan": """Je bent PAI in scan-modus.
+
+Help gebruikers met:
+- Documenten analyseren
+- Tekst extraheren en structureren
+- Belangrijke informatie identificeren
+- Samenvatten van gescande content
+""",
+    }
+
+    _instance: Optional["ClaudeService"] = None
+
+    @classmethod
+    def instance(cls) -> "ClaudeService":
+        """Get the process-wide service for the configured API key."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.ANTHROPIC_API_KEY
         if not self.api_key:
@@ -29,75 +153,192 @@ class ClaudeService:
             "content-type": "application/json",
         }
 
-    def get_calendar_tools(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def build_system(
+        system_prompt: Optional[str],
+        dynamic_context: Optional[str] = None,
+        cache_prompt: bool = False,
+    ) -> Optional[Any]:
         """
-        Define calendar tools for Anthropic Tool Use.
-        Claude can call these tools to create calendar events and reminders.
+        Build the request's system field.
+        With caching, the static prompt is its own cached block and the
+        dynamic context (e.g. the current date) follows uncached.
+
+        Args:
+            system_prompt: Static system prompt
+            dynamic_context: Optional text appended to the system prompt
+            cache_prompt: Mark the static prompt as a cache breakpoint
+
+        Returns:
+            System string, list of system blocks, or None
         """
-        return [
-            {
-                "name": "create_calendar_event",
-                "description": "Maak een nieuwe afspraak in de agenda van de gebruiker. Gebruik dit wanneer de gebruiker vraagt om een afspraak, meeting, evenement of activiteit in te plannen.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "title": {
-                            "type": "string",
-                            "description": "Titel van de afspraak (bijv. 'Lunch met vis', 'Vergadering met team')"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "Starttijd in ISO 8601 formaat (bijv. '2025-11-16T12:00:00'). Gebruik de huidige datum/tijd als referentie voor relatieve tijden."
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "Eindtijd in ISO 8601 formaat (bijv. '2025-11-16T13:00:00')"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Optionele beschrijving van de afspraak"
-                        },
-                        "location": {
-                            "type": "string",
-                            "description": "Optionele locatie van de afspraak"
-                        },
-                        "provider": {
-                            "type": "string",
-                            "description": "VERPLICHT als de gebruiker een specifieke kalender noemt! 'google' als gebruiker zegt: google, gcal, google calendar, google agenda. 'microsoft' als gebruiker zegt: microsoft, outlook, o365, office 365, office agenda. LAAT LEEG als gebruiker geen provider noemt.",
-                            "enum": ["google", "microsoft"]
-                        }
+        if not cache_prompt:
+            if dynamic_context:
+                return f"{system_prompt or ''}\n{dynamic_context}"
+            return system_prompt
+
+        blocks = []
+        if system_prompt:
+            blocks.append({"type": "text", "text": system_prompt, "cache_control": CACHE_CONTROL_EPHEMERAL})
+        if dynamic_context:
+            blocks.append({"type": "text", "text": dynamic_context})
+        return blocks or None
+
+    @staticmethod
+    def encode_system(
+        system_prompt: Optional[str],
+        dynamic_context: Optional[str] = None,
+        cache_prompt: bool = False,
+    ) -> Optional[Any]:
+        """
+        Build the request's system field like build_system, with the static
+        prompt as pre-encoded JSON, so it is serialized once per prompt
+        instead of on every request.
+
+        Args:
+            system_prompt: Static system prompt
+            dynamic_context: Optional text appended to the system prompt
+            cache_prompt: Mark the static prompt as a cache breakpoint
+
+        Returns:
+            System field for an orjson-encoded request body, or None
+        """
+        if not system_prompt or (dynamic_context and not cache_prompt):
+            # Nothing static to reuse: the prompt is missing or merged
+            return ClaudeService.build_system(system_prompt, dynamic_context, cache_prompt)
+
+        static = _encoded_prompt(system_prompt, cache_prompt)
+        if not cache_prompt:
+            return static
+        if dynamic_context:
+            return [static, {"type": "text", "text": dynamic_context}]
+        return [static]
+
+    @staticmethod
+    def with_cache_breakpoints(
+        messages: List[Dict[str, Any]],
+        max_breakpoints: int = MAX_CACHE_BREAKPOINTS - 1,
+        interval: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mark the stable part of a conversation history as cacheable.
+        The second-to-last message (the history before the new turn) gets a
+        breakpoint, plus one every `interval` messages before it, newest
+        first, up to max_breakpoints. The input list is not modified.
+
+        Args:
+            messages: Messages in Claude format
+            max_breakpoints: Breakpoints to use (one is left for the system prompt)
+            interval: Messages between extra checkpoints
+
+        Returns:
+            New message list with cache_control on the chosen messages
+        """
+        last_stable = len(messages) - 2
+        if last_stable < 0 or max_breakpoints <= 0:
+            return messages
+
+        marked = {last_stable}
+        index = (last_stable // interval) * interval - 1
+        while len(marked) < max_breakpoints and index >= 0:
+            if index != last_stable:
+                marked.add(index)
+            index -= interval
+
+        result = list(messages)
+        for index in marked:
+            message = result[index]
+            content = message["content"]
+            if isinstance(content, str):
+                blocks = [{"type": "text", "text": content}]
+            else:
+                blocks = [dict(block) for block in content]
+            if not blocks:
+                continue
+            blocks[-1]["cache_control"] = CACHE_CONTROL_EPHEMERAL
+            result[index] = {**message, "content": blocks}
+        return result
+
+    def _request_headers(self, cache_prompt: bool) -> Dict[str, str]:
+        """Get the request headers, with the prompt caching beta when caching."""
+        if not cache_prompt:
+            return self.headers
+        return {**self.headers, "anthropic-beta": PROMPT_CACHING_BETA}
+
+    # Calendar tools for Anthropic Tool Use (built once, at class definition;
+    # identical bytes every request keep the cached prompt prefix valid)
+    CALENDAR_TOOLS: List[Dict[str, Any]] = [
+        {
+            "name": "create_calendar_event",
+            "description": "Maak een nieuwe afspraak in de agenda van de gebruiker. Gebruik dit wanneer de gebruiker vraagt om een afspraak, meeting, evenement of activiteit in te plannen.",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "title": {
+                        "type": "string",
+                        "description": "Titel van de afspraak (bijv. 'Lunch met vis', 'Vergadering met team')"
                     },
-                    "required": ["title", "start_time", "end_time"]
-                }
-            },
-            {
-                "name": "create_reminder",
-                "description": "Maak een herinnering voor de gebruiker. Gebruik dit voor taken of acties die op een specifiek moment moeten gebeuren. Herinneringen zijn 5 minuten lang.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "title": {
-                            "type": "string",
-                            "description": "Titel van de herinnering (zonder emoji - die wordt automatisch toegevoegd)"
-                        },
-                        "reminder_time": {
-                            "type": "string",
-                            "description": "Tijdstip van de herinnering in ISO 8601 formaat (bijv. '2025-11-16T18:00:00')"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Optionele beschrijving"
-                        },
-                        "provider": {
-                            "type": "string",
-                            "description": "VERPLICHT als de gebruiker een specifieke kalender noemt! 'google' als gebruiker zegt: google, gcal, google calendar, google agenda. 'microsoft' als gebruiker zegt: microsoft, outlook, o365, office 365, office agenda. LAAT LEEG als gebruiker geen provider noemt.",
-                            "enum": ["google", "microsoft"]
-                        }
+                    "start_time": {
+                        "type": "string",
+                        "description": "Starttijd in ISO 8601 formaat (bijv. '2025-11-16T12:00:00'). Gebruik de huidige datum/tijd als referentie voor relatieve tijden."
                     },
-                    "required": ["title", "reminder_time"]
-                }
+                    "end_time": {
+                        "type": "string",
+                        "description": "Eindtijd in ISO 8601 formaat (bijv. '2025-11-16T13:00:00')"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Optionele beschrijving van de afspraak"
+                    },
+                    "location": {
+                        "type": "string",
+                        "description": "Optionele locatie van de afspraak"
+                    },
+                    "provider": {
+                        "type": "string",
+                        "description": "VERPLICHT als de gebruiker een specifieke kalender noemt! 'google' als gebruiker zegt: google, gcal, google calendar, google agenda. 'microsoft' als gebruiker zegt: microsoft, outlook, o365, office 365, office agenda. LAAT LEEG als gebruiker geen provider noemt.",
+                        "enum": ["google", "microsoft"]
+                    }
+                },
+                "required": ["title", "start_time", "end_time"]
             }
-        ]
+        },
+        {
+            "name": "create_reminder",
+            "description": "Maak een herinnering voor de gebruiker. Gebruik dit voor taken of acties die op een specifiek moment moeten gebeuren. Herinneringen zijn 5 minuten lang.",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "title": {
+                        "type": "string",
+                        "description": "Titel van de herinnering (zonder emoji - die wordt automatisch toegevoegd)"
+                    },
+                    "reminder_time": {
+                        "type": "string",
+                        "description": "Tijdstip van de herinnering in ISO 8601 formaat (bijv. '2025-11-16T18:00:00')"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Optionele beschrijving"
+                    },
+                    "provider": {
+                        "type": "string",
+                        "description": "VERPLICHT als de gebruiker een specifieke kalender noemt! 'google' als gebruiker zegt: google, gcal, google calendar, google agenda. 'microsoft' als gebruiker zegt: microsoft, outlook, o365, office 365, office agenda. LAAT LEEG als gebruiker geen provider noemt.",
+                        "enum": ["google", "microsoft"]
+                    }
+                },
+                "required": ["title", "reminder_time"]
+            }
+        }
+    ]
+
+    def get_calendar_tools(self) -> List[Dict[str, Any]]:
+        """
+        Get the calendar tools for Anthropic Tool Use.
+        Claude can call these tools to create calendar events and reminders.
+        The shared list is returned; callers must not modify it.
+        """
+        return self.CALENDAR_TOOLS
 
     async def send_message(
         self,
@@ -106,6 +347,7 @@ class ClaudeService:
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: float = 1.0,
+        cache_prompt: bool = False,
     ) -> Dict:
         """
         Send a message to Claude and get response.
@@ -116,6 +358,7 @@ class ClaudeService:
             model: Claude model to use
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (0.0 to 1.0)
+            cache_prompt: Cache the system prompt and conversation history
 
         Returns:
             Response dict with content, stop_reason, usage, etc.
@@ -126,25 +369,26 @@ class ClaudeService:
         body = {
             "model": model or self.DEFAULT_MODEL,
             "max_tokens": max_tokens or self.DEFAULT_MAX_TOKENS,
-            "messages": messages,
+            "messages": self.with_cache_breakpoints(messages) if cache_prompt else messages,
             "temperature": temperature,
         }
 
-        if system_prompt:
-            body["system"] = system_prompt
+        system = self.encode_system(system_prompt, cache_prompt=cache_prompt)
+        if system:
+            body["system"] = system
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
+        async with get_request_semaphore():
+            response = await get_http_client().post(
                 self.API_URL,
-                headers=self.headers,
-                json=body,
+                headers=self._request_headers(cache_prompt),
+                content=orjson.dumps(body),
             )
 
             if response.status_code != 200:
                 error_detail = response.text
-                raise Exception(f"Claude API error ({response.status_code}): {error_detail}")
+                raise ClaudeAPIError(f"Claude API error ({response.status_code}): {error_detail}")
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return data
 
     async def send_message_stream(
@@ -155,6 +399,8 @@ class ClaudeService:
         max_tokens: Optional[int] = None,
         temperature: float = 1.0,
         tools: Optional[List[Dict[str, Any]]] = None,
+        system_context: Optional[str] = None,
+        cache_prompt: bool = False,
     ) -> AsyncIterator[Dict[str, Any]]:
         """
         Send a message to Claude and stream response.
@@ -166,6 +412,9 @@ class ClaudeService:
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature
             tools: Optional list of tools for function calling
+            system_context: Optional text appended to the system prompt
+                (kept out of the cached prefix)
+            cache_prompt: Cache the tools, system prompt and conversation history
 
         Yields:
             Dict with event type and data (text chunks or tool use)
@@ -176,27 +425,28 @@ class ClaudeService:
         body = {
             "model": model or self.DEFAULT_MODEL,
             "max_tokens": max_tokens or self.DEFAULT_MAX_TOKENS,
-            "messages": messages,
+            "messages": self.with_cache_breakpoints(messages) if cache_prompt else messages,
             "temperature": temperature,
             "stream": True,
         }
 
-        if system_prompt:
-            body["system"] = system_prompt
+        system = self.encode_system(system_prompt, system_context, cache_prompt)
+        if system:
+            body["system"] = system
 
         if tools:
             body["tools"] = tools
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            async with client.stream(
+        async with get_request_semaphore():
+            async with get_http_client().stream(
                 "POST",
                 self.API_URL,
-                headers=self.headers,
-                json=body,
+                headers=self._request_headers(cache_prompt),
+                content=orjson.dumps(body),
             ) as response:
                 if response.status_code != 200:
                     error_detail = await response.aread()
-                    raise Exception(f"Claude API error ({response.status_code}): {error_detail.decode()}")
+                    raise ClaudeAPIError(f"Claude API error ({response.status_code}): {error_detail.decode()}")
 
                 # Parse SSE stream
                 current_tool_use = None
@@ -221,7 +471,7 @@ class ClaudeService:
                             break
 
                         try:
-                            event_data = json.loads(data_str)
+                            event_data = orjson.loads(data_str)
 
                             # Handle different event types
                             event_type = event_data.get("type")
@@ -256,8 +506,8 @@ class ClaudeService:
                                 if current_tool_use:
                                     # Parse complete tool input
                                     try:
-                                        current_tool_use["input"] = json.loads(current_tool_use["input"])
-                                    except json.JSONDecodeError:
+                                        current_tool_use["input"] = orjson.loads(current_tool_use["input"])
+                                    except orjson.JSONDecodeError:
                                         pass
 
                                     # Yield complete tool use
@@ -272,7 +522,7 @@ class ClaudeService:
                             elif event_type == "message_stop":
                                 break
 
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             # Skip malformed JSON
                             continue
 
@@ -286,58 +536,4 @@ class ClaudeService:
         Returns:
             System prompt string
         """
-        prompts = {
-            "chat": """Je bent PAI, een slimme Nederlandse persoonlijke assistent.
-
-Je helpt met:
-- Agenda beheer via Google/Microsoft Calendar
-- Notities maken en organiseren
-- Documenten scannen en verwerken
-- Algemene vragen beantwoorden
-
-KRITIEKE REGELS VOOR ACTIES:
-- Als de gebruiker een afspraak, meeting, evenement of herinnering wil maken: VERPLICHT gebruik de 'create_calendar_event' of 'create_reminder' tool
-- NOOIT een fake success message geven zonder daadwerkelijk een tool uit te voeren
-- Als je niet 100% zeker weet wat de gebruiker bedoelt: VRAAG OM VERDUIDELIJKING, voer GEEN actie uit
-- Als datums/tijden onduidelijk zijn: VRAAG SPECIFIEK naar datum en tijd voordat je de tool gebruikt
-- Gebruik de tools ALTIJD voor agenda-gerelateerde acties, ongeacht of de gebruiker een # commando gebruikt of niet
-
-Andere regels:
-- Antwoord altijd in het Nederlands tenzij gevraagd anders
-- Wees vriendelijk, behulpzaam en to-the-point
-- Als iets onduidelijk is, stel dan verduidelijkende vragen
-
-Beschikbare commando's (optioneel):
-- #calendar - Voor afspraken en agenda
-- #note - Voor notities maken
-- #scan - Voor documenten scannen
-""",
-            "voice": """Je bent PAI, een slimme Nederlandse spraakassistent.
-
-Optimaliseer antwoorden voor spraak:
-- Korte, duidelijke zinnen
-- Geen opsommingen met bullets
-- Gebruik natuurlijke taal
-- Vraag om bevestiging bij belangrijke acties
-
-Je helpt met agenda, notities, documenten en algemene vragen.
-""",
-            "note": """Je bent PAI in notitie-modus.
-
-Help gebruikers met:
-- Notities structureren en organiseren
-- Belangrijke punten samenvatten
-- Tags en categorieën voorstellen
-- Actiepunten identificeren
-""",
-            "scan": """Je bent PAI in scan-modus.
-
-Help gebruikers met:
-- Documenten analyseren
-- Tekst extraheren en structureren
-- Belangrijke informatie identificeren
-- Samenvatten van gescande content
-""",
-        }
-
-        return prompts.get(mode, prompts["chat"])
+        return self.SYSTEM_PROMPTS.get(mode, self.SYSTEM_PROMPTS["chat"])
@@ -3,16 +3,34 @@ Email service using SendGrid.
 Part of Infrastructure layer - external service integration.
 """
 import os
-from sendgrid import SendGridAPIClient
+import httpx
 from sendgrid.helpers.mail import Mail, Email, To, Content
 
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
 
 class EmailService:
     """Service for sending emails via SendGrid."""
 
     def __init__(self):
         self.api_key = os.getenv("SENDGRID_API_KEY")
-        self.client = SendGridAPIClient(self.api_key) if self.api_key else None
+        # One keep-alive client for all sends, so consecutive emails reuse the
+        # TLS connection to SendGrid (SendGridAPIClient opens one per email)
+        self.client = httpx.Client(
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=16),
+        ) if self.api_key else None
+
+    @property
+    def fake(self) -> bool:
+        """Whether emails are only printed (no API key configured)."""
+        return self.client is None
+
+    def close(self) -> None:
+        """Close the HTTP client's connections."""
+        if self.client:
+            self.client.close()
 
     def send_email(
         self,
@@ -35,7 +53,7 @@ class EmailService:
         Returns:
             Dict with success status and details
         """
-        if not self.client:
+        if self.fake:
             # Fallback to fake mode if no API key
             print(f"[FAKE EMAIL - No SendGrid API Key]")
             print(f"From: {from_name} <{from_email}>")
@@ -56,20 +74,27 @@ class EmailService:
                 html_content=Content("text/html", html_content)
             )
 
-            response = self.client.send(message)
+            response = self.client.post(SENDGRID_SEND_URL, json=message.get())
+
+            if response.status_code not in [200, 201, 202]:
+                print(f"[EMAIL ERROR] Failed to send email: HTTP {response.status_code}")
+                print(f"[EMAIL ERROR] Response body: {response.text}")
+                print(f"[EMAIL ERROR] From: {from_email}, To: {to_email}")
+                return {
+                    "success": False,
+                    "status_code": response.status_code,
+                    "error": response.text,
+                    "message": "Failed to send email"
+                }
 
             return {
-                "success": response.status_code in [200, 201, 202],
+                "success": True,
                 "status_code": response.status_code,
                 "message": "Email sent successfully"
             }
 
         except Exception as e:
-            error_body = ""
-            if hasattr(e, 'body'):
-                error_body = e.body
             print(f"[EMAIL ERROR] Failed to send email: {e}")
-            print(f"[EMAIL ERROR] Response body: {error_body}")
             print(f"[EMAIL ERROR] From: {from_email}, To: {to_email}")
             return {
                 "success": False,
@@ -208,3 +233,11 @@ def get_email_service() -> EmailService:
     if _email_service is None:
         _email_service = EmailService()
     return _email_service
+
+
+def close_email_service() -> None:
+    """Close the email service's connections (application shutdown)."""
+    global _email_service
+    if _email_service is not None:
+        _email_service.close()
+        _email_service = None
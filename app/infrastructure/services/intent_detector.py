@@ -101,6 +101,23 @@ class IntentDetector:
         "vrijdag": 4, "zaterdag": 5, "zondag": 6,
     }
 
+    # Fully specified tool requests that can run without a Claude turn.
+    # Anything looser (missing day or time, extra words, a provider mention)
+    # does not match and is left to Claude.
+    _DAY = r"(?P<day>vandaag|morgen|overmorgen|maandag|dinsdag|woensdag|donderdag|vrijdag|zaterdag|zondag)"
+    _TIME = r"(?P<{0}_h>\d{{1,2}})(?:[:.](?P<{0}_m>\d{{2}}))?(?:\s*(?:uur|u))?"
+    REMINDER_PATTERN = re.compile(
+        r"^herinner me\s+" + _DAY + r"\s+om\s+" + _TIME.format("at")
+        + r"\s+(?:aan|om)\s+(?P<title>[^\n]+?)[.!]?$",
+        re.IGNORECASE,
+    )
+    CALENDAR_PATTERN = re.compile(
+        r"^(?:plan|maak|zet)\s+(?:een\s+)?(?P<title>[^\n]+?)\s+(?:op\s+)?" + _DAY
+        + r"\s+(?:om|van)\s+" + _TIME.format("start") + r"\s*(?:tot|-|–)\s*" + _TIME.format("end")
+        + r"[.!]?$",
+        re.IGNORECASE,
+    )
+
     def __init__(self):
         self.tz = ZoneInfo("Europe/Amsterdam")
 
@@ -215,6 +232,90 @@ class IntentDetector:
             needs_claude_extraction=False,
         )
 
+    def detect_tool_call(self, user_input: str) -> Optional[DetectedIntent]:
+        """
+        Detect a fully specified reminder or appointment request whose tool
+        input can be filled in without Claude.
+
+        Args:
+            user_input: Raw chat input
+
+        Returns:
+            DetectedIntent with the tool input as extracted_params (and
+            needs_claude_extraction False), or None when Claude is needed
+        """
+        text = " ".join(user_input.split())
+        if self._detect_provider(text):
+            return None
+        now = datetime.now(self.tz).replace(tzinfo=None)
+
+        match = self.REMINDER_PATTERN.match(text)
+        if match:
+            reminder_time = self._resolve_time(match, "at")
+            if reminder_time is None or reminder_time <= now:
+                return None
+            return DetectedIntent(
+                intent_type=IntentType.CALENDAR_REMINDER,
+                confidence=1.0,
+                source="chat",
+                provider=None,
+                raw_input=user_input,
+                extracted_params={
+                    "title": self._capitalize(match.group("title")),
+                    "reminder_time": reminder_time.isoformat(),
+                },
+                needs_claude_extraction=False,
+            )
+
+        match = self.CALENDAR_PATTERN.match(text)
+        if match:
+            start = self._resolve_time(match, "start")
+            end = self._resolve_time(match, "end")
+            if start is None or end is None or start <= now or end <= start:
+                return None
+            return DetectedIntent(
+                intent_type=IntentType.CALENDAR_CREATE,
+                confidence=1.0,
+                source="chat",
+                provider=None,
+                raw_input=user_input,
+                extracted_params={
+                    "title": self._capitalize(match.group("title")),
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                },
+                needs_claude_extraction=False,
+            )
+
+        return None
+
+    @staticmethod
+    def _capitalize(title: str) -> str:
+        """Capitalize the first letter of a title, leaving the rest as typed."""
+        return title[:1].upper() + title[1:]
+
+    def _resolve_time(self, match: re.Match, name: str) -> Optional[datetime]:
+        """Combine the matched day and the named time into a local datetime."""
+        hour = int(match.group(f"{name}_h"))
+        minute = int(match.group(f"{name}_m") or 0)
+        if hour > 23 or minute > 59:
+            return None
+
+        today = datetime.now(self.tz).date()
+        day = match.group("day").lower()
+        if day == "vandaag":
+            date = today
+        elif day == "morgen":
+            date = today + timedelta(days=1)
+        elif day == "overmorgen":
+            date = today + timedelta(days=2)
+        else:
+            # Next occurrence of this weekday (never today)
+            days_ahead = (self.DAYS_NL[day] - today.weekday()) % 7 or 7
+            date = today + timedelta(days=days_ahead)
+
+        return datetime(date.year, date.month, date.day, hour, minute)
+
     def _detect_provider(self, text: str) -> Optional[str]:
         """Detect if user mentions a specific provider."""
         text_lower = text.lower()
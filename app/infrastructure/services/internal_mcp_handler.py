@@ -14,6 +14,7 @@ from app.application.use_cases.task_use_cases import TaskUseCases
 from app.application.use_cases.note_use_cases import NoteUseCases
 from app.application.use_cases.inbox_use_cases import InboxUseCases
 from app.application.use_cases.person_use_cases import PersonUseCases
+from app.infrastructure.database.session import AsyncSessionLocal
 
 logger = logging.getLogger(__name__)
 
@@ -331,7 +332,6 @@ class InternalMCPHandler:
         self.db = db
         self.task_use_cases = TaskUseCases(db)
         self.note_use_cases = NoteUseCases(db)
-        self.inbox_use_cases = InboxUseCases(db)
         self.person_use_cases = PersonUseCases(db)
 
     @classmethod
@@ -676,11 +676,13 @@ class InternalMCPHandler:
 
     async def _list_inbox(self, params: Dict[str, Any], user_id: UUID) -> Dict[str, Any]:
         """List inbox items."""
-        result = self.inbox_use_cases.get_inbox_items(
-            user_id=user_id,
-            status=params.get("status"),
-            limit=params.get("limit", 20),
-        )
+        # Inbox use cases are async and need their own async session
+        async with AsyncSessionLocal() as db:
+            result = await InboxUseCases(db).get_inbox_items(
+                user_id=user_id,
+                status=params.get("status"),
+                limit=params.get("limit", 20),
+            )
         return {
             "success": True,
             "data": {
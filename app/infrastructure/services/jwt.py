@@ -6,10 +6,34 @@ from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from uuid import UUID
 import secrets
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from app.core.config import settings
 
 
+def _build_keys() -> Tuple[jwk.Key, jwk.Key]:
+    """
+    Build the (signing, verification) key objects for the configured algorithm.
+    HS* uses SECRET_KEY for both; RS*/ES* load the PEM keys once here, so
+    PEM parsing never happens per token.
+    """
+    if settings.ALGORITHM.startswith("HS"):
+        key = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+        return key, key
+
+    if not settings.JWT_PRIVATE_KEY or not settings.JWT_PUBLIC_KEY:
+        raise ValueError(f"{settings.ALGORITHM} requires JWT_PRIVATE_KEY and JWT_PUBLIC_KEY")
+    return (
+        jwk.construct(settings.JWT_PRIVATE_KEY, settings.ALGORITHM),
+        jwk.construct(settings.JWT_PUBLIC_KEY, settings.ALGORITHM),
+    )
+
+
+# Key objects and allowed algorithms built once at import; passing a raw
+# string makes jose re-parse (and attempt JSON-decoding) the key per call
+_SIGNING_KEY, _VERIFY_KEY = _build_keys()
+_ALGORITHMS = [settings.ALGORITHM]
+
+
 def create_access_token(user_id: UUID, email: str, provider: str) -> str:
     """
     Create a JWT access token for a user.
@@ -22,17 +46,18 @@ def create_access_token(user_id: UUID, email: str, provider: str) -> str:
     Returns:
         Encoded JWT token string
     """
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    now = datetime.utcnow()
+    expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     payload = {
         "sub": str(user_id),  # Subject (user ID)
         "email": email,
         "provider": provider,
-        "iat": datetime.utcnow(),  # Issued at
+        "iat": now,  # Issued at
         "exp": expire,  # Expiration
     }
 
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(payload, _SIGNING_KEY, algorithm=settings.ALGORITHM)
 
 
 def decode_access_token(token: str) -> Optional[dict]:
@@ -46,7 +71,7 @@ def decode_access_token(token: str) -> Optional[dict]:
         Decoded payload dict if valid, None otherwise
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _VERIFY_KEY, algorithms=_ALGORITHMS)
         return payload
     except JWTError:
         return None
@@ -514,3 +514,26 @@ class MCPDistributor:
                 logger.warning(f"Could not get tools from {mcp_provider.value}: {e}")
 
         return tools
+
+
+# Shared, session-less distributors keyed by primary provider (see get_distributor)
+_distributors: Dict[str, MCPDistributor] = {}
+
+
+def get_distributor(primary_provider: Optional[str] = None) -> MCPDistributor:
+    """
+    Get the shared distributor for a primary provider, creating it on first use.
+    Shared instances hold no database session; callers that need internal
+    tools must construct their own MCPDistributor with a db.
+
+    Args:
+        primary_provider: Default provider for calendar (google/microsoft)
+
+    Returns:
+        Shared MCPDistributor instance
+    """
+    key = primary_provider or "microsoft"
+    distributor = _distributors.get(key)
+    if distributor is None:
+        distributor = _distributors.setdefault(key, MCPDistributor(primary_provider=key))
+    return distributor
@@ -2,15 +2,122 @@
 Password hashing service.
 Part of Infrastructure layer.
 """
-from passlib.context import CryptContext
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Protocol
+import bcrypt
+from argon2 import PasswordHasher as Argon2PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from app.core.config import settings
 
-# Configure password hashing with bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class PasswordHasher(Protocol):
+    """Interface for a password hashing algorithm."""
+
+    def hash(self, password: str) -> str:
+        """Hash a plain text password."""
+        ...
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a plain text password against a hash."""
+        ...
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check if a hash was made with outdated parameters."""
+        ...
+
+
+class BcryptHasher:
+    """bcrypt password hasher with configurable cost (native bcrypt, releases the GIL)."""
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds)).decode("ascii")
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("ascii"))
+        except ValueError:
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # Hash format: $2b$<rounds>$<salt+digest>
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+class Argon2Hasher:
+    """Argon2id password hasher (OWASP parameters by default)."""
+
+    def __init__(self, time_cost: int, memory_cost: int, parallelism: int):
+        self._hasher = Argon2PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        )
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self._hasher.check_needs_rehash(hashed_password)
+
+
+# Hashers by scheme name; the configured scheme is used for new hashes
+_hashers: Dict[str, PasswordHasher] = {
+    "bcrypt": BcryptHasher(rounds=settings.BCRYPT_ROUNDS),
+    "argon2": Argon2Hasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+}
+
+if settings.PASSWORD_HASH_SCHEME not in _hashers:
+    raise ValueError(f"Unsupported PASSWORD_HASH_SCHEME: {settings.PASSWORD_HASH_SCHEME}")
+
+
+def _scheme_of(hashed_password: str) -> str:
+    """Identify the scheme a stored hash was made with."""
+    return "argon2" if hashed_password.startswith("$argon2") else "bcrypt"
+
+
+# Thread pool for CPU-bound hashing (created lazily). bcrypt and argon2
+# release the GIL while hashing, so threads scale across cores without
+# the pickling/IPC overhead of a process pool.
+_hash_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_hash_pool() -> ThreadPoolExecutor:
+    """Get or create the thread pool used for password hashing."""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="pwhash")
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Shut down the password hashing thread pool (application shutdown)."""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a plain text password using bcrypt.
+    Hash a plain text password using the configured scheme.
 
     Args:
         password: Plain text password
@@ -18,7 +125,7 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    return _hashers[settings.PASSWORD_HASH_SCHEME].hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -32,4 +139,66 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _hashers[_scheme_of(hashed_password)].verify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check if a stored hash should be upgraded to the configured scheme/cost.
+
+    Args:
+        hashed_password: Stored password hash
+
+    Returns:
+        True if the password should be rehashed on next successful login
+    """
+    scheme = _scheme_of(hashed_password)
+    if scheme != settings.PASSWORD_HASH_SCHEME:
+        return True
+    return _hashers[scheme].needs_rehash(hashed_password)
+
+
+def start_hash_password(password: str) -> "asyncio.Future[str]":
+    """
+    Submit a password for hashing in the thread pool immediately.
+    Unlike a coroutine, the work starts before the caller awaits it,
+    so it overlaps with any blocking work done in the meantime.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Future resolving to the hashed password string
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(get_hash_pool(), hash_password, password)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the thread pool without blocking the event loop.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password string
+    """
+    return await start_hash_password(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the thread pool without blocking the event loop.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_hash_pool(), verify_password, plain_password, hashed_password
+    )
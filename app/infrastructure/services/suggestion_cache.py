@@ -0,0 +1,59 @@
+"""
+Response cache for AI inbox suggestions.
+Part of Infrastructure layer.
+
+Suggestions are keyed by a SHA-256 hash of the exact item content sent to
+Claude, so repeated items (the same newsletter, a recurring notification)
+skip the Claude call. Only informational suggestions are cached: task and
+delegation suggestions lead to actions the user may already have taken.
+"""
+import copy
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+# Suggestion actions that are safe to reuse for identical content
+CACHEABLE_ACTIONS = frozenset({"create_note", "archive"})
+
+_suggestion_cache: TTLCache = TTLCache(maxsize=10_000, ttl=24 * 3600)
+_suggestion_cache_lock = threading.Lock()
+
+
+def content_hash(content: str) -> str:
+    """Get the cache key for the item content sent to Claude."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a cached suggestion.
+
+    Args:
+        key: Content hash from content_hash()
+
+    Returns:
+        Copy of the cached suggestion, or None on a miss
+    """
+    with _suggestion_cache_lock:
+        suggestion = _suggestion_cache.get(key)
+    return copy.deepcopy(suggestion) if suggestion is not None else None
+
+
+def put(key: str, suggestion: Dict[str, Any]) -> bool:
+    """
+    Cache a suggestion if its action is informational.
+
+    Args:
+        key: Content hash from content_hash()
+        suggestion: Parsed suggestion from Claude
+
+    Returns:
+        True if the suggestion was cached
+    """
+    if not isinstance(suggestion, dict) or suggestion.get("action") not in CACHEABLE_ACTIONS:
+        return False
+    with _suggestion_cache_lock:
+        _suggestion_cache[key] = copy.deepcopy(suggestion)
+    return True
@@ -3,8 +3,10 @@ PAI Server - Main Application
 Clean Architecture implementation with FastAPI
 """
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.log_queue import start_log_queue, stop_log_queue
 from app.presentation.routers import health, auth, calendar, conversation, monitor, persons, tasks, notes, inbox, mcp, onboarding
 import time
 
@@ -15,6 +17,7 @@ app = FastAPI(
     debug=settings.DEBUG,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS - Secure configuration for development/production
@@ -141,6 +144,7 @@ app.include_router(monitor.router, prefix=settings.API_V1_PREFIX)
 @app.on_event("startup")
 async def startup_event():
     """Actions to perform on application startup."""
+    start_log_queue()
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} starting...")
     print(f"📍 API documentation available at /docs")
     print(f"🔧 Debug mode: {settings.DEBUG}")
@@ -149,7 +153,22 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Actions to perform on application shutdown."""
+    from app.application.use_cases.conversation_use_cases import wait_for_pending_writes
+    from app.application.use_cases.inbox_use_cases import flush_suggestion_writes
+    from app.infrastructure.database.session import async_engine, shutdown_db_pool
+    from app.infrastructure.services.claude_service import close_http_client
+    from app.infrastructure.services.email_service import close_email_service
+    from app.infrastructure.services.password import shutdown_hash_pool
+
+    await wait_for_pending_writes()
+    await flush_suggestion_writes()
+    shutdown_hash_pool()
+    shutdown_db_pool()
+    await async_engine.dispose()
+    await close_http_client()
+    close_email_service()
     print(f"👋 {settings.APP_NAME} shutting down...")
+    stop_log_queue()
 
 
 @app.get("/")
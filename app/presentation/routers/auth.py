@@ -2,17 +2,25 @@
 Authentication router.
 Part of Presentation layer - API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.core.dependencies import get_db, get_user_repository, get_current_user, oauth2_scheme
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.dependencies import (
+    get_async_db,
+    get_user_repository,
+    get_refresh_token_repository,
+    get_current_user,
+    oauth2_scheme,
+)
 from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.repositories.refresh_token_repository import RefreshTokenRepository
 from app.application.use_cases.auth_use_cases import (
     RegisterUserUseCase,
     LoginUserUseCase,
     RefreshTokenUseCase,
     LogoutUseCase,
     GetCurrentUserUseCase,
+    invalidate_cached_user,
 )
 from app.presentation.schemas.auth import (
     RegisterRequest,
@@ -23,9 +31,10 @@ from app.presentation.schemas.auth import (
     RefreshResponse,
     LogoutRequest,
 )
+from app.core.config import settings
 from app.infrastructure.services.jwt import extract_user_id_from_token
-import base64
 from typing import Optional
+from uuid import UUID
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -33,8 +42,7 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     request: RegisterRequest,
-    db: Session = Depends(get_db),
-    user_repo: UserRepository = Depends(get_user_repository),
+    refresh_repo: RefreshTokenRepository = Depends(get_refresh_token_repository),
 ):
     """
     Register a new user with email and password.
@@ -45,10 +53,10 @@ async def register(
 
     Returns user info, access token, and refresh token.
     """
-    use_case = RegisterUserUseCase(user_repo, db)
+    use_case = RegisterUserUseCase(refresh_repo)
 
     try:
-        result = use_case.execute(
+        result = await use_case.execute(
             email=request.email,
             password=request.password,
             full_name=request.full_name,
@@ -64,8 +72,9 @@ async def register(
 @router.post("/login", response_model=AuthResponse)
 async def login(
     request: LoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_repo: UserRepository = Depends(get_user_repository),
+    refresh_repo: RefreshTokenRepository = Depends(get_refresh_token_repository),
 ):
     """
     Login with email and password.
@@ -75,10 +84,10 @@ async def login(
 
     Returns user info, access token, and refresh token.
     """
-    use_case = LoginUserUseCase(user_repo, db)
+    use_case = LoginUserUseCase(user_repo, refresh_repo, db)
 
     try:
-        result = use_case.execute(
+        result = await use_case.execute(
             email=request.email,
             password=request.password,
         )
@@ -94,7 +103,9 @@ async def login(
 @router.post("/token", response_model=dict)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     user_repo: UserRepository = Depends(get_user_repository),
+    refresh_repo: RefreshTokenRepository = Depends(get_refresh_token_repository),
 ):
     """
     OAuth2 compatible token endpoint.
@@ -105,10 +116,10 @@ async def login_for_access_token(
 
     Returns access token for Bearer authentication.
     """
-    use_case = LoginUserUseCase(user_repo)
+    use_case = LoginUserUseCase(user_repo, refresh_repo, db)
 
     try:
-        result = use_case.execute(
+        result = await use_case.execute(
             email=form_data.username,  # OAuth2 uses 'username' field
             password=form_data.password,
         )
@@ -150,7 +161,7 @@ async def upload_photo(
 
     - **file**: Image file (JPEG, PNG, GIF, WebP)
 
-    Returns updated user info with photo_url as base64 data URL.
+    Returns updated user info with photo_url pointing at GET /auth/photo/{token}.
     """
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp"]
@@ -177,14 +188,10 @@ async def upload_photo(
             detail=f"File too large. Maximum size is 5MB",
         )
 
-    # Convert to base64 data URL
-    file_b64 = base64.b64encode(file_content).decode('utf-8')
-    data_url = f"data:{file.content_type};base64,{file_b64}"
-
     # Get current user entity from database
     # current_user is a dict returned from GetCurrentUserUseCase
-    user_id = current_user["id"]
-    user = user_repo.get_by_id(user_id)
+    user_id = UUID(current_user["id"])
+    user = await user_repo.get_by_id(user_id)
 
     if not user:
         raise HTTPException(
@@ -192,11 +199,18 @@ async def upload_photo(
             detail="User not found",
         )
 
+    # Store photo bytes separately; the user row only keeps a short URL
+    # (with a new token per upload, so clients refetch after an upload)
+    photo_token = await user_repo.save_photo(user.id, file.content_type, file_content)
+    photo_url = f"{settings.API_V1_PREFIX}/auth/photo/{photo_token}"
+
     # Update user profile with photo URL
-    user.update_profile(photo_url=data_url)
+    user.update_profile(photo_url=photo_url)
 
     # Save to database
-    updated_user = user_repo.update(user)
+    updated_user = await user_repo.update(user)
+    invalidate_cached_user(updated_user.email)
+    GetCurrentUserUseCase.invalidate(updated_user.id)
 
     # Convert to response schema
     return UserResponse(
@@ -209,11 +223,36 @@ async def upload_photo(
     )
 
 
+@router.get("/photo/{token}")
+async def get_photo(
+    token: str,
+    user_repo: UserRepository = Depends(get_user_repository),
+):
+    """
+    Get a profile photo.
+    Unauthenticated so it can be used directly in <img> tags; the URL holds
+    a random per-upload token rather than the user ID, which other responses
+    expose.
+    """
+    photo = await user_repo.get_photo(token)
+    if not photo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Photo not found",
+        )
+
+    content_type, data = photo
+    return Response(
+        content=data,
+        media_type=content_type,
+        headers={"Cache-Control": "private, max-age=86400"},
+    )
+
+
 @router.post("/refresh", response_model=RefreshResponse)
 async def refresh_token(
     request: RefreshRequest,
-    db: Session = Depends(get_db),
-    user_repo: UserRepository = Depends(get_user_repository),
+    refresh_repo: RefreshTokenRepository = Depends(get_refresh_token_repository),
 ):
     """
     Refresh access token using a valid refresh token.
@@ -222,10 +261,10 @@ async def refresh_token(
 
     Returns new access token and refresh token (token rotation).
     """
-    use_case = RefreshTokenUseCase(user_repo, db)
+    use_case = RefreshTokenUseCase(refresh_repo)
 
     try:
-        result = use_case.execute(refresh_token=request.refresh_token)
+        result = await use_case.execute(refresh_token=request.refresh_token)
         return result
     except ValueError as e:
         raise HTTPException(
@@ -238,7 +277,7 @@ async def refresh_token(
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 async def logout(
     request: LogoutRequest,
-    db: Session = Depends(get_db),
+    refresh_repo: RefreshTokenRepository = Depends(get_refresh_token_repository),
 ):
     """
     Logout by revoking the refresh token.
@@ -247,5 +286,5 @@ async def logout(
 
     Returns 204 No Content on success.
     """
-    use_case = LogoutUseCase(db)
-    use_case.execute(refresh_token=request.refresh_token)
\ No newline at end of file
+    use_case = LogoutUseCase(refresh_repo)
+    await use_case.execute(refresh_token=request.refresh_token)
\ No newline at end of file
@@ -2,20 +2,60 @@
 Conversation router - Chat and AI conversation endpoints.
 Part of Presentation layer.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import binascii
+import json
+import re
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 from uuid import UUID
 
-from app.core.dependencies import get_db, get_current_user
+from app.core.dependencies import get_async_db, get_db, get_current_user
+from app.infrastructure.database.session import AsyncSessionLocal, SessionLocal
 from app.application.use_cases.conversation_use_cases import ConversationUseCases
 
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
+# Response header carrying the opaque cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Patterns for pulling tool details out of a test_mode=2 confirmation chunk
+_TOOL_RE = re.compile(r'Tool: (\w+)')
+_PARAMS_RE = re.compile(r'```json\n(.*?)\n```', re.DOTALL)
+_PROVIDER_RE = re.compile(r'→ (\w+)\n')
+
+
+def _encode_cursor(cursor: Optional[tuple]) -> Optional[str]:
+    """Encode a (timestamp, id) pagination cursor as an opaque URL-safe string."""
+    if cursor is None:
+        return None
+    timestamp, row_id = cursor
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """
+    Decode a pagination cursor produced by _encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
 
 # ==================== Request/Response Models ====================
 
@@ -82,7 +122,7 @@ class ConversationDetailResponse(BaseModel):
 async def create_conversation(
     request: ConversationCreateRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new conversation.
@@ -95,7 +135,7 @@ async def create_conversation(
     """
     try:
         use_cases = ConversationUseCases(db)
-        conversation = use_cases.create_conversation(
+        conversation = await use_cases.create_conversation(
             user_id=current_user["id"],
             mode=request.mode,
             title=request.title,
@@ -125,28 +165,35 @@ async def create_conversation(
 
 @router.get("", response_model=List[ConversationResponse])
 async def list_conversations(
+    response: Response,
     mode: Optional[str] = None,
     limit: int = 50,
+    cursor: Optional[str] = None,
     offset: int = 0,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    List user's conversations.
+    List user's conversations, most recently updated first.
 
     Query params:
     - mode: Filter by mode (chat, voice, note, scan)
     - limit: Max results (default 50)
-    - offset: Pagination offset
+    - cursor: Value of the X-Next-Cursor header from the previous page
+    - offset: Pagination offset (deprecated, use cursor)
     """
+    page_cursor = _decode_cursor(cursor)
     try:
         use_cases = ConversationUseCases(db)
-        conversations = use_cases.get_user_conversations(
+        conversations, next_cursor = await use_cases.get_user_conversations(
             user_id=current_user["id"],
             mode=mode,
             limit=limit,
+            cursor=page_cursor,
             offset=offset,
         )
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(next_cursor)
 
         return [
             ConversationResponse(
@@ -179,12 +226,12 @@ async def list_conversations(
 async def get_conversation(
     conversation_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a conversation with all messages."""
     try:
         use_cases = ConversationUseCases(db)
-        conversation = use_cases.get_conversation(
+        conversation = await use_cases.get_conversation(
             conversation_id=conversation_id,
             user_id=current_user["id"],
         )
@@ -231,7 +278,8 @@ async def send_message(
     conversation_id: UUID,
     request: MessageSendRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    sync_db: Session = Depends(get_db),
 ):
     """
     Send a message in a conversation.
@@ -251,7 +299,7 @@ async def send_message(
         )
 
     try:
-        use_cases = ConversationUseCases(db)
+        use_cases = ConversationUseCases(db, sync_db)
         response_message = await use_cases.send_message(
             conversation_id=conversation_id,
             user_id=current_user["id"],
@@ -283,7 +331,6 @@ async def send_message_stream(
     conversation_id: UUID,
     request: MessageSendRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
     """
     Send a message and stream the response via Server-Sent Events.
@@ -292,48 +339,50 @@ async def send_message_stream(
         StreamingResponse with text/event-stream content-type
     """
     try:
-        use_cases = ConversationUseCases(db)
-
         async def event_generator():
             """Generate SSE events."""
-            import json
-            import re
+            # The generator runs after the request's dependencies have been
+            # closed, so it opens its own sessions
+            sync_db = SessionLocal()
             try:
-                async for chunk in use_cases.send_message_stream(
-                    conversation_id=conversation_id,
-                    user_id=current_user["id"],
-                    content=request.content,
-                    test_mode=request.test_mode,
-                ):
-                    # Check if this is a confirmation-required response (test_mode=2)
-                    if "TEST MODE: Bevestiging vereist" in chunk and "Wacht op bevestiging" in chunk:
-                        # Parse the tool details from the chunk
-                        tool_match = re.search(r'Tool: (\w+)', chunk)
-                        params_match = re.search(r'```json\n(.*?)\n```', chunk, re.DOTALL)
-                        route_match = re.search(r'Route: (.+?) →', chunk)
-                        provider_match = re.search(r'→ (\w+)\n', chunk)
-
-                        tool_name = tool_match.group(1) if tool_match else "unknown"
-                        tool_params = {}
-                        if params_match:
-                            try:
-                                tool_params = json.loads(params_match.group(1))
-                            except:
-                                pass
-                        provider = provider_match.group(1) if provider_match else None
-
-                        # Send as confirm_required event
-                        yield f"data: {json.dumps({'type': 'confirm_required', 'content': chunk, 'tool_name': tool_name, 'tool_params': tool_params, 'provider': provider})}\n\n"
-                    else:
-                        # Regular content
-                        yield f"data: {json.dumps({'type': 'content', 'content': chunk})}\n\n"
-
-                # Send completion event
-                yield "data: [DONE]\n\n"
+                async with AsyncSessionLocal() as db:
+                    use_cases = ConversationUseCases(db, sync_db)
+                    async for chunk in use_cases.send_message_stream(
+                        conversation_id=conversation_id,
+                        user_id=current_user["id"],
+                        content=request.content,
+                        test_mode=request.test_mode,
+                    ):
+                        # Check if this is a confirmation-required response (test_mode=2)
+                        if "TEST MODE: Bevestiging vereist" in chunk and "Wacht op bevestiging" in chunk:
+                            # Parse the tool details from the chunk
+                            tool_match = _TOOL_RE.search(chunk)
+                            params_match = _PARAMS_RE.search(chunk)
+                            provider_match = _PROVIDER_RE.search(chunk)
+
+                            tool_name = tool_match.group(1) if tool_match else "unknown"
+                            tool_params = {}
+                            if params_match:
+                                try:
+                                    tool_params = json.loads(params_match.group(1))
+                                except:
+                                    pass
+                            provider = provider_match.group(1) if provider_match else None
+
+                            # Send as confirm_required event
+                            yield f"data: {json.dumps({'type': 'confirm_required', 'content': chunk, 'tool_name': tool_name, 'tool_params': tool_params, 'provider': provider})}\n\n"
+                        else:
+                            # Regular content
+                            yield f"data: {json.dumps({'type': 'content', 'content': chunk})}\n\n"
+
+                    # Send completion event
+                    yield "data: [DONE]\n\n"
 
             except Exception as e:
                 # Send error event
                 yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            finally:
+                sync_db.close()
 
         return StreamingResponse(
             event_generator(),
@@ -361,12 +410,12 @@ async def send_message_stream(
 async def delete_conversation(
     conversation_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a conversation and all its messages."""
     try:
         use_cases = ConversationUseCases(db)
-        success = use_cases.delete_conversation(
+        success = await use_cases.delete_conversation(
             conversation_id=conversation_id,
             user_id=current_user["id"],
         )
@@ -387,20 +436,33 @@ async def delete_conversation(
 @router.get("/{conversation_id}/messages", response_model=List[MessageResponse])
 async def get_messages(
     conversation_id: UUID,
+    response: Response,
     limit: int = 100,
+    cursor: Optional[str] = None,
     offset: int = 0,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get messages from a conversation with pagination."""
+    """
+    Get messages from a conversation with pagination (oldest first).
+
+    Query params:
+    - limit: Max messages (default 100)
+    - cursor: Value of the X-Next-Cursor header from the previous page
+    - offset: Pagination offset (deprecated, use cursor)
+    """
+    page_cursor = _decode_cursor(cursor)
     try:
         use_cases = ConversationUseCases(db)
-        messages = use_cases.get_messages(
+        messages, next_cursor = await use_cases.get_messages(
             conversation_id=conversation_id,
             user_id=current_user["id"],
             limit=limit,
+            cursor=page_cursor,
             offset=offset,
         )
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(next_cursor)
 
         return [
             MessageResponse(
@@ -429,7 +491,7 @@ async def get_messages(
 async def generate_conversation_title(
     conversation_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Generate an AI-powered title for a conversation.
@@ -3,12 +3,13 @@ Inbox router - CRUD endpoints for inbox item management with AI processing.
 Part of Presentation layer.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from uuid import UUID
+from datetime import datetime
 
-from app.core.dependencies import get_db, get_current_user
+from app.core.dependencies import get_async_db, get_current_user
 from app.application.use_cases.inbox_use_cases import InboxUseCases
 
 
@@ -39,6 +40,11 @@ class InboxItemRejectRequest(BaseModel):
     reason: Optional[str] = None
 
 
+class InboxBulkSuggestRequest(BaseModel):
+    """Request AI suggestions for several inbox items."""
+    item_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+
+
 class InboxItemResponse(BaseModel):
     """Inbox item response model."""
     id: str
@@ -53,15 +59,16 @@ class InboxItemResponse(BaseModel):
     ai_suggestion: Optional[Dict[str, Any]]
     user_decision: Optional[Dict[str, Any]]
     linked_items: List[Dict[str, Any]]
-    processed_at: Optional[str]
-    created_at: str
-    updated_at: str
+    processed_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
 
 
 class InboxListResponse(BaseModel):
     """Inbox list response model."""
     items: List[InboxItemResponse]
     total: int
+    unprocessed_count: int
     skip: int
     limit: int
 
@@ -81,9 +88,9 @@ class InboxCountResponse(BaseModel):
 
 
 @router.post("", response_model=InboxItemResponse, status_code=status.HTTP_201_CREATED)
-def create_inbox_item(
+async def create_inbox_item(
     request: InboxItemCreateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -93,7 +100,7 @@ def create_inbox_item(
         from app.domain.entities.inbox_item import InboxItemType, Priority
 
         use_cases = InboxUseCases(db)
-        item = use_cases.create_inbox_item(
+        item = await use_cases.create_inbox_item(
             user_id=UUID(current_user["id"]),
             type=InboxItemType(request.type),
             source=request.source,
@@ -113,13 +120,13 @@ def create_inbox_item(
 
 
 @router.get("", response_model=InboxListResponse)
-def list_inbox_items(
+async def list_inbox_items(
     status_filter: Optional[str] = None,
     type_filter: Optional[str] = None,
     priority: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -129,10 +136,13 @@ def list_inbox_items(
     - status: comma-separated list (unprocessed, pending_review, accepted, modified, rejected, archived)
     - type: comma-separated list (email, calendar_event, message, etc.)
     - priority: comma-separated list (low, medium, high, urgent)
+
+    The response includes the unprocessed count (unfiltered), so the list
+    does not need a separate /count request.
     """
     try:
         use_cases = InboxUseCases(db)
-        result = use_cases.get_inbox_items(
+        result = await use_cases.get_inbox_items(
             user_id=UUID(current_user["id"]),
             status=status_filter,
             type=type_filter,
@@ -149,8 +159,8 @@ def list_inbox_items(
 
 
 @router.get("/count", response_model=InboxCountResponse)
-def get_unprocessed_count(
-    db: Session = Depends(get_db),
+async def get_unprocessed_count(
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -158,7 +168,7 @@ def get_unprocessed_count(
     """
     try:
         use_cases = InboxUseCases(db)
-        count = use_cases.get_unprocessed_count(user_id=UUID(current_user["id"]))
+        count = await use_cases.get_unprocessed_count(user_id=UUID(current_user["id"]))
         return {"count": count}
     except Exception as e:
         raise HTTPException(
@@ -168,9 +178,9 @@ def get_unprocessed_count(
 
 
 @router.get("/{item_id}", response_model=InboxItemResponse)
-def get_inbox_item(
+async def get_inbox_item(
     item_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -178,7 +188,7 @@ def get_inbox_item(
     """
     try:
         use_cases = InboxUseCases(db)
-        item = use_cases.get_inbox_item(
+        item = await use_cases.get_inbox_item(
             item_id=item_id,
             user_id=UUID(current_user["id"]),
         )
@@ -202,7 +212,7 @@ def get_inbox_item(
 @router.post("/{item_id}/suggest", response_model=InboxItemResponse)
 async def request_ai_suggestion(
     item_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -231,10 +241,33 @@ async def request_ai_suggestion(
         )
 
 
+@router.post("/suggest", response_model=List[InboxItemResponse])
+async def request_ai_suggestions_bulk(
+    request: InboxBulkSuggestRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Request AI suggestions for several inbox items at once.
+    Unknown item IDs are skipped.
+    """
+    try:
+        use_cases = InboxUseCases(db)
+        return await use_cases.request_ai_suggestions_bulk(
+            item_ids=request.item_ids,
+            user_id=UUID(current_user["id"]),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get AI suggestions: {str(e)}",
+        )
+
+
 @router.post("/{item_id}/accept", response_model=InboxProcessResultResponse)
 async def accept_suggestion(
     item_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -265,10 +298,10 @@ async def accept_suggestion(
 
 
 @router.post("/{item_id}/modify", response_model=InboxProcessResultResponse)
-def modify_and_accept(
+async def modify_and_accept(
     item_id: UUID,
     request: InboxItemModifyRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -277,7 +310,7 @@ def modify_and_accept(
     """
     try:
         use_cases = InboxUseCases(db)
-        result = use_cases.modify_and_accept(
+        result = await use_cases.modify_and_accept(
             item_id=item_id,
             user_id=UUID(current_user["id"]),
             modifications={
@@ -303,10 +336,10 @@ def modify_and_accept(
 
 
 @router.post("/{item_id}/reject", response_model=InboxItemResponse)
-def reject_item(
+async def reject_item(
     item_id: UUID,
     request: InboxItemRejectRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -315,7 +348,7 @@ def reject_item(
     """
     try:
         use_cases = InboxUseCases(db)
-        item = use_cases.reject_item(
+        item = await use_cases.reject_item(
             item_id=item_id,
             user_id=UUID(current_user["id"]),
             reason=request.reason,
@@ -338,9 +371,9 @@ def reject_item(
 
 
 @router.post("/{item_id}/archive", response_model=InboxItemResponse)
-def archive_item(
+async def archive_item(
     item_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -348,7 +381,7 @@ def archive_item(
     """
     try:
         use_cases = InboxUseCases(db)
-        item = use_cases.archive_item(
+        item = await use_cases.archive_item(
             item_id=item_id,
             user_id=UUID(current_user["id"]),
         )
@@ -370,9 +403,9 @@ def archive_item(
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(
+async def delete_item(
     item_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -380,7 +413,7 @@ def delete_item(
     """
     try:
         use_cases = InboxUseCases(db)
-        success = use_cases.delete_item(
+        success = await use_cases.delete_item(
             item_id=item_id,
             user_id=UUID(current_user["id"]),
         )
@@ -2,10 +2,11 @@
 Onboarding router.
 Part of Presentation layer - API endpoints for user onboarding.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
+from uuid import UUID
 
 from app.core.dependencies import get_db, get_user_repository, get_current_user
 from app.infrastructure.repositories.user_repository import UserRepository
@@ -66,7 +67,7 @@ async def get_onboarding_status(
     """
     use_case = GetOnboardingStatusUseCase(user_repo)
     try:
-        result = use_case.execute(user_id=current_user["id"])
+        result = await use_case.execute(user_id=UUID(current_user["id"]))
         return result
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -74,6 +75,7 @@ async def get_onboarding_status(
 
 @router.post("/email/send-code")
 async def send_email_verification_code(
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
     user_repo: UserRepository = Depends(get_user_repository),
@@ -82,10 +84,11 @@ async def send_email_verification_code(
     Send email verification code.
 
     Step 1 of onboarding: verify the user's email address.
+    The email is sent after the response.
     """
     use_case = StartEmailVerificationUseCase(user_repo, db)
     try:
-        result = use_case.execute(user_id=current_user["id"])
+        result = use_case.execute(user_id=current_user["id"], send_later=background_tasks.add_task)
         return result
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -154,6 +157,7 @@ async def generate_inbox_address(
 
 @router.post("/inbox/send-verification")
 async def send_inbox_verification(
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
     user_repo: UserRepository = Depends(get_user_repository),
@@ -162,11 +166,12 @@ async def send_inbox_verification(
     Send inbox verification email.
 
     Step 3 of onboarding: sends email FROM user's PAI inbox TO their personal email
-    with a verification link to confirm the inbox is working.
+    with a verification link to confirm the inbox is working. The email is
+    sent after the response.
     """
     use_case = SendInboxVerificationUseCase(user_repo, db)
     try:
-        result = use_case.execute(user_id=current_user["id"])
+        result = use_case.execute(user_id=current_user["id"], send_later=background_tasks.add_task)
         return result
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -2,6 +2,7 @@
 Pydantic schemas for authentication endpoints.
 Part of Presentation layer - request/response models.
 """
+from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -9,7 +10,12 @@ class RegisterRequest(BaseModel):
     """Request schema for user registration."""
 
     email: EmailStr
-    password: str = Field(..., min_length=8, description="Password must be at least 8 characters")
+    password: str = Field(
+        ...,
+        min_length=8,
+        max_length=72,
+        description="Password must be 8-72 characters (at most 72 bytes UTF-8)",
+    )
     full_name: str = Field(..., min_length=1, max_length=255)
 
 
@@ -23,7 +29,7 @@ class LoginRequest(BaseModel):
 class UserResponse(BaseModel):
     """Response schema for user data."""
 
-    id: str
+    id: UUID
     email: str
     full_name: str
     provider: str
@@ -0,0 +1,167 @@
+"""
+Unit tests for authentication use cases.
+"""
+import pytest
+from app.domain.entities.user import User
+from app.application.use_cases import auth_use_cases
+from app.application.use_cases.auth_use_cases import (
+    GetCurrentUserUseCase,
+    LoginUserUseCase,
+    RegisterUserUseCase,
+    _get_user_cached,
+    invalidate_cached_user,
+)
+
+
+class FakeUserRepository:
+    """In-memory stand-in for UserRepository that counts lookups."""
+
+    def __init__(self, users=None):
+        self.users = {user.email: user for user in (users or [])}
+        self.get_by_email_calls = 0
+
+    async def get_auth_projection(self, email):
+        self.get_by_email_calls += 1
+        return self.users.get(email.lower().strip())
+
+
+@pytest.fixture(autouse=True)
+def clear_user_caches():
+    """Start every test with empty user caches."""
+    auth_use_cases._user_by_email_cache.clear()
+    auth_use_cases._current_user_cache.clear()
+    yield
+    auth_use_cases._user_by_email_cache.clear()
+    auth_use_cases._current_user_cache.clear()
+
+
+def make_user(email="test@example.com"):
+    return User.create(
+        email=email,
+        full_name="Test User",
+        provider="local",
+        hashed_password="hashed",
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_user_cached_hits_repository_once():
+    """Test that repeat lookups are served from the cache."""
+    repo = FakeUserRepository([make_user()])
+
+    first = await _get_user_cached(repo, "test@example.com")
+    second = await _get_user_cached(repo, " TEST@example.com ")
+
+    assert first is second
+    assert repo.get_by_email_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_cached_does_not_cache_misses():
+    """Test that unknown emails are not cached."""
+    repo = FakeUserRepository()
+
+    assert await _get_user_cached(repo, "missing@example.com") is None
+    assert await _get_user_cached(repo, "missing@example.com") is None
+    assert repo.get_by_email_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_cached_user():
+    """Test that invalidation forces a fresh lookup."""
+    repo = FakeUserRepository([make_user()])
+
+    await _get_user_cached(repo, "test@example.com")
+    invalidate_cached_user("Test@Example.com")
+    await _get_user_cached(repo, "test@example.com")
+
+    assert repo.get_by_email_calls == 2
+
+
+class FakeUserByIdRepository:
+    """In-memory stand-in for UserRepository keyed by ID."""
+
+    def __init__(self, user):
+        self.user = user
+        self.get_by_id_calls = 0
+
+    async def get_by_id(self, user_id):
+        self.get_by_id_calls += 1
+        return self.user if user_id == self.user.id else None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_is_cached():
+    """Test that repeat current-user lookups skip the repository."""
+    user = make_user()
+    repo = FakeUserByIdRepository(user)
+    use_case = GetCurrentUserUseCase(repo)
+
+    first = await use_case.execute(str(user.id))
+    second = await use_case.execute(str(user.id))
+
+    assert first == second
+    assert first["id"] == str(user.id)
+    assert repo.get_by_id_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_invalidate():
+    """Test that invalidation forces a fresh lookup."""
+    user = make_user()
+    repo = FakeUserByIdRepository(user)
+    use_case = GetCurrentUserUseCase(repo)
+
+    await use_case.execute(str(user.id))
+    GetCurrentUserUseCase.invalidate(user.id)
+    await use_case.execute(str(user.id))
+
+    assert repo.get_by_id_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_password_over_72_bytes():
+    """Test that passwords bcrypt would truncate are rejected before hashing."""
+    use_case = RegisterUserUseCase(refresh_token_repository=None)
+
+    with pytest.raises(ValueError, match="at most 72 bytes"):
+        await use_case.execute(
+            email="test@example.com",
+            password="é" * 40,  # 40 characters, 80 bytes
+            full_name="Test User",
+        )
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_short_password():
+    """Test that short passwords are rejected before hashing."""
+    use_case = RegisterUserUseCase(refresh_token_repository=None)
+
+    with pytest.raises(ValueError, match="at least 8 characters"):
+        await use_case.execute(email="test@example.com", password="short", full_name="Test User")
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_malformed_id():
+    """Test that malformed IDs return None without a repository lookup."""
+    user = make_user()
+    repo = FakeUserByIdRepository(user)
+    use_case = GetCurrentUserUseCase(repo)
+
+    assert await use_case.execute("not-a-uuid") is None
+    assert await use_case.execute(str(user.id) + "0") is None
+    assert repo.get_by_id_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_login_rejects_disabled_and_oauth_users():
+    """Test that login status checks raise the expected messages."""
+    disabled = make_user("disabled@example.com")
+    disabled.deactivate()
+    google = User.create(email="google@example.com", full_name="Test User", provider="google")
+    use_case = LoginUserUseCase(FakeUserRepository([disabled, google]), None, None)
+
+    with pytest.raises(ValueError, match="Account is disabled"):
+        await use_case.execute(email="disabled@example.com", password="password123")
+    with pytest.raises(ValueError, match="uses google authentication"):
+        await use_case.execute(email="google@example.com", password="password123")
@@ -0,0 +1,60 @@
+"""
+Unit tests for calendar OAuth use cases.
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from app.application.use_cases import calendar_oauth_use_cases
+from app.application.use_cases.calendar_oauth_use_cases import (
+    get_cached_primary_provider,
+    invalidate_primary_provider,
+)
+from app.infrastructure.repositories.user_settings_repository import UserSettingsRepository
+
+
+@pytest.fixture(autouse=True)
+def clear_provider_cache():
+    """Start every test with an empty provider cache."""
+    calendar_oauth_use_cases._primary_provider_cache.clear()
+    yield
+    calendar_oauth_use_cases._primary_provider_cache.clear()
+
+
+@pytest.fixture
+def settings_lookups(monkeypatch):
+    """Stub the settings query and record each lookup."""
+    calls = []
+    provider = {"value": "google"}
+
+    def fake_get_settings(self, user_id):
+        calls.append(user_id)
+        return SimpleNamespace(primary_calendar_provider=provider["value"])
+
+    monkeypatch.setattr(UserSettingsRepository, "get_settings", fake_get_settings)
+    return calls, provider
+
+
+@pytest.mark.asyncio
+async def test_primary_provider_is_cached(settings_lookups):
+    """Test that repeat lookups skip the settings query."""
+    calls, _ = settings_lookups
+    user_id = uuid4()
+
+    assert await get_cached_primary_provider(None, user_id) == "google"
+    assert await get_cached_primary_provider(None, user_id) == "google"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_provider_invalidate(settings_lookups):
+    """Test that invalidation picks up a changed provider."""
+    calls, provider = settings_lookups
+    user_id = uuid4()
+
+    await get_cached_primary_provider(None, user_id)
+    provider["value"] = None
+    invalidate_primary_provider(user_id)
+
+    assert await get_cached_primary_provider(None, user_id) == "microsoft"
+    assert len(calls) == 2
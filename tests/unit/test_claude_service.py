@@ -0,0 +1,70 @@
+"""
+Unit tests for Claude service request building.
+"""
+import orjson
+from app.infrastructure.services.claude_service import (
+    CACHE_CONTROL_EPHEMERAL,
+    MAX_CACHE_BREAKPOINTS,
+    ClaudeService,
+)
+
+
+def make_messages(count):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"}
+        for i in range(count)
+    ]
+
+
+def cached_indexes(messages):
+    return [
+        i for i, message in enumerate(messages)
+        if isinstance(message["content"], list)
+        and message["content"][-1].get("cache_control") == CACHE_CONTROL_EPHEMERAL
+    ]
+
+
+def test_cache_breakpoints_mark_history_before_new_turn():
+    """Test that the second-to-last message is marked and the input is untouched."""
+    messages = make_messages(5)
+
+    result = ClaudeService.with_cache_breakpoints(messages)
+
+    assert cached_indexes(result) == [3]
+    assert result[3]["content"] == [
+        {"type": "text", "text": "message 3", "cache_control": CACHE_CONTROL_EPHEMERAL}
+    ]
+    assert messages == make_messages(5)
+
+
+def test_cache_breakpoints_respect_cap():
+    """Test that long histories get periodic checkpoints within the cap."""
+    result = ClaudeService.with_cache_breakpoints(make_messages(50))
+
+    assert cached_indexes(result) == [29, 39, 48]
+    assert len(cached_indexes(result)) <= MAX_CACHE_BREAKPOINTS - 1
+
+
+def test_cache_breakpoints_skip_single_message():
+    """Test that a lone new message has no stable prefix to cache."""
+    messages = make_messages(1)
+
+    assert ClaudeService.with_cache_breakpoints(messages) is messages
+
+
+def test_build_system_keeps_dynamic_context_uncached():
+    """Test that only the static prompt is a cache breakpoint."""
+    assert ClaudeService.build_system("prompt", "date") == "prompt\ndate"
+    assert ClaudeService.build_system("prompt", "date", cache_prompt=True) == [
+        {"type": "text", "text": "prompt", "cache_control": CACHE_CONTROL_EPHEMERAL},
+        {"type": "text", "text": "date"},
+    ]
+
+
+def test_encode_system_matches_build_system():
+    """Test that the pre-encoded system field serializes like the plain one."""
+    for args in [("prompt", None, False), ("prompt", None, True), ("prompt", "date", True),
+                 ("prompt", "date", False), (None, "date", True), (None, None, False)]:
+        assert orjson.dumps(ClaudeService.encode_system(*args)) == orjson.dumps(
+            ClaudeService.build_system(*args)
+        )
@@ -0,0 +1,44 @@
+"""
+Unit tests for the Conversation entity's dialog state.
+"""
+from uuid import uuid4
+
+from app.domain.entities.conversation import Conversation, DialogState
+
+
+SLOTS = {"tool_name": "create_reminder", "tool_params": {"title": "X"}}
+
+
+def test_dialog_starts_idle():
+    """Test that a new conversation has no open question."""
+    conversation = Conversation.create(user_id=uuid4())
+
+    assert conversation.dialog_state == DialogState.IDLE
+    assert conversation.dialog_slots == {}
+
+
+def test_dialog_confirmation_lifecycle():
+    """Test the IDLE → AWAITING_CONFIRMATION → EXECUTING → IDLE path."""
+    conversation = Conversation.create(user_id=uuid4())
+
+    conversation.await_confirmation(SLOTS)
+    assert conversation.dialog_state == DialogState.AWAITING_CONFIRMATION
+    assert conversation.dialog_slots == SLOTS
+
+    conversation.start_executing()
+    assert conversation.dialog_state == DialogState.EXECUTING
+    assert conversation.dialog_slots == SLOTS
+
+    conversation.clear_dialog()
+    assert conversation.dialog_state == DialogState.IDLE
+
+
+def test_dialog_question_expires():
+    """Test that unrelated messages count the question's lifetime down."""
+    conversation = Conversation.create(user_id=uuid4())
+    conversation.await_confirmation(SLOTS, lifetime=2)
+
+    conversation.tick_dialog()
+    assert conversation.dialog_state == DialogState.AWAITING_CONFIRMATION
+    conversation.tick_dialog()
+    assert conversation.dialog_state == DialogState.IDLE
@@ -0,0 +1,33 @@
+"""
+Unit tests for conversation router helpers.
+"""
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from app.presentation.routers.conversation import _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip():
+    """Test that an encoded cursor decodes to the same position."""
+    cursor = (datetime(2026, 1, 2, 3, 4, 5, 678901), uuid4())
+
+    encoded = _encode_cursor(cursor)
+
+    assert "=" not in encoded
+    assert _decode_cursor(encoded) == cursor
+
+
+def test_decode_cursor_empty_is_first_page():
+    """Test that a missing cursor means the first page."""
+    assert _decode_cursor(None) is None
+    assert _decode_cursor("") is None
+
+
+def test_decode_cursor_rejects_garbage():
+    """Test that malformed cursors raise a 400."""
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor("garbage!")
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,194 @@
+"""
+Unit tests for conversation use case helpers.
+"""
+import asyncio
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.application.use_cases import conversation_use_cases
+from app.application.use_cases.conversation_use_cases import (
+    ConversationUseCases,
+    _coalesce,
+    _test_mode_response,
+    _title_cache_key,
+    _title_context,
+)
+from app.core.test_mode_context import set_test_mode
+from app.domain.entities.conversation import Conversation, DialogState, Message
+from app.domain.services.command_parser import CommandParser
+from app.infrastructure.services.mcp_distributor import MCPExecutionResult, RouteTrace
+
+REMINDER = {"title": "Bellen", "reminder_time": "2026-01-02T09:00:00", "provider": "google"}
+
+
+def test_title_cache_key_ignores_case_and_whitespace():
+    """Test that trivially different openings share a title cache entry."""
+    key = _title_cache_key("user: Plan een  meeting\nassistant: Prima!")
+
+    assert key == _title_cache_key("USER: plan een meeting assistant:   prima!")
+    assert key != _title_cache_key("user: Plan een lunch")
+
+
+def test_title_context_caps_long_messages():
+    """Test that a long paste is sliced to the context budget."""
+    messages = [
+        Message(id=None, conversation_id=None, role="user", content="x" * 50_000, created_at=None),
+        Message(id=None, conversation_id=None, role="assistant", content="Prima!", created_at=None),
+    ]
+
+    assert _title_context(messages) == "user: " + "x" * 500
+    assert _title_context(messages[1:]) == "assistant: Prima!"
+
+
+def test_test_mode_response_only_in_test_mode():
+    """Test that results pass through unless a test mode applies."""
+    result = MCPExecutionResult(success=True, requires_confirmation=False)
+
+    set_test_mode(0)
+    assert _test_mode_response(result) is None
+    set_test_mode(2)
+    assert _test_mode_response(result) is None
+    set_test_mode(1)
+    assert _test_mode_response(result) == "🔧 Test mode: geen uitvoering"
+    set_test_mode(0)
+
+
+async def _chunks(items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_fast_chunks():
+    """Test that back-to-back chunks are sent in batches of max_chars."""
+    items = ["abcde"] * 30
+
+    batches = [batch async for batch in _coalesce(_chunks(items), max_chars=20, max_delay=1)]
+
+    assert "".join(batches) == "".join(items)
+    assert all(len(batch) == 20 for batch in batches[:-1])
+
+
+@pytest.mark.asyncio
+async def test_coalesce_flushes_slow_chunks():
+    """Test that a partial batch is flushed after max_delay."""
+    batches = [
+        batch async for batch in _coalesce(_chunks(["a", "b", "c"], delay=0.05), max_chars=64, max_delay=0.01)
+    ]
+
+    assert batches == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_reraises_source_errors():
+    """Test that an error in the source reaches the consumer."""
+    async def failing():
+        yield "a"
+        raise RuntimeError("stream broke")
+
+    with pytest.raises(RuntimeError, match="stream broke"):
+        async for _ in _coalesce(failing()):
+            pass
+
+
+class _FakeDistributor:
+    """Distributor that asks for confirmation (test_mode=2) and counts confirmed runs."""
+
+    def __init__(self):
+        self.confirmed = []
+
+    async def route_and_execute(self, tool_name, tool_params, **kwargs):
+        trace = RouteTrace(
+            request_id="r1",
+            timestamp="2026-01-01T00:00:00",
+            input_source="chat",
+            original_input="",
+            detected_intent="reminder",
+            detected_provider="google",
+            selected_mcp="google",
+            tool_name=tool_name,
+            tool_params=tool_params,
+            test_mode=2,
+        )
+        return MCPExecutionResult(success=True, route_trace=trace, requires_confirmation=True)
+
+    async def confirm_and_execute(self, tool_name, tool_params, **kwargs):
+        self.confirmed.append(tool_name)
+        return MCPExecutionResult(success=True, data={"id": "event-1"})
+
+
+@pytest.mark.asyncio
+async def test_popup_confirmation_is_not_repeated_in_chat(monkeypatch):
+    """Test that a call confirmed in the popup does not run again on a later "ok" or "ja"."""
+    distributor = _FakeDistributor()
+    monkeypatch.setattr(conversation_use_cases, "get_distributor", lambda provider: distributor)
+    monkeypatch.setattr(conversation_use_cases, "get_cached_primary_provider", AsyncMock(return_value="google"))
+    use_cases = ConversationUseCases(AsyncMock())
+    use_cases.conversation_repo = AsyncMock()
+    conversation = Conversation.create(user_id=uuid4())
+
+    # Streamed test_mode=2 reply: the client shows the confirmation popup
+    set_test_mode(2)
+    use_cases._popup_confirmations = True
+    reply = await use_cases._execute_create_reminder(conversation.user_id, REMINDER)
+    await use_cases._finish_turn(conversation)
+    set_test_mode(0)
+
+    assert "Bevestiging vereist" in reply
+    assert conversation.dialog_state == DialogState.IDLE
+
+    # The user confirms in the popup (POST /mcp/confirm), then chats on
+    await distributor.confirm_and_execute("create_reminder", REMINDER)
+    for answer in ("ok", "ja"):
+        confirmation = CommandParser.parse_confirmation(answer)
+        assert await use_cases._advance_dialog(conversation, confirmation) is None
+
+    assert CommandParser.parse_confirmation("ok") is None
+    assert distributor.confirmed == ["create_reminder"]
+
+
+@pytest.mark.asyncio
+async def test_chat_confirmation_runs_every_pending_call(monkeypatch):
+    """Test that a "ja" runs all tool calls that asked for confirmation in one turn."""
+    distributor = _FakeDistributor()
+    monkeypatch.setattr(conversation_use_cases, "get_distributor", lambda provider: distributor)
+    monkeypatch.setattr(conversation_use_cases, "get_cached_primary_provider", AsyncMock(return_value="google"))
+    use_cases = ConversationUseCases(AsyncMock())
+    use_cases.conversation_repo = AsyncMock()
+    conversation = Conversation.create(user_id=uuid4())
+
+    # Non-streamed test_mode=2 reply with two tool calls: no popup
+    set_test_mode(2)
+    await asyncio.gather(
+        use_cases._execute_create_reminder(conversation.user_id, REMINDER),
+        use_cases._execute_create_reminder(conversation.user_id, {**REMINDER, "title": "Mailen"}),
+    )
+    await use_cases._finish_turn(conversation)
+    set_test_mode(0)
+
+    assert conversation.dialog_state == DialogState.AWAITING_CONFIRMATION
+    assert len(conversation.dialog_slots["calls"]) == 2
+
+    await use_cases._advance_dialog(conversation, True)
+
+    assert distributor.confirmed == ["create_reminder", "create_reminder"]
+    assert conversation.dialog_state == DialogState.IDLE
+
+
+@pytest.mark.asyncio
+async def test_confirmation_already_claimed_does_not_run(monkeypatch):
+    """Test that a "ja" losing the race to another answer runs nothing."""
+    distributor = _FakeDistributor()
+    monkeypatch.setattr(conversation_use_cases, "get_distributor", lambda provider: distributor)
+    use_cases = ConversationUseCases(AsyncMock())
+    use_cases.conversation_repo = AsyncMock()
+    use_cases.conversation_repo.update_metadata_if_dialog_state.return_value = False
+    conversation = Conversation.create(user_id=uuid4())
+    conversation.await_confirmation({"calls": [{"tool_name": "create_reminder", "tool_params": REMINDER}]})
+
+    assert await use_cases._advance_dialog(conversation, True) is None
+    assert distributor.confirmed == []
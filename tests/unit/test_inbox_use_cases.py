@@ -0,0 +1,141 @@
+"""
+Unit tests for inbox use case helpers.
+"""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+from app.application.use_cases.inbox_use_cases import (
+    MAX_SUGGESTION_CONTENT_CHARS,
+    InboxUseCases,
+    _format_item,
+    _JsonObjectScanner,
+    _parse_bulk_suggestions,
+    _parse_suggestion,
+    _row_to_dict,
+)
+
+
+def feed_all(chunks):
+    scanner = _JsonObjectScanner()
+    for chunk in chunks:
+        payload = scanner.feed(chunk)
+        if payload is not None:
+            return payload
+    return None
+
+
+def test_scanner_extracts_fenced_nested_json_across_chunks():
+    """Test that a fenced object split over deltas is returned whole."""
+    chunks = ["Hier is mijn advies:\n```json\n{\"action\": \"create_note\", ",
+              "\"suggested_data\": {\"title\": \"X\"}", "}\n```\nSucces!"]
+
+    payload = feed_all(chunks)
+
+    assert json.loads(payload)["suggested_data"] == {"title": "X"}
+
+
+def test_scanner_ignores_braces_in_strings():
+    """Test that braces and escaped quotes inside strings do not end the object."""
+    payload = feed_all(['{"reasoning": "gebruik } en \\" niet", "action": "archive"} extra'])
+
+    assert json.loads(payload)["action"] == "archive"
+
+
+def test_scanner_returns_none_for_incomplete_object():
+    """Test that an unterminated object is never returned."""
+    assert feed_all(["geen JSON", '{"action": "archive"']) is None
+
+
+def test_row_to_dict_formats_row_mapping():
+    """Test that list rows are converted like single-item responses."""
+    created = datetime(2025, 1, 2, 3, 4, 5)
+    values = {
+        "id": uuid4(), "user_id": uuid4(), "type": "email", "source": "gmail",
+        "status": "unprocessed", "priority": "medium", "subject": "Hoi", "content": None,
+        "raw_data": None, "ai_suggestion": None, "user_decision": None, "linked_items": None,
+        "processed_at": None, "created_at": created, "updated_at": created,
+    }
+
+    item = _row_to_dict(SimpleNamespace(_mapping=values))
+
+    assert item["id"] == str(values["id"])
+    assert item["raw_data"] == {} and item["linked_items"] == []
+    assert item["processed_at"] is None
+    assert item["created_at"] is created
+
+
+def test_row_to_dict_merges_linked_item_details():
+    """Test that linked items get their current details when known."""
+    task_id = str(uuid4())
+    values = {
+        "id": uuid4(), "user_id": uuid4(), "type": "email", "source": "gmail",
+        "status": "accepted", "priority": "medium", "subject": None, "content": None,
+        "raw_data": {}, "ai_suggestion": None, "user_decision": None,
+        "linked_items": [{"type": "task", "id": task_id}, {"type": "note", "id": "gone"}],
+        "processed_at": None, "created_at": None, "updated_at": None,
+    }
+    linked_map = {("task", task_id): {"title": "Rapport", "status": "done"}}
+
+    item = _row_to_dict(SimpleNamespace(_mapping=values), linked_map)
+
+    assert item["linked_items"] == [
+        {"type": "task", "id": task_id, "title": "Rapport", "status": "done"},
+        {"type": "note", "id": "gone"},
+    ]
+
+
+def test_model_to_dict_matches_row_to_dict():
+    """Test that single items and list rows produce the same response dict."""
+    created = datetime(2025, 1, 2, 3, 4, 5)
+    values = {
+        "id": uuid4(), "user_id": uuid4(), "type": "email", "source": "gmail",
+        "status": "unprocessed", "priority": "medium", "subject": "Hoi", "content": "x",
+        "raw_data": None, "ai_suggestion": {"action": "archive"}, "user_decision": None,
+        "linked_items": None, "processed_at": None, "created_at": created, "updated_at": created,
+    }
+
+    item = InboxUseCases._model_to_dict(None, SimpleNamespace(**values))
+
+    assert item == _row_to_dict(SimpleNamespace(_mapping=values))
+    assert list(item) == list(_row_to_dict(SimpleNamespace(_mapping=values)))
+
+
+def test_format_item_defaults_and_truncates():
+    """Test that the suggestion prompt fills defaults and cuts off long content."""
+    item = SimpleNamespace(type="email", source="gmail", subject=None, content=None)
+    assert _format_item(item) == (
+        "Type: email\nBron: gmail\nOnderwerp: Geen onderwerp\n\nInhoud:\nGeen inhoud\n"
+    )
+
+    item.content = "x" * (MAX_SUGGESTION_CONTENT_CHARS + 100)
+    assert "x" * MAX_SUGGESTION_CONTENT_CHARS + "\n[... ingekort]\n" in _format_item(item)
+    assert "x" * (MAX_SUGGESTION_CONTENT_CHARS + 1) not in _format_item(item)
+
+
+def test_parse_suggestion_coerces_and_fills_defaults():
+    """Test that a suggestion reply is validated with defaults for missing fields."""
+    suggestion = _parse_suggestion('{"action": "create_task", "confidence": "0.8", "due": "morgen"}')
+
+    assert suggestion == {
+        "action": "create_task",
+        "confidence": 0.8,
+        "reasoning": "",
+        "suggested_data": {},
+        "alternative_actions": [],
+        "due": "morgen",
+    }
+    assert _parse_suggestion('{"action": "archive", "confidence": "hoog"}') is None
+    assert _parse_suggestion("{niet json}") is None
+    assert _parse_suggestion(None) is None
+
+
+def test_parse_bulk_suggestions_pads_to_item_count():
+    """Test that bulk replies map to items in order, with None for invalid entries."""
+    payload = json.dumps({"suggestions": [{"action": "create_note"}, "onzin"]})
+
+    suggestions = _parse_bulk_suggestions(payload, 3)
+
+    assert suggestions[0]["action"] == "create_note"
+    assert suggestions[1:] == [None, None]
+    assert _parse_bulk_suggestions("{}", 2) == [None, None]
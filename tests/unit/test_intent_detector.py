@@ -0,0 +1,42 @@
+"""
+Unit tests for the intent detector's tool fast path.
+"""
+from datetime import datetime, timedelta
+
+from app.infrastructure.services.intent_detector import IntentDetector, IntentType
+
+
+def tomorrow_at(hour, minute=0):
+    day = datetime.now(IntentDetector().tz).date() + timedelta(days=1)
+    return datetime(day.year, day.month, day.day, hour, minute).isoformat()
+
+
+def test_detect_tool_call_reminder():
+    """Test that a fully specified reminder fills the create_reminder input."""
+    intent = IntentDetector().detect_tool_call("Herinner me morgen om 9 uur aan de vuilnis.")
+
+    assert intent.intent_type == IntentType.CALENDAR_REMINDER
+    assert not intent.needs_claude_extraction
+    assert intent.extracted_params == {"title": "De vuilnis", "reminder_time": tomorrow_at(9)}
+
+
+def test_detect_tool_call_appointment():
+    """Test that an appointment with start and end fills create_calendar_event."""
+    intent = IntentDetector().detect_tool_call("plan lunch met Jan morgen van 12:00 tot 13:30")
+
+    assert intent.intent_type == IntentType.CALENDAR_CREATE
+    assert intent.extracted_params == {
+        "title": "Lunch met Jan",
+        "start_time": tomorrow_at(12),
+        "end_time": tomorrow_at(13, 30),
+    }
+
+
+def test_detect_tool_call_leaves_loose_requests_to_claude():
+    """Test that incomplete, odd or provider-specific requests are not matched."""
+    detector = IntentDetector()
+
+    assert detector.detect_tool_call("plan een meeting met Jan volgende week") is None
+    assert detector.detect_tool_call("plan lunch morgen van 13:00 tot 12:00") is None
+    assert detector.detect_tool_call("herinner me morgen om 25 uur aan x") is None
+    assert detector.detect_tool_call("herinner me morgen om 9 uur aan x in outlook") is None
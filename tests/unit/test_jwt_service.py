@@ -71,3 +71,19 @@ def test_extract_user_id_from_invalid_token():
 
     # Should return None for invalid token
     assert extracted_id is None
+
+
+def test_decode_token_signed_with_raw_secret():
+    """Test that tokens signed with the plain secret still verify with the cached key."""
+    from datetime import datetime, timedelta
+    from jose import jwt
+    from app.core.config import settings
+
+    user_id = uuid4()
+    token = jwt.encode(
+        {"sub": str(user_id), "exp": datetime.utcnow() + timedelta(minutes=5)},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+    assert extract_user_id_from_token(token) == user_id
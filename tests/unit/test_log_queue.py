@@ -0,0 +1,35 @@
+"""
+Unit tests for the queued root log handler.
+"""
+import logging
+
+from app.core.log_queue import start_log_queue, stop_log_queue
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_log_queue_delivers_records_and_restores_handlers():
+    """Test that records reach the original handlers through the queue."""
+    root = logging.getLogger()
+    saved = root.handlers
+    handler = _ListHandler()
+    root.handlers = [handler]
+    try:
+        start_log_queue()
+        assert root.handlers != [handler]
+
+        logging.getLogger("tests.log_queue").warning("queued %s", 1)
+        stop_log_queue()
+
+        assert handler.messages == ["queued 1"]
+        assert root.handlers == [handler]
+    finally:
+        stop_log_queue()
+        root.handlers = saved
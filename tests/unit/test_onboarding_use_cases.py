@@ -0,0 +1,57 @@
+"""
+Unit tests for onboarding helpers.
+"""
+import re
+from types import SimpleNamespace
+
+from app.application.use_cases.onboarding_use_cases import (
+    GetOnboardingStatusUseCase,
+    codes_match,
+    generate_inbox_token,
+    generate_verification_code,
+    sanitize_email_prefix,
+)
+
+
+def test_generated_codes_and_tokens():
+    """Test verification codes are 6 digits and inbox tokens 6 lowercase alphanumerics."""
+    for _ in range(200):
+        assert re.fullmatch(r"[0-9]{6}", generate_verification_code())
+        assert re.fullmatch(r"[a-z0-9]{6}", generate_inbox_token())
+
+
+def test_codes_match():
+    """Test verification code comparison, including wrong length and non-ASCII input."""
+    assert codes_match("123456", "123456")
+    assert not codes_match("123456", "123457")
+    assert not codes_match("123456", "12345")
+    assert not codes_match("123456", "12345é")
+
+
+def test_sanitize_email_prefix():
+    """Test inbox prefix sanitizing of email local parts."""
+    assert sanitize_email_prefix("frank@madano.nl") == "frank"
+    assert sanitize_email_prefix("Jan.de..Vries@gmail.com") == "jan-de-vries"
+    assert sanitize_email_prefix("o'brien@test.com") == "obrien"
+    assert sanitize_email_prefix(".x_y.@test.com") == "xy"
+
+
+def test_determine_current_step_from_status_row():
+    """Test the onboarding step for status rows at each stage."""
+    step = GetOnboardingStatusUseCase(user_repository=None)._determine_current_step
+    row = SimpleNamespace(
+        email_verified=False, inbox_prefix=None, inbox_verified=False,
+        phone_number=None, phone_verified=False, onboarding_completed=False,
+    )
+    assert step(row) == 1
+
+    row.email_verified = True
+    row.inbox_prefix = "frank-abc123"
+    assert step(row) == 3
+
+    row.inbox_verified = row.phone_verified = True
+    row.phone_number = "+31612345678"
+    assert step(row) == 5
+
+    row.onboarding_completed = True
+    assert step(row) == 0
@@ -2,7 +2,15 @@
 Unit tests for password service.
 """
 import pytest
-from app.infrastructure.services.password import hash_password, verify_password
+from app.infrastructure.services.password import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    Argon2Hasher,
+    BcryptHasher,
+)
 
 
 def test_hash_password():
@@ -49,3 +57,41 @@ def test_hash_password_produces_different_hashes():
     # But both should verify the original password
     assert verify_password(password, hash1) is True
     assert verify_password(password, hash2) is True
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async():
+    """Test hashing and verifying in the thread pool."""
+    password = "my_secure_password_123"
+    hashed = await hash_password_async(password)
+
+    assert hashed != password
+    assert await verify_password_async(password, hashed) is True
+    assert await verify_password_async("wrong_password", hashed) is False
+
+
+def test_argon2_hasher():
+    """Test Argon2id hashing and verification."""
+    hasher = Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1)
+    hashed = hasher.hash("my_secure_password_123")
+
+    assert hashed.startswith("$argon2id$")
+    assert hasher.verify("my_secure_password_123", hashed) is True
+    assert hasher.verify("wrong_password", hashed) is False
+
+
+def test_bcrypt_hasher_needs_rehash_on_cost_change():
+    """Test that a hash made with a lower cost is flagged for rehash."""
+    cheap = BcryptHasher(rounds=4).hash("my_secure_password_123")
+
+    assert BcryptHasher(rounds=4).needs_rehash(cheap) is False
+    assert BcryptHasher(rounds=5).needs_rehash(cheap) is True
+
+
+def test_password_needs_rehash_other_scheme():
+    """Test that hashes from a non-configured scheme need rehash but still verify."""
+    hashed = Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1).hash("my_secure_password_123")
+
+    assert verify_password("my_secure_password_123", hashed) is True
+    assert password_needs_rehash(hashed) is True
+    assert password_needs_rehash(hash_password("my_secure_password_123")) is False
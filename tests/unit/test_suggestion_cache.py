@@ -0,0 +1,35 @@
+"""
+Unit tests for the inbox suggestion cache.
+"""
+import pytest
+from app.infrastructure.services import suggestion_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_suggestion_cache():
+    """Start every test with an empty cache."""
+    suggestion_cache._suggestion_cache.clear()
+    yield
+    suggestion_cache._suggestion_cache.clear()
+
+
+def test_caches_informational_suggestions():
+    """Test that note and archive suggestions are cached by content hash."""
+    key = suggestion_cache.content_hash("Onderwerp: Nieuwsbrief")
+    suggestion = {"action": "archive", "suggested_data": {"tags": ["nieuws"]}}
+
+    assert suggestion_cache.put(key, suggestion)
+    cached = suggestion_cache.get(key)
+
+    assert cached == suggestion
+    cached["suggested_data"]["tags"].append("gewijzigd")
+    assert suggestion_cache.get(key) == suggestion
+
+
+def test_does_not_cache_command_suggestions():
+    """Test that task and delegation suggestions are never cached."""
+    key = suggestion_cache.content_hash("Onderwerp: Offerte sturen")
+
+    assert not suggestion_cache.put(key, {"action": "create_task"})
+    assert not suggestion_cache.put(key, {"action": "delegate"})
+    assert suggestion_cache.get(key) is None
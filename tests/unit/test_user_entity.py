@@ -2,7 +2,13 @@
 Unit tests for User domain entity.
 """
 import pytest
-from app.domain.entities.user import User
+from app.domain.entities.user import (
+    STATUS_ACTIVE,
+    STATUS_CAN_LOGIN,
+    STATUS_HAS_PASSWORD,
+    STATUS_LOCAL,
+    User,
+)
 
 
 def test_create_local_user():
@@ -162,3 +168,38 @@ def test_is_local_user():
 
     assert local_user.is_local_user() is True
     assert google_user.is_local_user() is False
+
+
+def test_id_str_and_created_at_iso():
+    """Test memoized string representations."""
+    user = User.create(
+        email="test@example.com",
+        full_name="Test User",
+        provider="local",
+        hashed_password="hashed",
+    )
+
+    assert user.id_str == str(user.id)
+    assert user.created_at_iso == user.created_at.isoformat()
+    assert user.id_str is user.id_str
+
+
+def test_status_mask():
+    """Test login status bits."""
+    user = User.create(
+        email="test@example.com",
+        full_name="Test User",
+        provider="local",
+        hashed_password="hashed",
+    )
+    assert user.status_mask == STATUS_CAN_LOGIN
+
+    user.deactivate()
+    assert user.status_mask == STATUS_LOCAL | STATUS_HAS_PASSWORD
+
+    google_user = User.create(
+        email="test2@example.com",
+        full_name="Test User",
+        provider="google",
+    )
+    assert google_user.status_mask == STATUS_ACTIVE